@@ -0,0 +1,132 @@
+"""
+benchmarks.model_generators
+^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements parametric generators of structures that are used by the benchmark suite.
+"""
+import numpy as np
+
+import pystructural as ps
+
+__all__ = ['continuous_beam', 'portal_frame_grid', 'truss', 'staged_beam',
+           'model_generators']
+
+
+def continuous_beam(n_spans, span_length=5.0, q_load=-1.0, minimum_element_distance=1.0):
+    """Create a continuous beam with a q-load on every span.
+
+    :param n_spans: The amount of spans of the beam.
+    :param span_length: The length of every span.
+    :param q_load: The q-load on every span.
+    :param minimum_element_distance: The minimum element distance of the structure.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(minimum_element_distance)
+    # Add the frame elements
+    x = np.arange(n_spans + 1) * span_length
+    nodes = np.column_stack((x, np.zeros(n_spans + 1)))
+    frame_ids = structure.add_frame_elements(nodes[:-1], nodes[1:], 2.1e8, 7.85, 0.01, 1.0e-4)
+    # Add the supports, the first support is fixed in the x direction
+    flags = np.tile([True, False, True], (n_spans + 1, 1))
+    flags[0, 0] = False
+    structure.add_supports(nodes, flags)
+    # Add the q-loads
+    for frame_id in frame_ids:
+        structure.add_global_q_load(frame_id, q_load)
+    return structure
+
+
+def portal_frame_grid(n_bays, n_storeys, bay_width=6.0, storey_height=3.0, q_load=-10.0, wind_load=5.0,
+                      minimum_element_distance=1.0):
+    """Create a grid of portal frames with fixed supports, a q-load on every beam and a wind load on every storey.
+
+    :param n_bays: The amount of bays of the grid.
+    :param n_storeys: The amount of storeys of the grid.
+    :param bay_width: The width of every bay.
+    :param storey_height: The height of every storey.
+    :param q_load: The q-load on every beam.
+    :param wind_load: The horizontal point load on every storey.
+    :param minimum_element_distance: The minimum element distance of the structure.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(minimum_element_distance)
+    x = np.arange(n_bays + 1) * bay_width
+    y = np.arange(n_storeys + 1) * storey_height
+    # Add the columns
+    column_starts = np.array([[x_i, y_j] for y_j in y[:-1] for x_i in x])
+    column_ends = column_starts + np.array([0.0, storey_height])
+    structure.add_frame_elements(column_starts, column_ends, 2.1e8, 7.85, 0.01, 2.0e-4)
+    # Add the beams
+    beam_starts = np.array([[x_i, y_j] for y_j in y[1:] for x_i in x[:-1]])
+    beam_ends = beam_starts + np.array([bay_width, 0.0])
+    beam_ids = structure.add_frame_elements(beam_starts, beam_ends, 2.1e8, 7.85, 0.01, 1.0e-4)
+    # Add the fixed supports
+    structure.add_supports(np.column_stack((x, np.zeros(n_bays + 1))), [False, False, False])
+    # Add the loads
+    for beam_id in beam_ids:
+        structure.add_global_q_load(beam_id, q_load, 'permanent')
+    structure.add_point_loads(np.column_stack((np.zeros(n_storeys), y[1:])), [wind_load, 0.0, 0.0], 'wind')
+    return structure
+
+
+def truss(n_panels, panel_width=2.0, height=2.0, point_load=-10.0, minimum_element_distance=1.0):
+    """Create a Warren truss of frame elements with point loads at the bottom chord nodes.
+
+    :param n_panels: The amount of panels of the truss.
+    :param panel_width: The width of every panel.
+    :param height: The height of the truss.
+    :param point_load: The vertical point load at every bottom chord node.
+    :param minimum_element_distance: The minimum element distance of the structure.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(minimum_element_distance)
+    bottom = np.column_stack((np.arange(n_panels + 1) * panel_width, np.zeros(n_panels + 1)))
+    top = np.column_stack(((np.arange(n_panels) + 0.5) * panel_width, np.full(n_panels, height)))
+    # Add the chords and the diagonals
+    starts = np.concatenate((bottom[:-1], top[:-1], bottom[:-1], top))
+    ends = np.concatenate((bottom[1:], top[1:], top, bottom[1:]))
+    structure.add_frame_elements(starts, ends, 2.1e8, 7.85, 0.005, 1.0e-6)
+    # Add the supports
+    structure.add_supports([bottom[0], bottom[-1]], [[False, False, True], [True, False, True]])
+    # Add the point loads
+    structure.add_point_loads(bottom[1:-1], [0.0, point_load, 0.0])
+    return structure
+
+
+def staged_beam(n_phases, span_length=5.0, q_load=-1.0, minimum_element_distance=1.0):
+    """Create a beam that is built in stages, in every phase a span is added that is loaded with a q-load. Every
+    phase has the previous phase as its previous phase.
+
+    :param n_phases: The amount of phases and spans.
+    :param span_length: The length of every span.
+    :param q_load: The q-load on the span that is added in a phase.
+    :param minimum_element_distance: The minimum element distance of the structure.
+    :return: A tuple (structure, phased analysis).
+    """
+    phased_analysis = ps.solver.PhasedAnalysis()
+    phase_ids = [phased_analysis.create_phase('phase_{0}'.format(i)) for i in range(n_phases)]
+    for i in range(1, n_phases):
+        phased_analysis.add_previous_phase(phase_ids[i], phase_ids[i - 1])
+    structure = ps.core.Structure2D(minimum_element_distance)
+    for i in range(n_phases):
+        # The span exists in its own phase and in every later phase
+        structure.set_phase(*phase_ids[i:])
+        frame_id = structure.add_frame_element([i * span_length, 0.0], [(i + 1) * span_length, 0.0],
+                                               2.1e8, 7.85, 0.01, 1.0e-4)
+        # The supports of a phase
+        structure.set_phase(phase_ids[i])
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        for j in range(1, i + 2):
+            structure.add_support([j * span_length, 0.0], displacement_y=False)
+        # The q-load of the span
+        structure.add_global_q_load(frame_id, q_load)
+    return structure, phased_analysis
+
+
+# The model generators with the name of their size parameter
+model_generators = {
+    'continuous_beam': lambda n: continuous_beam(n),
+    'portal_frame_grid': lambda n: portal_frame_grid(n, n),
+    'truss': lambda n: truss(n),
+    'staged_beam': lambda n: staged_beam(n),
+}
@@ -0,0 +1,214 @@
+"""
+benchmarks.run_benchmarks
+^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Runs the model generators over a size sweep, times every pipeline stage, fits the empirical complexity exponents of
+the stages and writes the results as JSON. Every stage is timed without the stages it runs, such that only the
+factorization of the stiffness matrix is checked against its own maximum exponent.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --output benchmark_results.json --max-exponent 2.0
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from model_generators import model_generators
+
+__all__ = ['measure_import_time', 'run_model_benchmark', 'fit_complexity_exponents', 'run_benchmarks']
+
+
+# The default size sweep for every model generator
+default_sizes = {
+    'continuous_beam': [4, 8, 16, 32],
+    'portal_frame_grid': [2, 3, 4, 5],
+    'truss': [4, 6, 8, 12],
+    'staged_beam': [4, 6, 8, 10],
+}
+# The runs with less DOFs are dominated by the fixed overhead of the systems, they are not used for the fit
+default_min_dofs = 500
+# The maximum exponent of the stages with an algorithm that scales worse than the maximum exponent: the dense reduced
+# stiffness matrix is factorized in cubic time
+stage_max_exponents = {
+    'FactorizeStiffnessMatrix': 3.0,
+}
+
+
+def measure_import_time(module_name, repeat=3):
+    """Measure the cold import time of a module in a fresh interpreter.
+
+    :param module_name: The name of the module.
+    :param repeat: The amount of fresh interpreters, the fastest import time is used.
+    :return: A dict with the import time and the visualization packages that were imported.
+    """
+    code = '\n'.join([
+        'import sys, time',
+        'start = time.perf_counter()',
+        'import {0}'.format(module_name),
+        'print(time.perf_counter() - start)',
+        'print(",".join(m for m in ["matplotlib", "bokeh", "svgpathtools"] if m in sys.modules))',
+    ])
+    import_times = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).split('\n')
+        import_times.append(float(output[0]))
+    return {'import_time': min(import_times), 'visualization_modules': [m for m in output[1].split(',') if m]}
+
+
+def run_model_benchmark(model_name, size):
+    """Build and solve one model and time every pipeline stage. The time of a stage is the wall time of its system
+    runs without the wall time of the systems they run. Every analysis of a stage is a sample with the DOFs of the
+    analysis, such that every phase of a phased analysis is a sample with the DOFs of the phase. The stages outside an
+    analysis have the summed DOFs of the analyses they run, or the DOFs of the structure if they don't run an analysis.
+    The system runs without items are not timed.
+
+    :param model_name: The name of the model generator.
+    :param size: The size parameter of the model generator.
+    :return: A dict with the model, the size, the amount of DOFs of the structure, the build and solve time and a list
+        of [DOFs, time] samples of every stage.
+    """
+    # Build the model
+    start = time.perf_counter()
+    model = model_generators[model_name](size)
+    build_time = time.perf_counter() - start
+    structure, phased_analysis = model if isinstance(model, tuple) else (model, None)
+    # Solve the model and profile every system
+    profiler = structure.enable_profiling(trace_memory=False)
+    start = time.perf_counter()
+    if phased_analysis is None:
+        structure.solve_linear_system()
+    else:
+        structure.solve_linear_phase_system(phased_analysis)
+    solve_time = time.perf_counter() - start
+    structure.disable_profiling()
+    profiles = profiler.report()
+    # Get the analysis of every system run and the DOFs of every analysis, None is outside an analysis
+    analyses = []
+    for i, profile in enumerate(profiles):
+        if profile['name'] == 'LinearAnalysisSystem':
+            analyses.append(i)
+        else:
+            analyses.append(None if profile['parent'] is None else analyses[profile['parent']])
+    analysis_dofs = {analysis: profile['item_count'] for analysis, profile in zip(analyses, profiles)
+                     if profile['name'] == 'UpdateDOFs'}
+    n_dofs = max(analysis_dofs.values(), default=0)
+    # The DOFs of a system run outside an analysis are the DOFs of the analyses it ran, or the DOFs of the structure
+    dofs = [analysis_dofs.get(analysis, 0) for analysis in analyses]
+    for analysis in analysis_dofs:
+        parent = profiles[analysis]['parent']
+        while parent is not None and analyses[parent] is None:
+            dofs[parent] += analysis_dofs[analysis]
+            parent = profiles[parent]['parent']
+    dofs = [n_dofs if run_dofs == 0 else run_dofs for run_dofs in dofs]
+    # Subtract the wall time of every system run from the wall time of the system that ran it
+    times = [profile['wall_time'] for profile in profiles]
+    for profile in profiles:
+        if profile['parent'] is not None:
+            times[profile['parent']] -= profile['wall_time']
+    # Sum the times of every stage per analysis
+    stage_times = {('build', None): [n_dofs, build_time]}
+    for analysis, profile, run_dofs, wall_time in zip(analyses, profiles, dofs, times):
+        if profile['item_count'] != 0:
+            stage_times.setdefault((profile['name'], analysis), [run_dofs, 0.0])[1] += wall_time
+    stages = {}
+    for (stage, analysis), sample in stage_times.items():
+        stages.setdefault(stage, []).append(sample)
+    # Sort the samples of every stage by their DOFs, such that the samples of repeated runs are in the same order
+    stages = {stage: sorted(samples) for stage, samples in stages.items()}
+    return {'model': model_name, 'size': size, 'n_dofs': n_dofs, 'build_time': build_time, 'solve_time': solve_time,
+            'stages': stages}
+
+
+def fit_complexity_exponents(results, min_dofs=0):
+    """Fit the empirical complexity exponent of every stage: the slope of log(time) against log(DOFs) of the samples of
+    the stage.
+
+    :param results: The results of one model generator over a size sweep.
+    :param min_dofs: The minimum amount of DOFs of the samples that are used for the fit.
+    :return: A dict with the exponent of every stage.
+    """
+    exponents = {}
+    stages = {}
+    for result in results:
+        for stage, samples in result['stages'].items():
+            stages.setdefault(stage, []).extend(sample for sample in samples
+                                                if sample[0] >= min_dofs and sample[1] > 0.0)
+    for stage, samples in stages.items():
+        n_dofs, times = np.array(samples, dtype=float).reshape(-1, 2).T
+        # Only fit the stages that have been measured for more than one amount of DOFs
+        if len(set(n_dofs)) > 1:
+            exponents[stage] = float(np.polyfit(np.log(n_dofs), np.log(times), 1)[0])
+    return exponents
+
+
+def run_benchmarks(model_names=None, sizes=None, repeat=3, min_dofs=default_min_dofs):
+    """Run the benchmarks of the given model generators.
+
+    :param model_names: The names of the model generators, all model generators are used if None.
+    :param sizes: A dict with the size sweep of every model generator, the default sizes are used if None.
+    :param repeat: The amount of repeats of every run, the fastest run of every stage is used.
+    :param min_dofs: The minimum amount of DOFs of the runs that are used for the fit of the complexity exponents.
+    :return: A dict with the results and the complexity exponents of every model generator.
+    """
+    if model_names is None:
+        model_names = list(model_generators.keys())
+    if sizes is None:
+        sizes = default_sizes
+    benchmarks = {}
+    for model_name in model_names:
+        results = []
+        for size in sizes[model_name]:
+            runs = [run_model_benchmark(model_name, size) for _ in range(repeat)]
+            # Use the fastest time of every sample of every stage
+            result = runs[0]
+            result['stages'] = {stage: [[sample[0], min(run['stages'][stage][i][1] for run in runs)]
+                                        for i, sample in enumerate(samples)]
+                                for stage, samples in result['stages'].items()}
+            results.append(result)
+        benchmarks[model_name] = {'results': results, 'exponents': fit_complexity_exponents(results, min_dofs)}
+    return benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the pystructural benchmark suite.')
+    parser.add_argument('--output', default='benchmark_results.json', help='The path of the JSON output file.')
+    parser.add_argument('--models', nargs='*', default=None, help='The model generators to run.')
+    parser.add_argument('--repeat', type=int, default=3, help='The amount of repeats of every run.')
+    parser.add_argument('--min-dofs', type=int, default=default_min_dofs,
+                        help='The minimum amount of DOFs of the runs that are used for the fit.')
+    parser.add_argument('--max-exponent', type=float, default=None,
+                        help='Exit with an error if a stage has a higher complexity exponent, the factorization of '
+                             'the stiffness matrix is checked against its own maximum exponent if it is higher.')
+    args = parser.parse_args()
+
+    benchmarks = run_benchmarks(args.models, repeat=args.repeat, min_dofs=args.min_dofs)
+    import_times = {module_name: measure_import_time(module_name)
+                    for module_name in ['pystructural', 'pystructural.headless']}
+    output = {'python': platform.python_version(), 'platform': platform.platform(), 'import_times': import_times,
+              'benchmarks': benchmarks}
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+
+    # Print the import times
+    for module_name, import_time in import_times.items():
+        print('{0:61} {1:6.3f}s'.format('import ' + module_name, import_time['import_time']))
+    # Print the complexity exponents and check them against the maximum exponent
+    failed = False
+    for model_name, benchmark in benchmarks.items():
+        for stage, exponent in sorted(benchmark['exponents'].items()):
+            print('{0:20} {1:40} {2:6.2f}'.format(model_name, stage, exponent))
+            if args.max_exponent is not None and \
+                    exponent > max(args.max_exponent, stage_max_exponents.get(stage, args.max_exponent)):
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,6 @@
 from .structure2d import *
+from .substructure import *
 from .math_ps import *
+from .profiling import *
+from .batch import *
+from .spatial_index import *
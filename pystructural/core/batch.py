@@ -0,0 +1,159 @@
+"""
+pystructural.core.batch
+^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements the batch solver: many independent models are built and solved in a pool of worker processes and their
+results are streamed back as they complete.
+"""
+import concurrent.futures
+import itertools
+import os
+import pickle
+
+import numpy as np
+
+from pystructural.solver.components.geometry import Point2D
+from .structure2d import Structure2D
+
+__all__ = ['ModelReference', 'ModelDescription', 'default_extractor', 'solve_batch']
+
+
+class ModelReference:
+    """A reference to the return value of a recorded call of a model description, for example the entity id of a frame
+    element that is used to add a q-load to it.
+
+    :param call_index: The index of the recorded call.
+    """
+    __slots__ = ('call_index',)
+
+    def __init__(self, call_index):
+        self.call_index = call_index
+
+
+class ModelDescription:
+    """A picklable description of a structure: the arguments of the structure and the recorded calls of its methods.
+    The description is built into a structure in the worker process, such that only the arguments of the calls are
+    pickled instead of the whole structure. The q-load functions of add_global_q_load_func are arguments as well, so
+    they have to be load distributions or functions at the module level. Every method of Structure2D can be called on
+    a description, the call is recorded and a model reference to its return value is returned.
+
+    :param structure_kwargs: The keyword arguments of the structure.
+    """
+
+    def __init__(self, **structure_kwargs):
+        self.structure_kwargs = structure_kwargs
+        self.calls = []
+
+    def __getattr__(self, name):
+        # Only the public methods of the structure can be recorded
+        if name.startswith('_') or not callable(getattr(Structure2D, name, None)):
+            raise AttributeError(name)
+
+        # Record the call and return a reference to its return value
+        def record_call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return ModelReference(len(self.calls) - 1)
+        return record_call
+
+    def build(self):
+        """Build the structure by replaying the recorded calls.
+
+        :return: The structure.
+        """
+        structure = Structure2D(**self.structure_kwargs)
+        return_values = []
+
+        # Replace the model references by the return values of their calls
+        def resolve(value):
+            return return_values[value.call_index] if isinstance(value, ModelReference) else value
+
+        for name, args, kwargs in self.calls:
+            return_values.append(getattr(structure, name)(*[resolve(arg) for arg in args],
+                                                          **{key: resolve(value) for key, value in kwargs.items()}))
+        return structure
+
+
+def default_extractor(structure):
+    """Extract the coordinates of the nodes and their displacements for every load combination of a solved structure.
+
+    :param structure: The solved structure.
+    :return: A dict with a (N, 2) array with the coordinates of the nodes and a dict with a (N, 3) array with the
+        displacements and the rotations of the nodes for every load combination name.
+    """
+    results = structure.post_processor.linear_analysis_results
+    local_to_global_dof_dict = results.dof_calculation_component.local_to_global_dof_dict
+    node_ids = list(local_to_global_dof_dict.keys())
+    coordinates = np.array([structure.get_component_from_entity(node_id, Point2D).point_list[0]
+                            for node_id in node_ids]).reshape(-1, 2)
+    # The global dof ids of the nodes, the dofs that a node doesn't have point to the zero at the end of the vector
+    global_ids = np.array([[local_to_global_dof_dict[node_id].get(dof_id, -1) for dof_id in (0, 1, 5)]
+                           for node_id in node_ids], dtype=int).reshape(-1, 3)
+    displacements = {}
+    for load_combination_name, load_combination_id in \
+            structure.load_combinations_component.load_combination_names.items():
+        displacement_vector = results.displacement_and_load_vectors_component.displacement_vectors[load_combination_id]
+        displacements[load_combination_name] = np.append(displacement_vector, 0.0)[global_ids]
+    return {'coordinates': coordinates, 'displacements': displacements}
+
+
+def solve_chunk(chunk, extractor):
+    # Import the solver without the visualization packages, the import is only done once per worker
+    import pystructural.headless
+    if extractor is None:
+        extractor = default_extractor
+    # Build, solve and extract every model of the chunk
+    results = []
+    for index, payload in chunk:
+        model = pickle.loads(payload)
+        structure = model.build() if isinstance(model, ModelDescription) else model
+        # Solve the structure if the description didn't solve it
+        if structure.post_processor is None:
+            structure.solve_linear_system()
+        results.append((index, extractor(structure)))
+    return results
+
+
+def payload_generator(models):
+    # Yield the payload of every model, the models and the model descriptions with the arguments of their calls are
+    # pickled such that a function that can't be pickled is found before the model is submitted
+    for index, model in enumerate(models):
+        try:
+            yield index, pickle.dumps(model)
+        except (AttributeError, TypeError, pickle.PicklingError) as error:
+            raise TypeError('The model {0} can not be pickled, the functions of its q-loads have to be load '
+                            'distributions or functions at the module level: {1}'.format(index, error))
+
+
+def solve_batch(models, extractor=None, max_workers=None, chunk_size=1):
+    """Solve many independent models in a pool of worker processes and yield their results as they complete. The
+    models are pickled lazily, at most two chunks per worker are submitted to the pool at once.
+
+    :param models: An iterable with the models, model descriptions or structures that can be pickled. The functions of
+        the q-loads that are added with add_global_q_load_func are pickled with the model, so they have to be load
+        distributions or functions at the module level, a lambda or a local function raises a TypeError.
+    :param extractor: A picklable function that returns the result of a solved structure, the default extractor is
+        used if None.
+    :param max_workers: The amount of worker processes, the amount of processors is used if None.
+    :param chunk_size: The amount of models that are sent to a worker at once.
+    :return: Yields a tuple (index, result) for every model in the order in which they are completed.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    payloads = payload_generator(models)
+    # The initializer of the pool requires Python 3.7, the extractor is sent with every chunk instead
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        futures = set()
+        while True:
+            # Submit chunks until there are two chunks per worker in the pool
+            while len(futures) < 2 * max_workers:
+                chunk = list(itertools.islice(payloads, chunk_size))
+                if not chunk:
+                    break
+                futures.add(executor.submit(solve_chunk, chunk, extractor))
+            if not futures:
+                break
+            # Yield the results of the chunks that are completed
+            done, futures = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for index, result in future.result():
+                    yield index, result
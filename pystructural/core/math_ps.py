@@ -1,8 +1,12 @@
 import numpy as np
+import scipy.linalg
+import scipy.spatial
 
 __all__ = ['point_2d_norm', 'point_is_near_point', 'point_line_projection', 'point_line_projection_distance',
            'point_is_on_line', 'point_projection_is_on_line', 'is_collinear',
-           'line_to_unit_interval', 'line_embedding',
+           'line_to_unit_interval', 'line_embedding', 'unique_points',
+           'cumulative_integral',
+           'factorize', 'solve_factorized',
            'quotient_set_of_equivalence_relation']
 
 
@@ -130,6 +134,97 @@ def line_embedding(unit, line_start, line_end):
         return None
 
 
+def unique_points(points, error=0.001):
+    """Deduplicate an array of 2d points. A point is grouped with the first earlier point that starts a group and is
+    near the point, the same groups as when the points are added one by one and compared with point_is_near_point. The
+    near points are found with a k-d tree.
+
+    :param points: A (N, 2) array of points.
+    :param error: The distance between two points below which they are near each other.
+    :return: A tuple (first_index, inverse) where first_index contains the index of the first point of every group
+    and inverse maps every point to its group.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    # Get the pairs (i, j) with i < j of the points that are near each other
+    pairs = scipy.spatial.cKDTree(points).query_pairs(error, output_type='ndarray') if len(points) > 0 else \
+        np.empty((0, 2), dtype=int)
+    pairs = pairs[np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1) < error]
+    earlier_points = [[] for _ in range(len(points))]
+    for i, j in pairs:
+        earlier_points[j].append(i)
+    # Add every point to the group of the first earlier near point that starts a group, else it starts a group
+    is_first = np.zeros(len(points), dtype=bool)
+    groups = np.arange(len(points))
+    for j in range(len(points)):
+        first_points = [i for i in earlier_points[j] if is_first[i]]
+        if first_points:
+            groups[j] = min(first_points)
+        else:
+            is_first[j] = True
+    # Return the first index of every group and the group of every point
+    first_index = np.flatnonzero(is_first)
+    return first_index, np.searchsorted(first_index, groups)
+
+
+############
+# CALCULUS #
+############
+
+def cumulative_integral(values, x, derivatives=None):
+    """Integrate sampled values cumulatively with the trapezoidal rule, the integral starts at zero at the first
+    sample. If the derivatives of the values are given the end corrected trapezoidal rule is used, which is exact for
+    cubic polynomials.
+
+    :param values: A (N,) array with the values at the samples.
+    :param x: A (N,) array with the increasing positions of the samples.
+    :param derivatives: An optional (N,) array with the derivatives of the values at the samples.
+    :return: A (N,) array with the integral from the first sample up to every sample.
+    """
+    values = np.asarray(values, dtype=float)
+    # Determine the integral of every interval between two samples
+    dx = np.diff(x)
+    intervals = 0.5 * dx * (values[1:] + values[:-1])
+    # Add the end correction of the intervals
+    if derivatives is not None:
+        intervals -= dx ** 2 * np.diff(derivatives) / 12.0
+    # Return the cumulative sum of the intervals
+    return np.concatenate(([0.0], np.cumsum(intervals)))
+
+
+##################
+# LINEAR ALGEBRA #
+##################
+
+def factorize(matrix):
+    """Factorize a square matrix such that systems with the matrix can be solved with triangular solves. The
+    Cholesky factorization is used for symmetric positive definite matrices, otherwise the LU factorization is used.
+
+    :param matrix: A (N, N) array.
+    :return: The factorization, a tuple (method, factor).
+    """
+    try:
+        return 'cholesky', scipy.linalg.cho_factor(matrix, check_finite=False)
+    except np.linalg.LinAlgError:
+        factor = scipy.linalg.lu_factor(matrix, check_finite=False)
+        # A singular matrix has a zero on the diagonal of its LU factorization
+        if not np.all(np.diagonal(factor[0])):
+            raise np.linalg.LinAlgError('Singular matrix')
+        return 'lu', factor
+
+
+def solve_factorized(factorization, vector):
+    """Solve a system with a factorized matrix with triangular solves.
+
+    :param factorization: The factorization of the matrix as returned by factorize.
+    :param vector: A (N,) or (N, K) array with the right hand side.
+    :return: The solution of the system.
+    """
+    if factorization[0] == 'cholesky':
+        return scipy.linalg.cho_solve(factorization[1], vector, check_finite=False)
+    else:
+        return scipy.linalg.lu_solve(factorization[1], vector, check_finite=False)
+
+
 ##############
 # SET THEORY #
 ##############
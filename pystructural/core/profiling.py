@@ -0,0 +1,136 @@
+"""
+pystructural.core.profiling
+^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements the opt-in instrumentation of the systems that are processed by a structure.
+"""
+import time
+import tracemalloc
+
+__all__ = ['SystemProfile', 'SystemProfiler']
+
+
+def reset_peak():
+    # Reset the peak of the traced memory, tracemalloc.reset_peak only exists on Python 3.9+
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+class SystemProfile:
+    """The profile of one run of a system.
+
+    :param name: The class name of the system.
+    :param system_category: The system category of the system.
+    :param depth: The depth of the system run, systems that are run by other systems have a higher depth.
+    :param parent: The index of the profile of the system that ran this system, None if there is no such system.
+    """
+
+    def __init__(self, name, system_category, depth, parent):
+        self.name = name
+        self.system_category = system_category
+        self.depth = depth
+        self.parent = parent
+        # Measurements
+        self.wall_time = None
+        self.cpu_time = None
+        self.peak_memory = None
+        self.item_count = None
+        self.entity_count = None
+
+    def to_dict(self):
+        """Get the profile as a dict.
+
+        :return: A dict with the name, the position in the call tree and the measurements of the system run.
+        """
+        return {'name': self.name, 'system_category': self.system_category, 'depth': self.depth,
+                'parent': self.parent, 'wall_time': self.wall_time, 'cpu_time': self.cpu_time,
+                'peak_memory': self.peak_memory, 'item_count': self.item_count, 'entity_count': self.entity_count}
+
+
+class SystemProfiler:
+    """The system profiler records the wall time, the cpu time, the peak memory and the item count of every system
+    run. The item count is read from the item_count attribute of a system after it has been processed.
+
+    :param trace_memory: If true the peak memory of each system run is measured with tracemalloc. The peak is only
+        reset between the system runs on Python 3.9+, on older versions it is the peak since the tracing started.
+    :param hook: An optional callable that is called with every system profile after the system run has finished.
+    """
+
+    def __init__(self, trace_memory=True, hook=None):
+        self.trace_memory = trace_memory
+        self.hook = hook
+        # The recorded system profiles
+        self.profiles = []
+        # The stack of the system runs that are in progress: [profile index, start memory, peak memory of children]
+        self.stack = []
+        self.started_tracemalloc = False
+
+    def start(self):
+        """Start the memory tracing if it is needed.
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+
+    def stop(self):
+        """Stop the memory tracing if it was started by this profiler.
+        """
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+    def process_system(self, system, world):
+        """Process a system and record its profile.
+
+        :param system: The system instance that needs to be processed.
+        :param world: The world of the system.
+        """
+        # Create the profile of this system run
+        profile = SystemProfile(type(system).__name__, system.system_category, len(self.stack),
+                                self.stack[-1][0] if self.stack else None)
+        self.profiles.append(profile)
+        # Reset the peak of the traced memory
+        memory_tracing = self.trace_memory and tracemalloc.is_tracing()
+        if memory_tracing:
+            start_memory, peak_memory = tracemalloc.get_traced_memory()
+            # Store the current peak in the parent before it is reset
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak_memory)
+            reset_peak()
+        else:
+            start_memory = 0
+        self.stack.append([len(self.profiles) - 1, start_memory, 0])
+        # Process the system
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        try:
+            system.process()
+        finally:
+            profile.wall_time = time.perf_counter() - wall_time
+            profile.cpu_time = time.process_time() - cpu_time
+            _, start_memory, children_peak_memory = self.stack.pop()
+            # Determine the peak memory of the system run, including the peaks of the systems it ran
+            if memory_tracing:
+                peak_memory = max(tracemalloc.get_traced_memory()[1], children_peak_memory)
+                profile.peak_memory = peak_memory - start_memory
+                if self.stack:
+                    self.stack[-1][2] = max(self.stack[-1][2], peak_memory)
+                reset_peak()
+            profile.item_count = getattr(system, 'item_count', None)
+            profile.entity_count = len(world.entities)
+        # Call the hook with the profile
+        if self.hook is not None:
+            self.hook(profile)
+
+    def report(self, start=0):
+        """Get the recorded profiles as a list of dicts.
+
+        :param start: The index of the first profile in the report.
+        :return: A list with a dict for every recorded system run.
+        """
+        return [profile.to_dict() for profile in self.profiles[start:]]
+
+    def clear(self):
+        """Delete all the recorded profiles.
+        """
+        self.profiles = []
@@ -0,0 +1,114 @@
+"""
+pystructural.core.spatial_index
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements a spatial index of the points and the lines of a structure, such that many coordinates are resolved to the
+entity ids of the points and the lines at once instead of with a linear search of the structure for every coordinate.
+"""
+import numpy as np
+import scipy.spatial
+
+from pystructural.solver.components.geometry import Point2D, Line2D
+
+__all__ = ['SpatialIndex2D']
+
+
+class SpatialIndex2D:
+    """A spatial index of points and lines. The points are found with a k-d tree of the points and the lines with a k-d
+    tree of the midpoints of the lines, the candidate lines of a coordinate are tested exactly.
+
+    :param point_ids: The entity ids of the points.
+    :param points: A (P, 2) array with the coordinates of the points.
+    :param line_ids: The entity ids of the lines.
+    :param line_start_points: A (L, 2) array with the start points of the lines.
+    :param line_end_points: A (L, 2) array with the end points of the lines.
+    """
+
+    def __init__(self, point_ids, points, line_ids, line_start_points, line_end_points):
+        self.point_ids = np.asarray(point_ids, dtype=int).ravel()
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.point_tree = scipy.spatial.cKDTree(self.points) if len(self.points) > 0 else None
+        self.line_ids = np.asarray(line_ids, dtype=int).ravel()
+        self.line_start_points = np.asarray(line_start_points, dtype=float).reshape(-1, 2)
+        self.line_end_points = np.asarray(line_end_points, dtype=float).reshape(-1, 2)
+        # The candidate lines of a coordinate are the lines with a midpoint within half the longest line
+        midpoints = (self.line_start_points + self.line_end_points) / 2.0
+        self.maximum_half_length = np.max(np.linalg.norm(self.line_end_points - self.line_start_points, axis=1),
+                                          initial=0.0) / 2.0
+        self.line_tree = scipy.spatial.cKDTree(midpoints) if len(midpoints) > 0 else None
+
+    @classmethod
+    def from_structure(cls, structure):
+        """Create the spatial index of the points and the lines of a structure.
+
+        :param structure: The structure.
+        :return: The spatial index.
+        """
+        point_ids = []
+        points = []
+        for entity, point in structure.get_component(Point2D):
+            point_ids.append(entity)
+            points.append(point.point_list[0])
+        line_ids = []
+        line_start_points = []
+        line_end_points = []
+        for entity, line in structure.get_component(Line2D):
+            line_ids.append(entity)
+            line_start_points.append(line.point_list[0])
+            line_end_points.append(line.point_list[1])
+        return cls(point_ids, points, line_ids, line_start_points, line_end_points)
+
+    def query_points(self, coordinates, error=0.001):
+        """Find the nearest point of every coordinate.
+
+        :param coordinates: A (N, 2) array with the coordinates.
+        :param error: The maximum distance between a coordinate and its point.
+        :return: A (N,) array with the entity id of the point of every coordinate, -1 if there is no point within the
+            error.
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        point_ids = np.full(len(coordinates), -1, dtype=int)
+        if self.point_tree is None or len(coordinates) == 0:
+            return point_ids
+        distances, indices = self.point_tree.query(coordinates, distance_upper_bound=error)
+        is_found = distances < error
+        point_ids[is_found] = self.point_ids[indices[is_found]]
+        return point_ids
+
+    def query_lines(self, coordinates, error=0.001):
+        """Find the line of every coordinate, the projection of the coordinate has to be on the line. If the coordinate
+        is on many lines then the first line of the structure is found.
+
+        :param coordinates: A (N, 2) array with the coordinates.
+        :param error: The maximum distance between a coordinate and its line.
+        :return: A tuple (line_ids, units) with a (N,) array with the entity id of the line of every coordinate, -1 if
+            there is no line within the error, and a (N,) array with the position of the projection of every coordinate
+            on the unit interval of its line.
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        line_ids = np.full(len(coordinates), -1, dtype=int)
+        units = np.zeros(len(coordinates))
+        if self.line_tree is None or len(coordinates) == 0:
+            return line_ids, units
+        # Get the candidate lines of every coordinate as flat arrays of (coordinate, line) pairs
+        candidates = self.line_tree.query_ball_point(coordinates, self.maximum_half_length + error)
+        coordinate_index = np.repeat(np.arange(len(coordinates)), [len(candidate) for candidate in candidates])
+        line_index = np.fromiter((i for candidate in candidates for i in candidate), dtype=int,
+                                 count=len(coordinate_index))
+        # Project the coordinates on their candidate lines
+        start_points = self.line_start_points[line_index]
+        directions = self.line_end_points[line_index] - start_points
+        offsets = coordinates[coordinate_index] - start_points
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.einsum('ij,ij->i', offsets, directions) / np.einsum('ij,ij->i', directions, directions)
+        distances = np.linalg.norm(offsets - t[:, np.newaxis] * directions, axis=1)
+        is_on_line = (t >= 0.0) & (t <= 1.0) & (distances < error)
+        # Take the first line of the structure of every coordinate
+        first_line_index = np.full(len(coordinates), len(self.line_ids), dtype=int)
+        np.minimum.at(first_line_index, coordinate_index[is_on_line], line_index[is_on_line])
+        is_found = first_line_index < len(self.line_ids)
+        line_ids[is_found] = self.line_ids[first_line_index[is_found]]
+        # Get the unit of the projection on the found line
+        is_first = is_on_line & (line_index == first_line_index[coordinate_index])
+        units[coordinate_index[is_first]] = t[is_first]
+        return line_ids, units
@@ -1,9 +1,13 @@
+import contextlib
 import copy
+import itertools
+import threading
 
 import catecs
-import matplotlib.pyplot as plt
+import numpy as np
 
 import pystructural.solver.components.connection
+import pystructural.solver.components.degree_of_freedom
 import pystructural.solver.components.element_geometry
 import pystructural.solver.components.element
 import pystructural.solver.components.geometry
@@ -11,15 +15,47 @@ import pystructural.solver.components.load
 import pystructural.solver.components.material
 from pystructural.post_processor.post_processor import PostProcessor2D
 from pystructural.pre_processor.pre_processor import PreProcessor2D
-from pystructural.solver.results import LinearAnalysisResults2D
+from pystructural.solver.results import LinearAnalysisResults2D, SensitivityAnalysis2D
+from pystructural.solver.results.result_components import ProfileReportComponent
 from ..core import math_ps
-from ..solver.components import support, calculation_components
-from ..solver.components.load_combination import LoadCombinationsComponent
+from .profiling import SystemProfiler
+from .spatial_index import SpatialIndex2D
+from ..solver.components import support, calculation_components, load_distribution
+from ..solver.components.load_combination import LoadCombinationsComponent, load_combination_chunks
+from ..solver.components.phased_analysis_components import PhaseSet
 from ..solver.systems import LinearAnalysisSystem, LinearPhaseAnalysisSystem
 
 __all__ = ['Structure2D']
 
 
+# The change levels of a structure in increasing order, a higher change level invalidates more stages of an analysis
+change_levels = [None, 'load', 'stiffness', 'topology']
+
+
+@contextlib.contextmanager
+def unlocked():
+    # The context manager of a structure without phase views, it doesn't lock anything
+    yield
+
+
+def classify_change(component_instance):
+    # A change of a load only invalidates the load vectors
+    if isinstance(component_instance, pystructural.solver.components.load.Load):
+        return 'load'
+    # A change of a spring, a material or an element geometry only invalidates the stiffness of its entity
+    elif isinstance(component_instance, (pystructural.solver.components.connection.Spring,
+                                         pystructural.solver.components.material.Material,
+                                         pystructural.solver.components.element_geometry.ElementGeometry)):
+        return 'stiffness'
+    # A change of a geometry, an element, a support or a dof invalidates the dofs of the structure
+    elif isinstance(component_instance, (pystructural.solver.components.geometry.Geometry,
+                                         pystructural.solver.components.element.Element,
+                                         pystructural.solver.components.degree_of_freedom.DOF)):
+        return 'topology'
+    # The other components, like the result components, don't change the structure
+    return None
+
+
 class Structure(catecs.World):
     def __init__(self, phase_id_filter=None, phase_id_adder_list=None, minimum_element_distance=0.1):
         # Initialize the world
@@ -30,16 +66,87 @@ class Structure(catecs.World):
         self.phase_id_adder_list = phase_id_adder_list
         # Initialize the variables of the structure
         self.minimum_element_distance = minimum_element_distance
+        # Initialize the system profiler, the systems are only profiled if it is enabled
+        self.profiler = None
+        # Initialize the change tracking: the highest change level and the changed entities since the last analysis,
+        # the changes are not tracked while the structure is analysed
+        self.change_level = 'topology'
+        self.dirty_entities = set()
+        self.track_changes = True
+        # The structure of a phase view and the lock of the entities and the components that the structure shares with
+        # its phase views while they are solved concurrently
+        self.phase_parent = None
+        self.phase_lock = None
+        # The linear analysis results of a previous phase whose dofs and stiffness matrices are reused by a phase view
+        self.phase_base_results = None
+        # The phase index: the entity ids of the components of a component type for every phase id, the entity ids of
+        # the components without phase id's are stored with the phase id None
+        self.phase_index = {}
+
+    def enable_profiling(self, trace_memory=True, hook=None):
+        # Create the system profiler and start it
+        self.profiler = SystemProfiler(trace_memory, hook)
+        self.profiler.start()
+        return self.profiler
+
+    def disable_profiling(self):
+        # Stop the system profiler and remove it
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler = None
+
+    def process_system(self, system_instance):
+        # Process the system and profile it if the profiler is enabled
+        if self.profiler is None:
+            system_instance.process()
+        else:
+            self.profiler.process_system(system_instance, self)
+
+    def process_systems(self, *system_ids):
+        for system_id in system_ids:
+            self.process_system(self.systems[system_id])
+
+    def process_system_categories(self, *system_categories, ordered=False):
+        for system_category in system_categories:
+            if system_category in self.system_categories:
+                if ordered:
+                    for system_id in sorted(list(self.system_categories[system_category])):
+                        self.process_system(self.systems[system_id])
+                else:
+                    for system_id in self.system_categories[system_category]:
+                        self.process_system(self.systems[system_id])
 
     def add_entity(self, *components, phase_id_list=None):
-        # initialize the id
-        self.current_entity_id += 1
-        self.entities[self.current_entity_id] = {}
-        # Add each component to the entity
-        for component in components:
-            self.add_component(self.current_entity_id, component, phase_id_list)
+        with self.locked():
+            # initialize the id, the ids of a phase view are taken from its structure such that they are unique
+            id_source = self if self.phase_parent is None else self.phase_parent
+            id_source.current_entity_id += 1
+            entity_id = id_source.current_entity_id
+            self.entities[entity_id] = {}
+            # Add each component to the entity
+            for component in components:
+                self.add_component(entity_id, component, phase_id_list)
         # Return the entity id
-        return self.current_entity_id
+        return entity_id
+
+    def locked(self):
+        # The entities and the components are only locked while phase views of the structure are solved
+        return self.phase_lock if self.phase_lock is not None else unlocked()
+
+    def phase_view(self, phase_id):
+        # Create the lock that the structure shares with its phase views
+        if self.phase_lock is None:
+            self.phase_lock = threading.RLock()
+        # A phase view shares the entities and the components of the structure, it has its own phase filter, systems
+        # and analysis state such that the phases can be solved at the same time
+        view = copy.copy(self)
+        view.phase_parent = self if self.phase_parent is None else self.phase_parent
+        view.phase_id_filter = phase_id
+        view.phase_id_adder_list = [phase_id]
+        view.systems = {}
+        view.system_categories = {}
+        view.dirty_entities = set()
+        return view
 
     def has_component(self, entity_id, component_type):
         if self.phase_id_filter is None:
@@ -47,46 +154,134 @@ class Structure(catecs.World):
         else:
             if entity_id in self.entities:
                 for component in self.get_component_from_entity_generator(entity_id, component_type):
-                    if hasattr(component, 'phase_id_list'):
-                        if self.phase_id_filter in component.phase_id_list:
-                            return True
-                    else:
+                    if self.in_phase(component):
                         return True
 
     def add_component(self, entity_id, component_instance, phase_id_list=None):
         # Add the phase id list to the component
         if phase_id_list is not None:
-            component_instance.phase_id_list = copy.deepcopy(phase_id_list)
+            component_instance.phase_id_list = PhaseSet(phase_id_list)
         # If the re is an phase id adder add those phase id's to the component
         elif self.phase_id_adder_list is not None:
-            component_instance.phase_id_list = copy.deepcopy(self.phase_id_adder_list)
-        # Add the component to the entity
-        return super().add_component(entity_id, component_instance)
+            component_instance.phase_id_list = PhaseSet(self.phase_id_adder_list)
+        # The phase id list of a copied component is already set, store it as a phase set
+        elif getattr(component_instance, 'phase_id_list', None) is not None:
+            component_instance.phase_id_list = PhaseSet(component_instance.phase_id_list)
+        # Mark the entity as changed
+        self.mark_changed(classify_change(component_instance), entity_id)
+        # Add the component to the entity and to the phase index
+        with self.locked():
+            component_instance = super().add_component(entity_id, component_instance)
+            self.update_phase_index(entity_id, type(component_instance))
+            return component_instance
+
+    def add_phase_ids(self, entity_id, component_instance, phase_id_list):
+        # Add the phase id's to the phase id list of the component, a component without phase id list gets one
+        with self.locked():
+            phase_set = getattr(component_instance, 'phase_id_list', None)
+            component_instance.phase_id_list = PhaseSet(phase_id_list) if phase_set is None else \
+                phase_set.union(phase_id_list)
+            self.update_phase_index(entity_id, type(component_instance))
+
+    def update_phase_index(self, entity_id, component_type):
+        # Remove the entity from the phase index of the component type and add it for the phases of its components
+        phase_index = self.phase_index.setdefault(component_type, {})
+        for entity_ids in phase_index.values():
+            entity_ids.discard(entity_id)
+        if entity_id in self.entities:
+            for component in self.entities[entity_id].get(component_type, []):
+                phase_set = getattr(component, 'phase_id_list', None)
+                for phase_id in ((None,) if phase_set is None else phase_set):
+                    phase_index.setdefault(phase_id, set()).add(entity_id)
+
+    def in_phase(self, component_instance):
+        # A component is in the phase of the filter if it has no phase id list or if the phase is in its list
+        phase_set = getattr(component_instance, 'phase_id_list', None)
+        return phase_set is None or self.phase_id_filter in phase_set
+
+    def phase_entity_ids(self, component_type):
+        # The entity ids that have a component of the component type in the phase of the filter
+        phase_index = self.phase_index.get(component_type, {})
+        return phase_index.get(self.phase_id_filter, set()) | phase_index.get(None, set())
+
+    def delete_entity(self, entity_id, immediate=False):
+        # Mark the entity as changed with the highest change level of its components
+        component_types = []
+        if entity_id in self.entities:
+            component_types = list(self.entities[entity_id])
+            for component_list in self.entities[entity_id].values():
+                for component in component_list:
+                    self.mark_changed(classify_change(component), entity_id)
+        with self.locked():
+            super().delete_entity(entity_id, immediate)
+            # Remove the deleted entity from the phase index
+            if immediate:
+                for component_type in component_types:
+                    self.update_phase_index(entity_id, component_type)
+
+    def remove_component_type(self, entity_id, component_type):
+        # Mark the entity as changed
+        for component in self.get_component_from_entity_generator(entity_id, component_type):
+            self.mark_changed(classify_change(component), entity_id)
+        with self.locked():
+            super().remove_component_type(entity_id, component_type)
+            self.update_phase_index(entity_id, component_type)
+
+    def mark_changed(self, change_level, entity_id=None):
+        # If the changes are tracked then raise the change level and add the entity to the changed entities
+        if self.track_changes and change_level is not None:
+            if change_levels.index(change_level) > change_levels.index(self.change_level):
+                self.change_level = change_level
+            # If the changed entity is unknown then all the entities are marked as changed
+            if entity_id is None and change_level != 'load':
+                self.dirty_entities = None
+            elif entity_id is not None and self.dirty_entities is not None:
+                self.dirty_entities.add(entity_id)
 
     def get_component(self, component_type):
         if self.phase_id_filter is None:
-            for get_component_output in super().get_component(component_type):
-                yield get_component_output
+            get_component_outputs = super().get_component(component_type)
         else:
-            for entity_id, component in super().get_component(component_type):
-                if hasattr(component, 'phase_id_list'):
-                    if self.phase_id_filter in component.phase_id_list:
-                        yield entity_id, component
-                else:
+            # Only visit the entities of the phase index of the filter
+            get_component_outputs = self.phase_component_generator(component_type)
+        # Take a snapshot of the components if they can be changed by a phase view that is solved at the same time
+        if self.phase_lock is not None:
+            with self.phase_lock:
+                get_component_outputs = list(get_component_outputs)
+        for get_component_output in get_component_outputs:
+            yield get_component_output
+
+    def phase_component_generator(self, component_type):
+        # Yield the components of the component type of the entities in the phase of the filter
+        for entity_id in self.phase_entity_ids(component_type):
+            for component in self.entities[entity_id][component_type]:
+                if self.in_phase(component):
                     yield entity_id, component
 
     def get_components(self, *component_types):
         if self.phase_id_filter is None:
-            for get_components_output in super().get_components(*component_types):
-                yield get_components_output
+            get_components_outputs = super().get_components(*component_types)
         else:
-            for entity_id, components in super().get_components(*component_types):
-                for component in components:
-                    if hasattr(component, 'phase_id_list'):
-                        if self.phase_id_filter not in component.phase_id_list:
-                            break
-                else:
-                    yield entity_id, components
+            # Only visit the entities of the phase index of the filter that have all the component types
+            get_components_outputs = self.phase_components_generator(*component_types)
+        # Take a snapshot of the components if they can be changed by a phase view that is solved at the same time
+        if self.phase_lock is not None:
+            with self.phase_lock:
+                get_components_outputs = list(get_components_outputs)
+        for get_components_output in get_components_outputs:
+            yield get_components_output
+
+    def phase_components_generator(self, *component_types):
+        # Intersect the entity ids of the component types, starting with the smallest set
+        entity_id_sets = sorted((self.phase_entity_ids(component_type) for component_type in component_types), key=len)
+        if not entity_id_sets:
+            return
+        # Yield the cartesian product of the components of the entity that are in the phase of the filter
+        for entity_id in entity_id_sets[0].intersection(*entity_id_sets[1:]):
+            for components in itertools.product(*[[component for component in self.entities[entity_id][component_type]
+                                                   if self.in_phase(component)]
+                                                  for component_type in component_types]):
+                yield entity_id, components
 
     def get_component_from_entity(self, entity_id, component_type):
         if self.phase_id_filter is None:
@@ -94,10 +289,7 @@ class Structure(catecs.World):
         else:
             if entity_id in self.entities:
                 for component in self.get_component_from_entity_generator(entity_id, component_type):
-                    if hasattr(component, 'phase_id_list'):
-                        if self.phase_id_filter in component.phase_id_list:
-                            return component
-                    else:
+                    if self.in_phase(component):
                         return component
 
     def set_phase(self, *phase_id_list):
@@ -117,29 +309,66 @@ class Structure(catecs.World):
                 return tuple
             else:
                 # Add the phase id list adder to this object
-                if hasattr(tuple[1], 'phase_id_list'):
-                    for phase_id in self.phase_id_adder_list:
-                        if phase_id not in tuple[1].phase_id_list:
-                            tuple[1].phase_id_list.append(phase_id)
-                elif self.phase_id_adder_list is not None:
-                    tuple[1].phase_id_list = copy.deepcopy(self.phase_id_adder_list)
+                if self.phase_id_adder_list is not None:
+                    self.add_phase_ids(tuple[0], tuple[1], self.phase_id_adder_list)
                 # Return the entity id and the point list
                 return tuple[0]
         else:
             return coordinate
 
+    def positions_to_ids(self, coordinates, error=0.001):
+        # Get the entity ids and the coordinates of the existing points
+        existing_ids = []
+        existing_points = []
+        for entity, point in self.get_component(pystructural.solver.components.geometry.Point2D):
+            existing_ids.append(entity)
+            existing_points.append(point.point_list[0])
+        # Find the existing point of every coordinate, -1 if there is no existing point near the coordinate
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        ids = SpatialIndex2D(existing_ids, existing_points, [], [], []).query_points(coordinates, error)
+        # Add the phase id list adder to the existing points
+        if self.phase_id_adder_list is not None:
+            for entity in set(ids[ids >= 0].tolist()):
+                point = self.get_component_from_entity(entity, pystructural.solver.components.geometry.Point2D)
+                self.add_phase_ids(entity, point, self.phase_id_adder_list)
+        # Deduplicate the other coordinates and add a point for every unique coordinate
+        is_new = ids < 0
+        new_coordinates = coordinates[is_new]
+        first_index, inverse = math_ps.unique_points(new_coordinates, error)
+        new_ids = np.array([self.add_entity(pystructural.solver.components.geometry.Point2D(*new_coordinates[i]))
+                            for i in first_index], dtype=int)
+        ids[is_new] = new_ids[inverse]
+        # Return the entity id for every given coordinate
+        return ids
+
     def add_component_at_entity(self, entity_id, component_instance, unique=False):
         # If there is a component with the type in the entity
         if self.has_component(entity_id, type(component_instance)) and unique:
             self.get_component_from_entity(entity_id, type(component_instance)) + component_instance
+            # The component is changed in place, mark the entity as changed
+            self.mark_changed(classify_change(component_instance), entity_id)
         else:
             self.add_component(entity_id, component_instance)
 
 
 class Structure2D(Structure):
-    def __init__(self, minimum_element_distance=0.1):
+    def __init__(self, minimum_element_distance=0.1, subdivision='uniform', stations_per_element=11,
+                 maximum_element_length=None, condense_chains=False, maximum_update_rank=32):
+        # Check the subdivision of the line elements
+        if subdivision not in ('uniform', 'adaptive', None):
+            raise ValueError("The subdivision must be 'uniform', 'adaptive' or None.")
         # Initialize the world
         super().__init__(minimum_element_distance=minimum_element_distance)
+        # Initialize the subdivision of the line elements, if it is not uniform the results are evaluated at the
+        # stations of the line elements
+        self.subdivision = subdivision
+        self.stations_per_element = stations_per_element
+        # The maximum length of the line elements of the adaptive subdivision
+        self.maximum_element_length = maximum_element_length
+        # If true the interior nodes of the chains of line elements are condensed before the global solve
+        self.condense_chains = condense_chains
+        # The maximum rank of the accumulated low rank updates of the stiffness matrix before it is factorized again
+        self.maximum_update_rank = maximum_update_rank
         # Initialize the general entity for all the static components of the structure
         self.general_entity_id = self.add_entity(calculation_components.GroupComponent())
         # Get the group component
@@ -149,6 +378,12 @@ class Structure2D(Structure):
         self.load_combinations_component = self.add_component(self.general_entity_id, LoadCombinationsComponent())
         # Initialize the post processor
         self.post_processor = None
+        # The spatial index of the points and the lines for the result queries of the post processor
+        self.spatial_index = None
+        # The system ids of the linear analyses, an analysis is reused if the topology of the structure is unchanged
+        self.linear_analysis_system_ids = {}
+        # If true the structure has been preprocessed
+        self.is_preprocessed = False
 
     def search_for_line_element(self, coordinate, error=0.001):
         # For every line 2d in teh structure
@@ -199,6 +434,91 @@ class Structure2D(Structure):
         # Return the frame element entity id
         return frame_element_id
 
+    def add_frame_elements(self, start_coordinates, end_coordinates, youngs_modulus, mass_density, cross_section_area,
+                           moment_of_inertia):
+        # Determine the node ids of the start and the end coordinates in one pass
+        start_coordinates = np.asarray(start_coordinates, dtype=float).reshape(-1, 2)
+        end_coordinates = np.asarray(end_coordinates, dtype=float).reshape(-1, 2)
+        n = len(start_coordinates)
+        node_ids = self.positions_to_ids(np.concatenate((start_coordinates, end_coordinates)))
+        # Broadcast the element properties to a value for every element
+        properties = [np.broadcast_to(np.asarray(value, dtype=float), (n,)).tolist()
+                      for value in (youngs_modulus, mass_density, cross_section_area, moment_of_inertia)]
+        # Create the frame element entities
+        frame_element_ids = []
+        for i, (e, rho, a, inertia) in enumerate(zip(*properties)):
+            frame_element_ids.append(self.add_entity(
+                pystructural.solver.components.geometry.Line2D(int(node_ids[i]), int(node_ids[n + i])),
+                pystructural.solver.components.element.FrameElement2D(),
+                pystructural.solver.components.material.LinearElasticity2DMaterial(e, rho),
+                pystructural.solver.components.element_geometry.BeamElementGeometry(a, inertia)))
+        # Create the groups for the frame element entities
+        self.group_component.create_groups(frame_element_ids, self.phase_id_adder_list)
+        # Return the frame element entity ids
+        return frame_element_ids
+
+    def add_supports(self, coordinates, flags):
+        # Determine the node ids of the coordinates in one pass
+        node_ids = self.positions_to_ids(coordinates)
+        # The flags are the displacement x, displacement y and rotation z DOFs of each support
+        flags = np.broadcast_to(np.asarray(flags, dtype=bool), (len(node_ids), 3)).tolist()
+        # Add the support components to the nodes
+        for node_id, (displacement_x, displacement_y, rotation_z) in zip(node_ids.tolist(), flags):
+            self.add_component_at_entity(node_id, support.Support(displacement_x=displacement_x,
+                                                                  displacement_y=displacement_y,
+                                                                  rotation_z=rotation_z))
+
+    def add_result_coordinate(self, coordinate):
+        # Add a node at the coordinate such that the line elements are split at the coordinate
+        entity_id = self.position_to_id(coordinate)
+        if entity_id is None:
+            entity_id = self.add_node(coordinate)
+        return entity_id
+
+    def add_substructure(self, substructure, translation=(0.0, 0.0), rotation=0.0):
+        # Condense the substructure if it is not yet condensed
+        if substructure.condensed_stiffness_matrix is None:
+            substructure.condense()
+        # Determine the node ids of the boundary nodes of the instance
+        rotation_matrix = pystructural.solver.components.element.rotation_matrix_2d(rotation)[:2, :2]
+        node_ids = self.positions_to_ids(np.matmul(substructure.boundary_coordinates, rotation_matrix.T) +
+                                         np.asarray(translation, dtype=float))
+        # Create the super element entity
+        super_element = pystructural.solver.components.element.SuperElement2D(substructure, rotation, translation)
+        super_element_id = self.add_entity(pystructural.solver.components.geometry.NodeSet2D(node_ids.tolist()),
+                                           super_element)
+        # Add the condensed load vectors of the load cases of the substructure
+        for load_case_name, load_vector in substructure.condensed_load_vectors.items():
+            lc_id = self.load_combinations_component.add_load_case(load_case_name)
+            self.add_component(super_element_id, pystructural.solver.components.load.SuperElementLoad2D(
+                np.matmul(super_element.rotation_matrix, load_vector), lc_id))
+        # Return the super element entity id
+        return super_element_id
+
+    def get_substructure_results(self, substructure, load_combination='generic_load_combination'):
+        # Get the load combination id and the factors of the load cases of the load combination
+        load_combination_id = self.load_combinations_component.load_combination_names[load_combination]
+        load_case_factors = {self.load_combinations_component.load_cases[lc_id]: factor for lc_id, factor in
+                             self.load_combinations_component.load_case_factors(load_combination_id).items()}
+        # Gather the boundary displacements, the rotations and the translations of every instance
+        super_element_ids = []
+        boundary_displacements = []
+        rotations = []
+        translations = []
+        for entity_id, super_element in self.get_component(pystructural.solver.components.element.SuperElement2D):
+            if super_element.substructure is substructure:
+                super_element_ids.append(entity_id)
+                boundary_displacements.append(self.post_processor.linear_analysis_results.
+                                              get_element_displacement_vector(super_element, load_combination_id))
+                rotations.append(super_element.rotation)
+                translations.append(super_element.translation)
+        # Recover the displacements of all the nodes of every instance
+        positions, displacements = substructure.recover(np.array(boundary_displacements).reshape(len(rotations), -1),
+                                                        rotations, np.array(translations).reshape(-1, 2),
+                                                        load_case_factors)
+        # Return the super element entity ids, the positions and the displacements
+        return super_element_ids, positions, displacements
+
     def add_support(self, coordinate, displacement_x=True, displacement_y=True, rotation_z=True):
         # Create the support component
         support_component = support.Support(displacement_x=displacement_x, displacement_y=displacement_y,
@@ -212,9 +532,63 @@ class Structure2D(Structure):
         # Add the component to the position
         self.add_component_at_coordinate(coordinate, spring_component)
 
+    def update_spring(self, coordinate, spring_x=None, spring_y=None, rotation_spring_z=None):
+        # Get the spring at the coordinate, if there is none then add it
+        point_tuple = self.search_for_point(coordinate)
+        if point_tuple is None or not self.has_component(point_tuple[0],
+                                                         pystructural.solver.components.connection.Spring):
+            self.add_spring(coordinate, spring_x, spring_y, rotation_spring_z)
+            return
+        spring = self.get_component_from_entity(point_tuple[0], pystructural.solver.components.connection.Spring)
+        # Change the given spring values, the spring values that are not given are unchanged
+        spring.__init__(spring.spring_x if spring_x is None else spring_x,
+                        spring.spring_y if spring_y is None else spring_y,
+                        rotation_spring_z=spring.rotation_spring_z if rotation_spring_z is None else rotation_spring_z)
+        # Mark the node as changed, the change is a low rank update of the stiffness matrix
+        self.mark_changed('stiffness', point_tuple[0])
+
+    def update_section(self, coordinate, youngs_modulus=None, cross_section_area=None, moment_of_inertia=None):
+        # Get the line element at the coordinate or the given entity id
+        if isinstance(coordinate, list):
+            line_tuple = self.search_for_line_element(coordinate)
+            if line_tuple is None:
+                return
+            entity_id = line_tuple[0]
+        else:
+            entity_id = coordinate
+        # Change all the line elements of the group of the line element
+        group_id = self.group_component.get_group_id_from_entity(entity_id)
+        entity_ids = self.group_component.groups[group_id] if group_id is not None else [entity_id]
+        for entity_id in entity_ids:
+            # Change the given section properties, the section properties that are not given are unchanged
+            if youngs_modulus is not None:
+                for material in self.get_component_from_entity_generator(
+                        entity_id, pystructural.solver.components.material.LinearElasticity2DMaterial):
+                    material.youngs_modulus = youngs_modulus
+            for element_geometry in self.get_component_from_entity_generator(
+                    entity_id, pystructural.solver.components.element_geometry.BeamElementGeometry):
+                if cross_section_area is not None:
+                    element_geometry.cross_section_area = cross_section_area
+                if moment_of_inertia is not None:
+                    element_geometry.moment_of_inertia = moment_of_inertia
+            # Mark the line element as changed, the change is a low rank update of the stiffness matrix
+            self.mark_changed('stiffness', entity_id)
+
     def add_load_combination(self, load_combination_name, load_cases, check_copy=False):
         # Add a new load combination to the
         self.load_combinations_component.add_load_combination(load_combination_name, load_cases, True, check_copy)
+        # A new load combination only invalidates the load vectors
+        self.mark_changed('load')
+
+    def add_load_combinations(self, load_combination_name, permanent_load_cases=None, switch_load_cases=None,
+                              switch_list_load_cases=None, check_copy=False):
+        # Add the load combinations of the permanent load cases, the subsets of the switch load cases and one load case
+        # of every dict of the switch lists, they are named with the load combination name and their index
+        self.load_combinations_component.load_combination_creator(load_combination_name, permanent_load_cases,
+                                                                  switch_load_cases, switch_list_load_cases,
+                                                                  check_copy)
+        # New load combinations only invalidate the load vectors
+        self.mark_changed('load')
 
     def add_point_load(self, coordinate, point_load, load_case=None):
         # Create the spring component
@@ -223,45 +597,106 @@ class Structure2D(Structure):
         # Add the component to the position
         self.add_component_at_coordinate(coordinate, point_load_component)
 
+    def add_point_loads(self, coordinates, point_loads, load_case=None):
+        # Determine the node ids of the coordinates in one pass
+        node_ids = self.positions_to_ids(coordinates)
+        point_loads = np.broadcast_to(np.asarray(point_loads, dtype=float), (len(node_ids), 3))
+        # Add the point load components to the nodes
+        lc_id = self.load_combinations_component.add_load_case(load_case)
+        for node_id, point_load in zip(node_ids.tolist(), point_loads):
+            self.add_component_at_entity(node_id, pystructural.solver.components.load.PointLoad2D(point_load, lc_id))
+
     def add_global_q_load(self, entity_id, q_load, load_case=None):
-        def q_load_func(x):
-            return q_load
-        self.add_global_q_load_func(entity_id, q_load_func, load_case)
+        self.add_global_q_load_func(entity_id, load_distribution.ConstantDistribution(q_load), load_case)
 
     def add_global_q_load_line(self, entity_id, q_load, x_start, x_end, load_case=None):
-        def q_load_func(x):
-            if x_start <= x[0] <= x_end:
-                return q_load
-            else:
-                return 0.0
-        self.add_global_q_load_func(entity_id, q_load_func, load_case)
+        self.add_global_q_load_func(entity_id, load_distribution.TrapezoidalDistribution(q_load, q_load, x_start,
+                                                                                         x_end), load_case)
+
+    def add_global_q_load_trapezoidal(self, entity_id, q_start, q_end, x_start, x_end, load_case=None):
+        self.add_global_q_load_func(entity_id, load_distribution.TrapezoidalDistribution(q_start, q_end, x_start,
+                                                                                         x_end), load_case)
+
+    def add_global_q_load_piecewise_linear(self, entity_id, x_values, q_values, load_case=None):
+        self.add_global_q_load_func(entity_id, load_distribution.PiecewiseLinearDistribution(x_values, q_values),
+                                    load_case)
 
-    def add_global_q_load_func(self, entity_id, q_load_func, load_case=None):
+    def add_global_q_load_polynomial(self, entity_id, coefficients, x_start=None, x_end=None, load_case=None):
+        self.add_global_q_load_func(entity_id, load_distribution.PolynomialDistribution(coefficients, x_start, x_end),
+                                    load_case)
+
+    def add_global_q_load_func(self, entity_id, q_load_func, load_case=None, discontinuity_list=None,
+                               quadrature_order=None):
+        # The q-load function is a load distribution or a function of the position, the consistent nodal loads of a
+        # function are integrated with a Gauss rule of the quadrature order between the discontinuities, by default of
+        # order 3. The discontinuities and the quadrature order can't be given for a load distribution
         if entity_id in self.entities:
             lc_id = self.load_combinations_component.add_load_case(load_case)
-            self.add_component_at_entity(entity_id, pystructural.solver.components.load.QLoad2D(q_load_func, lc_id))
+            self.add_component_at_entity(entity_id, pystructural.solver.components.load.QLoad2D(q_load_func, lc_id,
+                                                                                                discontinuity_list,
+                                                                                                quadrature_order))
 
     def add_imposed_load(self, entity_id, imposed_load, load_case=None):
         if entity_id in self.entities:
             lc_id = self.load_combinations_component.add_load_case(load_case)
             self.add_component_at_entity(entity_id, pystructural.solver.components.load.ImposedLoad2D(imposed_load, lc_id))
 
+    def run_pre_processor(self):
+        # The first run merges the nodes within the minimum element distance, the next runs only merge the coinciding
+        # nodes because the split nodes of the previous runs are at the minimum element distance of each other
+        minimum_node_distance = 0.001 if self.is_preprocessed else self.minimum_element_distance
+        # Run the system: preprocessor 2D
+        self.run_system(PreProcessor2D(minimum_node_distance, subdivision=self.subdivision,
+                                       maximum_element_length=self.maximum_element_length))
+        self.is_preprocessed = True
+
     def solve_linear_system(self, analysis_name='linear_calculation', with_preprocessor=True,
                             linear_analysis_result_phases=None, linear_analysis_load_combinations=None):
         # If there is no load combination defined
         if len(self.load_combinations_component.load_combinations) is 0:
             # Add the generic load combination
             self.load_combinations_component.add_generic_load_combination()
+        # The index of the first profile of this analysis
+        profile_start = len(self.profiler.profiles) if self.profiler is not None else None
+        # Don't track the changes that the analysis makes to the structure
+        track_changes = self.track_changes
+        self.track_changes = False
 
-        # Run the system: preprocessor 2D
-        if with_preprocessor:
-            self.run_system(PreProcessor2D(self.minimum_element_distance))
-        # Add linear calculation system and solve
-        linear_analysis_system_id =\
-            self.add_system(LinearAnalysisSystem(analysis_name,
-                                                 list(self.load_combinations_component.load_combinations.keys())))
+        # If the topology of the structure is unchanged since the previous analysis with this name then the previous
+        # analysis is reused and only its invalidated stages are run
+        linear_analysis_system_id = self.linear_analysis_system_ids.get(analysis_name)
+        if with_preprocessor and linear_analysis_system_id is not None and self.change_level != 'topology':
+            linear_analysis_system = self.get_system(linear_analysis_system_id)
+            linear_analysis_system.change_level = self.change_level
+            linear_analysis_system.dirty_entities = self.dirty_entities
+            linear_analysis_system.load_combinations = list(self.load_combinations_component.load_combinations.keys())
+        else:
+            # Run the system: preprocessor 2D, it changes the topology so the previous analyses can't be reused. A new
+            # analysis of a preprocessed structure of which at most the loads are changed keeps the previous analyses
+            if with_preprocessor and (not self.is_preprocessed or self.change_level not in (None, 'load')):
+                self.run_pre_processor()
+                for previous_system_id in self.linear_analysis_system_ids.values():
+                    self.remove_system(previous_system_id)
+                self.linear_analysis_system_ids = {}
+            # Add linear calculation system and solve
+            linear_analysis_system_id =\
+                self.add_system(LinearAnalysisSystem(analysis_name,
+                                                     list(self.load_combinations_component.load_combinations.keys())))
+            if with_preprocessor:
+                self.linear_analysis_system_ids[analysis_name] = linear_analysis_system_id
         # Process linear calculation system
         self.process_systems(linear_analysis_system_id)
+        # The structure is analysed, reset the change tracking
+        self.track_changes = track_changes
+        if with_preprocessor:
+            self.change_level = None
+            self.dirty_entities = set()
+        # Add the profile report of this analysis to the result entity, it replaces the report of a reused analysis
+        if profile_start is not None:
+            result_entity_id = self.get_system(linear_analysis_system_id).result_entity_id
+            if self.has_component(result_entity_id, ProfileReportComponent):
+                self.remove_component_type(result_entity_id, ProfileReportComponent)
+            self.add_component(result_entity_id, ProfileReportComponent(self.profiler.report(profile_start)))
         # Get the linear analysis results of this analysis
         linear_analysis_result = LinearAnalysisResults2D(self,
                                                          self.get_system(linear_analysis_system_id).result_entity_id)
@@ -277,10 +712,60 @@ class Structure2D(Structure):
                                                                             linear_analysis_load_combinations)
         # Create an instance of the post processor for this structure with the linear analysis
         self.post_processor = PostProcessor2D(self, linear_analysis_result)
+        self.spatial_index = None
         # Return the linear analysis results
         return linear_analysis_result
 
-    def solve_linear_phase_system(self, phase_analysis, analysis_name='linear_phase_calculation'):
+    def solve_load_combination_chunks(self, load_combinations, chunk_size=1000,
+                                      analysis_name='load_combination_chunks'):
+        # Solve an iterable of load combinations, dicts of {load_case_name: factor} like the ones of
+        # LoadCombinationsComponent.load_combination_generator, chunk by chunk. The load combinations of a chunk
+        # replace the load combinations of the structure and they are solved at once with the factorization of the
+        # first chunk. The results of a chunk are discarded when the next chunk is solved, such that the memory doesn't
+        # depend on the amount of load combinations. The chunks are solved in their own analysis, which keeps the
+        # previous analyses of the structure if its topology is unchanged. The load combinations and the post processor
+        # of the structure are restored at the end.
+        load_combinations_component = self.load_combinations_component
+        saved_load_combinations = (load_combinations_component.load_combinations,
+                                   load_combinations_component.load_combination_names,
+                                   load_combinations_component.load_combination_names_inverse,
+                                   load_combinations_component.load_combination_keys,
+                                   load_combinations_component.current_load_combination_id)
+        saved_post_processor = (self.post_processor, self.spatial_index)
+        chunk_start = 0
+        try:
+            for chunk in load_combination_chunks(load_combinations, chunk_size):
+                # Replace the load combinations by the load combinations of the chunk
+                load_combinations_component.remove_load_combinations()
+                for i, load_cases in enumerate(chunk):
+                    load_combinations_component.add_load_combination(analysis_name + str(chunk_start + i), load_cases,
+                                                                     True)
+                chunk_start += len(chunk)
+                self.mark_changed('load')
+                # Solve the chunk and yield its load combinations and results
+                linear_analysis_result = self.solve_linear_system(analysis_name)
+                yield chunk, linear_analysis_result
+                # Discard the load and the displacement vectors of the chunk
+                displacement_and_load_vectors = linear_analysis_result.displacement_and_load_vectors_component
+                displacement_and_load_vectors.reduced_displacement_vectors.clear()
+                displacement_and_load_vectors.displacement_vectors.clear()
+                displacement_and_load_vectors.load_vectors.clear()
+                self.get_component_from_entity(linear_analysis_result.result_entity_id,
+                                               calculation_components.ReducedLoadVectorsComponent).\
+                    reduced_load_vectors.clear()
+        finally:
+            # Restore the load combinations of the structure
+            (load_combinations_component.load_combinations, load_combinations_component.load_combination_names,
+             load_combinations_component.load_combination_names_inverse,
+             load_combinations_component.load_combination_keys,
+             load_combinations_component.current_load_combination_id) = saved_load_combinations
+            load_combinations_component.reset_factor_matrix()
+            self.mark_changed('load')
+            # Restore the post processor of the results of the structure
+            self.post_processor, self.spatial_index = saved_post_processor
+
+    def solve_linear_phase_system(self, phase_analysis, analysis_name='linear_phase_calculation', max_workers=None,
+                                  delta_assembly=True):
         # If there is no load combination defined
         if len(self.load_combinations_component.load_combinations) is 0:
             # Add the generic load combination
@@ -290,17 +775,23 @@ class Structure2D(Structure):
         self.phase_id_filter = None
         self.phase_id_adder_list = None
 
-        # Run the system: preprocessor 2D
-        self.run_system(PreProcessor2D(self.minimum_element_distance))
+        # Run the system: preprocessor 2D, it changes the topology so the previous analyses can't be reused
+        self.run_pre_processor()
+        self.change_level = 'topology'
         # Add linear calculation system and solve
         linear_phase_analysis_system_id = \
             self.add_system(LinearPhaseAnalysisSystem(analysis_name,
                                                       list(self.load_combinations_component.load_combinations.keys()),
-                                                      phase_analysis))
+                                                      phase_analysis, max_workers, delta_assembly))
         # Process linear calculation system
         self.process_systems(linear_phase_analysis_system_id)
 
     def get_point_displacement_vector(self, coordinate, load_combination='generic_load_combination'):
+        # If the line elements are not split, the displacement is evaluated on the line element at the coordinate
+        if self.subdivision != 'uniform':
+            if self.search_for_point(coordinate) is None:
+                station_values = self.get_line_station_values(coordinate, load_combination)
+                return None if station_values is None else station_values[1]
         # Get the entity id and the instance of the point
         entity_id, point = self.search_for_point(coordinate, error=self.minimum_element_distance+0.01)
         # If the point exists
@@ -358,6 +849,141 @@ class Structure2D(Structure):
                 return self.post_processor.linear_analysis_results.get_element_global_force_vector(element_instance,
                                                                                                    load_combination_id)
 
+    def get_line_station_values(self, coordinate, load_combination='generic_load_combination'):
+        # Get the entity id and the instance of the line
+        tuple = self.search_for_line_element(coordinate)
+        if tuple is None:
+            return None
+        entity_id, line = tuple
+        # Get the element instance
+        element_instance = self.post_processor.linear_analysis_results.get_line_element(entity_id)
+        if element_instance is None:
+            return None
+        # Determine the position of the projection of the coordinate on the unit interval of the line
+        projection = math_ps.point_line_projection(np.asarray(coordinate, dtype=float), line.point_list[0],
+                                                   line.point_list[1])
+        unit = math_ps.point_2d_norm(projection - line.point_list[0]) / line.length
+        # Get the load combination id
+        load_combination_id = self.load_combinations_component.load_combination_names[load_combination]
+        # Return the force vector and the displacement vector at the station
+        _, force_vectors, displacement_vectors = self.post_processor.linear_analysis_results.\
+            get_element_station_values(element_instance, load_combination_id, [unit])
+        return force_vectors[0], displacement_vectors[0]
+
+    def get_line_internal_force_vector(self, coordinate, load_combination='generic_load_combination'):
+        # Get the normal force, the shear force and the moment of the line element at the coordinate
+        station_values = self.get_line_station_values(coordinate, load_combination)
+        return None if station_values is None else station_values[0]
+
+    def get_spatial_index(self):
+        # Build the spatial index of the points and the lines once for the results of an analysis
+        if self.spatial_index is None:
+            self.spatial_index = SpatialIndex2D.from_structure(self)
+        return self.spatial_index
+
+    def get_load_combination_ids(self, load_combinations):
+        # Get the load combination ids of a load combination name or a list of load combination names
+        if isinstance(load_combinations, str):
+            load_combinations = [load_combinations]
+        return [self.load_combinations_component.load_combination_names[load_combination]
+                for load_combination in load_combinations]
+
+    def get_points_displacement_vectors(self, coordinates, load_combinations='generic_load_combination'):
+        # Get the displacement vectors of the nodes at many coordinates for many load combinations as a (N, L, 3)
+        # array, the vectors of the coordinates without a node are nan
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        load_combination_ids = self.get_load_combination_ids(load_combinations)
+        node_ids = self.get_spatial_index().query_points(coordinates, self.minimum_element_distance + 0.01)
+        displacement_vectors = self.post_processor.linear_analysis_results.get_result_rows(
+            'node_displacement', load_combination_ids, node_ids, 3)
+        # If the line elements are not split, the displacement is evaluated on the line element at the coordinates
+        # that are not at a node
+        if self.subdivision != 'uniform':
+            is_line = self.get_spatial_index().query_points(coordinates) < 0
+            if np.any(is_line):
+                displacement_vectors[is_line] = self.get_lines_station_values(coordinates[is_line],
+                                                                              load_combinations)[1]
+        return displacement_vectors
+
+    def get_points_global_force_vectors(self, coordinates, load_combinations='generic_load_combination'):
+        # Get the global force vectors of the nodes at many coordinates for many load combinations as a (N, L, 3)
+        # array, the vectors of the coordinates without a node are nan
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        node_ids = self.get_spatial_index().query_points(coordinates, self.minimum_element_distance + 0.01)
+        return self.post_processor.linear_analysis_results.get_result_rows(
+            'node_force', self.get_load_combination_ids(load_combinations), node_ids, 3)
+
+    def get_points_support_global_force_vectors(self, coordinates, load_combinations='generic_load_combination'):
+        # Get the support global force vectors of the nodes at many coordinates for many load combinations as a
+        # (N, L, 3) array, the vectors of the coordinates without a node are nan
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        node_ids = self.get_spatial_index().query_points(coordinates, self.minimum_element_distance + 0.01)
+        return self.post_processor.linear_analysis_results.get_result_rows(
+            'support_force', self.get_load_combination_ids(load_combinations), node_ids, 3)
+
+    def get_lines_element_ids(self, coordinates):
+        # Get the entity ids of the line elements and the units of the projections of many coordinates, the entity
+        # ids of the coordinates without a line element are -1
+        line_ids, units = self.get_spatial_index().query_lines(coordinates)
+        for line_id in np.unique(line_ids[line_ids >= 0]):
+            if self.post_processor.linear_analysis_results.get_line_element(line_id) is None:
+                line_ids[line_ids == line_id] = -1
+        return line_ids, units
+
+    def get_lines_force_vectors(self, coordinates, load_combinations='generic_load_combination', local=False):
+        # Get the force vectors of the line elements at many coordinates for many load combinations as a (N, L, 6)
+        # array, the vectors of the coordinates without a line element are nan
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        results = self.post_processor.linear_analysis_results
+        line_ids, _ = self.get_lines_element_ids(coordinates)
+        force_vectors = results.get_result_rows('element_force', self.get_load_combination_ids(load_combinations),
+                                                line_ids, 6)
+        # Rotate the force vectors to the local space of their line elements
+        if local:
+            for line_id in np.unique(line_ids[line_ids >= 0]):
+                is_line = line_ids == line_id
+                force_vectors[is_line] = np.einsum('ij,nlj->nli', results.get_line_element(line_id).geometry.
+                                                   global_to_local_matrix, force_vectors[is_line])
+        return force_vectors
+
+    def get_lines_station_values(self, coordinates, load_combinations='generic_load_combination'):
+        # Get the internal force vectors and the displacement vectors of the line elements at many coordinates for many
+        # load combinations as two (N, L, 3) arrays, the vectors of the coordinates without a line element are nan
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        load_combination_ids = self.get_load_combination_ids(load_combinations)
+        results = self.post_processor.linear_analysis_results
+        line_ids, units = self.get_lines_element_ids(coordinates)
+        force_vectors = np.full((len(coordinates), len(load_combination_ids), 3), np.nan)
+        displacement_vectors = np.full((len(coordinates), len(load_combination_ids), 3), np.nan)
+        # Evaluate the stations of all the coordinates on a line element at once
+        for line_id in np.unique(line_ids[line_ids >= 0]):
+            is_line = line_ids == line_id
+            element_instance = results.get_line_element(line_id)
+            for j, load_combination_id in enumerate(load_combination_ids):
+                _, force_vectors[is_line, j], displacement_vectors[is_line, j] = \
+                    results.get_element_station_values(element_instance, load_combination_id, units[is_line])
+        return force_vectors, displacement_vectors
+
+    def get_lines_internal_force_vectors(self, coordinates, load_combinations='generic_load_combination'):
+        # Get the normal forces, the shear forces and the moments of the line elements at many coordinates for many
+        # load combinations as a (N, L, 3) array
+        return self.get_lines_station_values(coordinates, load_combinations)[0]
+
+    def get_sensitivities(self, response, load_combination='generic_load_combination', per_group=False):
+        # Get the load combination id
+        load_combination_id = self.load_combinations_component.load_combination_names[load_combination]
+        # Determine the derivatives of the response to the ea and the ei of every frame element with one adjoint solve
+        entity_ids, sensitivities = SensitivityAnalysis2D(self.post_processor.linear_analysis_results).\
+            element_sensitivities(response, [load_combination_id])
+        if not per_group:
+            return {entity_id: sensitivity[0] for entity_id, sensitivity in zip(entity_ids, sensitivities)}
+        # Sum the derivatives of the line elements of every group, the derivatives to the ea and the ei of the group
+        group_sensitivities = {}
+        for entity_id, sensitivity in zip(entity_ids, sensitivities):
+            group_id = self.group_component.get_group_id_from_entity(entity_id)
+            group_sensitivities[group_id] = group_sensitivities.get(group_id, 0.0) + sensitivity[0]
+        return group_sensitivities
+
     def show_structure(self, load_combination='generic_load_combination', plot_window=None,
                        displacement_scale=100.0, dof_scale=0.1, support_scale=0.25, visualization_package='matplotlib'):
         # Draw the structure
@@ -396,7 +1022,8 @@ class Structure2D(Structure):
         # Draw the structure results
         load_combination_id = self.load_combinations_component.load_combination_names[load_combination]
         self.post_processor.draw_structure_results(load_combination_id, True, True, True, True, 1.0, 1.0)
-        # Add the title and x and y labels
+        # Add the title and x and y labels, matplotlib is only imported when it is used
+        import matplotlib.pyplot as plt
         plt.title(title)
         plt.xlabel(xlabel)
         plt.ylabel(ylabel)
@@ -413,7 +1040,8 @@ class Structure2D(Structure):
         self.post_processor.draw_supports(1.0)
         # Draw the structure min max results
         self.post_processor.draw_dof_enveloping(dof, self.load_combinations_component.load_combinations.keys(), 1.0)
-        # Add the title and x and y labels
+        # Add the title and x and y labels, matplotlib is only imported when it is used
+        import matplotlib.pyplot as plt
         plt.title(title)
         plt.xlabel(xlabel)
         plt.ylabel(ylabel)
@@ -0,0 +1,167 @@
+"""
+pystructural.core.substructure
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements substructures: modules of a structure that are condensed once to their boundary nodes and that are
+instantiated many times in a structure as super elements.
+"""
+import numpy as np
+
+from pystructural.pre_processor.pre_processor import PreProcessor2D
+from pystructural.solver.components.calculation_components import LinearCalculationComponent
+from pystructural.solver.components.geometry import Point2D
+from pystructural.solver.components.element import rotation_matrix_2d
+from pystructural.solver.results.result_components import ResultComponent
+from pystructural.solver.systems.analysis.dof_systems import UpdateDOFs, UpdateReducedDOFs
+from pystructural.solver.systems.analysis.element_systems import UpdateElements
+from pystructural.solver.systems.analysis.geometry_systems import UpdateGeometries
+from pystructural.solver.systems.analysis.load_systems import UpdateLoads, load_subclasses_2d
+from pystructural.solver.systems.analysis.stiffness_systems import UpdateGlobalAndReducedStiffnessMatrices
+from .structure2d import Structure2D
+
+__all__ = ['Substructure2D']
+
+
+class Substructure2D(Structure2D):
+    """A substructure is built like a structure, its boundary nodes connect it to the structures it is placed in. The
+    substructure is condensed once to the dofs of the boundary nodes, every instance shares the condensed stiffness
+    matrix and the condensed load vectors.
+
+    :param boundary_coordinates: The coordinates of the boundary nodes, the dofs of the boundary nodes may not be
+        supported.
+    :param minimum_element_distance: The minimum element distance of the substructure.
+    :param subdivision: The subdivision of the line elements of the substructure.
+    :param maximum_element_length: The maximum element length of the adaptive subdivision.
+    """
+
+    def __init__(self, boundary_coordinates, minimum_element_distance=0.1, subdivision='uniform',
+                 maximum_element_length=None):
+        super().__init__(minimum_element_distance, subdivision, maximum_element_length=maximum_element_length)
+        # The coordinates of the boundary nodes
+        self.boundary_coordinates = np.asarray(boundary_coordinates, dtype=float).reshape(-1, 2)
+        # The condensed stiffness matrix and the condensed load vector of every load case at the boundary dofs
+        self.condensed_stiffness_matrix = None
+        self.condensed_load_vectors = {}
+        # The matrices to recover the interior dofs: interior = interior_load_displacements - coupling @ boundary
+        self.coupling_matrix = None
+        self.interior_load_displacements = {}
+        # The coordinates of all the nodes and the index of every node dof in the vector [boundary, interior, 0]
+        self.node_coordinates = None
+        self.node_dof_index = None
+
+    def condense(self):
+        """Condense the substructure to the dofs of its boundary nodes.
+        """
+        # Run the pre processor and compute the geometries, the elements, the dofs and the loads
+        self.run_system(PreProcessor2D(self.minimum_element_distance, subdivision=self.subdivision,
+                                       maximum_element_length=self.maximum_element_length))
+        result_entity_id = self.add_entity(ResultComponent('substructure'))
+        self.run_system(UpdateGeometries())
+        self.run_system(UpdateElements())
+        dof_system = UpdateDOFs(result_entity_id)
+        self.run_system(dof_system)
+        self.run_system(UpdateReducedDOFs(result_entity_id))
+        self.run_system(UpdateLoads())
+        # Assemble the reduced stiffness matrix
+        dof_calculation_component = dof_system.dof_calculation_component
+        linear_calculation_component = self.add_component(result_entity_id, LinearCalculationComponent())
+        self.run_system(UpdateGlobalAndReducedStiffnessMatrices(dof_calculation_component,
+                                                                linear_calculation_component))
+        k = linear_calculation_component.reduced_global_stiffness_matrix
+
+        # Define the reduced dof id of a dof of a node, None if the dof is supported
+        def reduced_dof_id(node_id, dof_id):
+            global_id = dof_calculation_component.local_to_global_dof_dict[node_id][dof_id]
+            return dof_calculation_component.global_to_reduced_dof_dict.get(global_id)
+
+        # Determine the reduced dof ids of the boundary nodes
+        boundary = []
+        boundary_node_ids = []
+        for coordinate in self.boundary_coordinates:
+            point_tuple = self.search_for_point(coordinate)
+            if point_tuple is None:
+                raise ValueError('There is no node at the boundary coordinate {0}.'.format(list(coordinate)))
+            boundary_node_ids.append(point_tuple[0])
+            for dof_id in (0, 1, 5):
+                if reduced_dof_id(point_tuple[0], dof_id) is None:
+                    raise ValueError('The boundary node at {0} is supported.'.format(list(coordinate)))
+                boundary.append(reduced_dof_id(point_tuple[0], dof_id))
+        boundary = np.array(boundary, dtype=int)
+        interior = np.setdiff1d(np.arange(len(k)), boundary)
+        # Determine the reduced load vector of every load case
+        reduced_load_vectors = {}
+        for load_class in load_subclasses_2d:
+            for entity, components in self.get_components(load_class.compatible_geometry, load_class):
+                load_case_name = self.load_combinations_component.load_cases[components[1].load_case_id]
+                reduced_load_vector = reduced_load_vectors.setdefault(load_case_name, np.zeros(len(k)))
+                for data in components[1].load_dof_generator():
+                    r_i = reduced_dof_id(data[0][0], data[0][1])
+                    if r_i is not None:
+                        reduced_load_vector[r_i] += data[1]
+
+        # Condense the stiffness matrix and the load vectors with the Schur complement
+        k_interior = k[np.ix_(interior, interior)]
+        k_interior_boundary = k[np.ix_(interior, boundary)]
+        self.coupling_matrix = np.linalg.solve(k_interior, k_interior_boundary) if len(interior) > 0 else \
+            np.zeros((0, len(boundary)))
+        self.condensed_stiffness_matrix = k[np.ix_(boundary, boundary)] - \
+            np.matmul(k_interior_boundary.T, self.coupling_matrix)
+        self.condensed_load_vectors = {}
+        self.interior_load_displacements = {}
+        for load_case_name, reduced_load_vector in reduced_load_vectors.items():
+            interior_load_displacement = np.linalg.solve(k_interior, reduced_load_vector[interior]) if \
+                len(interior) > 0 else np.zeros(0)
+            self.interior_load_displacements[load_case_name] = interior_load_displacement
+            self.condensed_load_vectors[load_case_name] = reduced_load_vector[boundary] - \
+                np.matmul(k_interior_boundary.T, interior_load_displacement)
+
+        # Determine the coordinates of all the nodes and the position of their dofs in the recovered vector
+        position = np.full(len(k), -1, dtype=int)
+        position[boundary] = np.arange(len(boundary))
+        position[interior] = len(boundary) + np.arange(len(interior))
+        node_coordinates = []
+        node_dof_index = []
+        for node_id in dof_calculation_component.local_to_global_dof_dict:
+            node_coordinates.append(self.get_component_from_entity(node_id, Point2D).point_list[0])
+            dof_index = []
+            for dof_id in (0, 1, 5):
+                r_i = reduced_dof_id(node_id, dof_id) if \
+                    dof_id in dof_calculation_component.local_to_global_dof_dict[node_id] else None
+                # The supported dofs point to the zero at the end of the recovered vector
+                dof_index.append(-1 if r_i is None else position[r_i])
+            node_dof_index.append(dof_index)
+        self.node_coordinates = np.array(node_coordinates)
+        self.node_dof_index = np.array(node_dof_index, dtype=int)
+
+    def recover(self, boundary_displacements, rotations, translations, load_case_factors):
+        """Recover the displacements of all the nodes of many instances in one vectorized pass.
+
+        :param boundary_displacements: A (N, B) array with the global displacements of the boundary dofs of every
+            instance.
+        :param rotations: A (N,) array with the rotation of every instance.
+        :param translations: A (N, 2) array with the translation of every instance.
+        :param load_case_factors: A dict with the factor of every load case name of the substructure.
+        :return: A tuple (positions, displacements) with a (N, M, 2) array with the global positions of the M nodes
+            of every instance and a (N, M, 3) array with their global displacements and rotations.
+        """
+        boundary_displacements = np.asarray(boundary_displacements, dtype=float)
+        n = len(boundary_displacements)
+        # The rotation matrices of every instance
+        rotation_matrices = np.array([rotation_matrix_2d(rotation) for rotation in rotations])
+        # Rotate the boundary displacements to the local space of the substructure
+        local_boundary = np.einsum('nji,nbj->nbi', rotation_matrices,
+                                   boundary_displacements.reshape(n, -1, 3)).reshape(n, -1)
+        # Recover the interior displacements of every instance at once
+        interior_load_displacement = np.zeros(self.coupling_matrix.shape[0])
+        for load_case_name, factor in load_case_factors.items():
+            if load_case_name in self.interior_load_displacements:
+                interior_load_displacement += factor * self.interior_load_displacements[load_case_name]
+        local_interior = interior_load_displacement - np.matmul(local_boundary, self.coupling_matrix.T)
+        # Gather the local displacements of every node, the supported dofs are zero
+        local_vector = np.concatenate((local_boundary, local_interior, np.zeros((n, 1))), axis=1)
+        local_displacements = local_vector[:, self.node_dof_index]
+        # Rotate the displacements and the positions to the global space
+        displacements = np.einsum('nij,nmj->nmi', rotation_matrices, local_displacements)
+        positions = np.einsum('nij,mj->nmi', rotation_matrices[:, :2, :2], self.node_coordinates) + \
+            np.asarray(translations, dtype=float).reshape(n, 1, 2)
+        return positions, displacements
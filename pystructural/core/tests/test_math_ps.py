@@ -119,6 +119,42 @@ def test_line_embedding():
     assert line_embedding(1.1, l1, l2) is None
 
 
+def test_unique_points():
+    points = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 0.0001], [1.0, 0.0], [2.0, 0.0]])
+
+    first_index, inverse = unique_points(points)
+
+    assert len(first_index) == 3
+    assert inverse[0] == inverse[2]
+    assert inverse[1] == inverse[3]
+    assert len(set(inverse)) == 3
+    assert np.allclose(points[first_index[inverse]], np.round(points, 2))
+
+    # Points near each other are grouped, also if they are rounded to different grid cells, a point is only grouped
+    # with a point that starts a group
+    points = np.array([[1.0004, 0.0], [1.0006, 0.0], [1.0012, 0.0], [1.0016, 0.0]])
+
+    first_index, inverse = unique_points(points)
+
+    assert np.array_equal(first_index, [0, 3])
+    assert np.array_equal(inverse, [0, 0, 0, 1])
+
+
+##################
+# LINEAR ALGEBRA #
+##################
+
+def test_factorize():
+    symmetric_matrix = np.array([[4.0, 1.0], [1.0, 3.0]])
+    matrix = np.array([[0.0, 2.0], [1.0, 1.0]])
+    vector = np.array([1.0, 2.0])
+
+    assert factorize(symmetric_matrix)[0] == 'cholesky'
+    assert factorize(matrix)[0] == 'lu'
+    assert np.allclose(solve_factorized(factorize(symmetric_matrix), vector), np.linalg.solve(symmetric_matrix, vector))
+    assert np.allclose(solve_factorized(factorize(matrix), vector), np.linalg.solve(matrix, vector))
+
+
 ##############
 # SET THEORY #
 ##############
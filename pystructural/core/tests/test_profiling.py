@@ -0,0 +1,46 @@
+import pystructural as ps
+
+
+def test_system_profiler():
+    # Create a structure instance and enable the profiling with a hook
+    hook_names = []
+    structure = ps.core.Structure2D()
+    structure.enable_profiling(hook=lambda profile: hook_names.append(profile.name))
+    structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+    structure.add_support([10.0, 0.0], displacement_y=False)
+    structure.add_point_load([5.0, 0.0], [0.0, -1.0, 0.0])
+    # Solve the linear system
+    linear_analysis_result = structure.solve_linear_system()
+    structure.disable_profiling()
+    # Test the profile report on the result entity
+    report = linear_analysis_result.profile_report
+    names = [profile['name'] for profile in report]
+    for name in ['PreProcessor2D', 'CheckOverlappingNodes2D', 'AddSplitNodes2D', 'LinearAnalysisSystem',
+                 'UpdateGeometries', 'UpdateElements', 'UpdateDOFs', 'UpdateReducedDOFs', 'UpdateLoads',
+                 'ExecuteLinearCalculation']:
+        assert name in names
+    assert sorted(hook_names) == sorted(names)
+    for profile in report:
+        assert profile['wall_time'] >= 0.0
+        assert profile['cpu_time'] >= 0.0
+        assert profile['peak_memory'] >= 0
+    # Test the item counts and the call tree
+    profiles = {profile['name']: profile for profile in report}
+    assert profiles['UpdateElements']['item_count'] == 100
+    assert profiles['UpdateDOFs']['item_count'] == 303
+    assert report[profiles['AddSplitNodes2D']['parent']]['name'] == 'PreProcessor2D'
+    assert profiles['AddSplitNodes2D']['depth'] == profiles['PreProcessor2D']['depth'] + 1
+    # The factorization of the reduced global stiffness matrix is a stage of its own
+    assert profiles['FactorizeStiffnessMatrix']['item_count'] == profiles['UpdateReducedDOFs']['item_count']
+    assert report[profiles['FactorizeStiffnessMatrix']['parent']]['name'] == 'ExecuteLinearCalculation'
+
+
+def test_system_profiler_disabled():
+    # Create a structure instance without profiling
+    structure = ps.core.Structure2D()
+    structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+    structure.add_support([10.0, 0.0], displacement_y=False)
+    # Test that there is no profile report
+    assert structure.solve_linear_system().profile_report is None
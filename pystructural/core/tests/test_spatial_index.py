@@ -0,0 +1,20 @@
+import numpy as np
+
+from pystructural.core.spatial_index import *
+
+
+def test_query_points():
+    spatial_index = SpatialIndex2D([3, 5], [[0.0, 0.0], [1.0, 0.0]], [], [], [])
+
+    assert np.array_equal(spatial_index.query_points([[0.0, 0.0005], [0.9995, 0.0], [0.5, 0.0]]), [3, 5, -1])
+    assert np.array_equal(spatial_index.query_points([[0.55, 0.0]], error=0.5), [5])
+
+
+def test_query_lines():
+    spatial_index = SpatialIndex2D([], [], [7, 8, 9], [[0.0, 0.0], [1.0, 0.0], [0.0, 0.0]],
+                                   [[1.0, 0.0], [3.0, 0.0], [0.0, 1.0]])
+    line_ids, units = spatial_index.query_lines([[0.5, 0.0], [2.0, 0.0005], [1.0, 0.0], [0.0, 0.25], [0.5, 0.5]])
+
+    # The first line is found at the node between the first and the second line
+    assert np.array_equal(line_ids, [7, 8, 7, 9, -1])
+    assert np.allclose(units[:4], [0.5, 0.5, 1.0, 0.25])
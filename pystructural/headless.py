@@ -0,0 +1,18 @@
+"""
+pystructural.headless
+^^^^^^^^^^^^^^^^^^^^^
+
+The solver-only entry point of PyStructural. Importing this module, building a structure and solving it never
+imports a plotting library, the visualization packages are only imported when a structure is shown or saved.
+"""
+from pystructural.core.structure2d import Structure2D
+from pystructural.core.batch import ModelDescription, solve_batch
+from pystructural.solver.components.phased_analysis_components import PhasedAnalysis
+from pystructural.solver.results.linear_analysis_results import LinearAnalysisResults2D
+
+__all__ = ['Structure2D', 'ModelDescription', 'solve_batch', 'PhasedAnalysis', 'LinearAnalysisResults2D',
+           'visualization_modules']
+
+
+# The top level modules of the visualization packages
+visualization_modules = ['matplotlib', 'bokeh', 'svgpathtools']
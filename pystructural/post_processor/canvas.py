@@ -1,11 +1,6 @@
 import copy
 
-import matplotlib.pyplot as plt
-import bokeh.plotting as bk_plt
-import bokeh.models as bk_mod
-import bokeh.io as bk_io
 import numpy as np
-import svgpathtools as svg
 
 __all__ = ['Canvas',
            'scale_line', 'scale_lines',
@@ -99,6 +94,8 @@ class Canvas:
             self.save_svgpathtools(filename + '.svg')
 
     def show_matplotlib(self, plot_window):
+        # The visualization packages are only imported when they are used
+        import matplotlib.pyplot as plt
         # Plot each line to matplotlib
         for line in self.lines:
             plt.plot(line[0], line[1], line[2])
@@ -113,6 +110,8 @@ class Canvas:
         plt.gcf().clear()
 
     def show_bokeh(self):
+        import bokeh.plotting as bk_plt
+        import bokeh.models as bk_mod
         # Instantiate the figure
         f = bk_plt.figure()
         # Plot each line to bokeh
@@ -125,6 +124,7 @@ class Canvas:
         bk_plt.show(f)
 
     def save_matplotlib(self, filename, plot_window):
+        import matplotlib.pyplot as plt
         # Plot each line to matplotlib
         for line in self.lines:
             plt.plot(line[0], line[1], line[2])
@@ -139,6 +139,9 @@ class Canvas:
         plt.gcf().clear()
 
     def save_bokeh(self, filename):
+        import bokeh.plotting as bk_plt
+        import bokeh.models as bk_mod
+        import bokeh.io as bk_io
         # Instantiate the figure
         f = bk_plt.figure()
         # Plot each line to bokeh
@@ -151,6 +154,7 @@ class Canvas:
         bk_io.export_png(f, filename)
 
     def save_svgpathtools(self, filename):
+        import svgpathtools as svg
         lines = []
         for x, y, _ in self.lines:
             for i in range(len(x)-1):
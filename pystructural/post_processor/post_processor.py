@@ -76,13 +76,13 @@ class PostProcessor2D:
 
     # TODO place the general draw function outside of the following three functions
     def draw_displacements(self, load_combination, scale=1.0, decimal_rounding=2, color='blue'):
+        # Point of interest detector class instance for all the groups
+        poid = PointOfInterestDetector()
         # For every group of line elements
         for group_id in self.line_element_sort.group_id_generator(self.structure.phase_id_filter):
             # Initialize the x and the y list of the line
             x = []
             y = []
-            # Point of interest detector class instance
-            poid = PointOfInterestDetector()
             # Initialize the variable for the previous position vector
             previous_position_vector = None
             # For every line in the group of line elements
@@ -100,7 +100,7 @@ class PostProcessor2D:
                 y.append(line_point[1])
                 # Add the value to the point of interest detector
                 poid.add_value(position_vector, position_vector + displacement_vector,
-                               np.linalg.norm(displacement_vector) / scale)
+                               np.linalg.norm(displacement_vector) / scale, group_id)
                 # Set the previous position dof position
                 previous_position_vector = copy.deepcopy(position_vector)
             # Draw the last point
@@ -108,20 +108,20 @@ class PostProcessor2D:
             y.append(previous_position_vector[1])
             # Draw the line
             self.canvas.draw_line(x, y, color)
-            # Plot the point of interests
-            poi = poid.get_points_of_interest()
+        # Plot the point of interests of all the groups
+        for poi in poid.get_group_points_of_interest().values():
             for _, text_position, value in poi:
                 self.canvas.draw_text(text_position[0], text_position[1], str(round(value, decimal_rounding)))
 
     # TODO change this to local dof generator
     def draw_dof(self, dof, load_combination, scale=1.0, decimal_rounding=2, color='red'):
+        # Point of interest detector class instance for all the groups
+        poid = PointOfInterestDetector()
         # For every group of line elements
         for group_id in self.line_element_sort.group_id_generator(self.structure.phase_id_filter):
             # Initialize the x and the y list of the line
             x = []
             y = []
-            # Point of interest detector class instance
-            poid = PointOfInterestDetector()
             # Get the tangent vector for the group of line elements
             tangent_vector = self.linear_analysis_results.group_tangent_vector(group_id)
             # Initialize the variable for the previous dof value
@@ -139,7 +139,8 @@ class PostProcessor2D:
                 x.append(line_point[0])
                 y.append(line_point[1])
                 # Add the value to the point of interest detector
-                poid.add_value(position_vector, position_vector + tangent_vector * dof_value, dof_value / scale)
+                poid.add_value(position_vector, position_vector + tangent_vector * dof_value, dof_value / scale,
+                               group_id)
                 # Set the previous position dof position
                 previous_position_vector = copy.deepcopy(position_vector)
             # Draw the last point
@@ -147,13 +148,16 @@ class PostProcessor2D:
             y.append(previous_position_vector[1])
             # Draw the line
             self.canvas.draw_line(x, y, color)
-            # Plot the point of interests
-            poi = poid.get_points_of_interest()
+        # Plot the point of interests of all the groups
+        for poi in poid.get_group_points_of_interest().values():
             for _, text_position, value in poi:
                 self.canvas.draw_text(text_position[0], text_position[1], str(round(value, decimal_rounding)))
 
     def draw_dof_enveloping(self, dof, load_combinations, scale=1.0, decimal_rounding=2, color_min='red',
                             color_max='blue'):
+        # Point of interest detector class instances for the min and the max values of all the groups
+        poid_min = PointOfInterestDetector()
+        poid_max = PointOfInterestDetector()
         # For every group of line elements
         for group_id in self.line_element_sort.group_id_generator(self.structure.phase_id_filter):
             # Initialize the x and the y list of the lines
@@ -161,20 +165,15 @@ class PostProcessor2D:
             y_min = []
             x_max = []
             y_max = []
-            # Point of interest detector class instance for the min and the max values
-            poid_min = PointOfInterestDetector()
-            poid_max = PointOfInterestDetector()
             # Get the tangent vector for the group of line elements
             tangent_vector = self.linear_analysis_results.group_tangent_vector(group_id)
             # Initialize the variable for the previous dof value
             previous_position_vector = None
-            for position_vector, dof_value_list, _ in \
+            for position_vector, min_values, max_values, _, _ in \
                     self.linear_analysis_results.global_dof_enveloping_generator(group_id):
-                # Create new dof value list based on which dofs load combinations are used in the enveloping drawing
-                # TODO read above ^^
                 # Scale the dof value
-                dof_value_min = scale * min(0, *[dof_value[dof] for dof_value in dof_value_list])
-                dof_value_max = scale * max(0, *[dof_value[dof] for dof_value in dof_value_list])
+                dof_value_min = scale * min(0.0, min_values[dof])
+                dof_value_max = scale * max(0.0, max_values[dof])
                 # Add the point of the position vector to the min line
                 if previous_position_vector is None:
                     x_min.append(position_vector[0])
@@ -193,9 +192,9 @@ class PostProcessor2D:
                 y_max.append(line_point[1])
                 # Add the value to the point of interest detector
                 poid_min.add_value(position_vector, position_vector + tangent_vector * dof_value_min,
-                                   dof_value_min / scale)
+                                   dof_value_min / scale, group_id)
                 poid_max.add_value(position_vector, position_vector + tangent_vector * dof_value_max,
-                                   dof_value_max / scale)
+                                   dof_value_max / scale, group_id)
                 # Set the previous position dof position
                 previous_position_vector = copy.deepcopy(position_vector)
             # Draw the last point
@@ -206,13 +205,11 @@ class PostProcessor2D:
             # Draw the line
             self.canvas.draw_line(x_min, y_min, color_min)
             self.canvas.draw_line(x_max, y_max, color_max)
-            # Plot the point of interests
-            poi = poid_min.get_points_of_interest()
-            for _, text_position, value in poi:
-                self.canvas.draw_text(text_position[0], text_position[1], str(round(value, decimal_rounding)))
-            poi = poid_max.get_points_of_interest()
-            for _, text_position, value in poi:
-                self.canvas.draw_text(text_position[0], text_position[1], str(round(value, decimal_rounding)))
+        # Plot the point of interests of all the groups
+        for poid in (poid_min, poid_max):
+            for poi in poid.get_group_points_of_interest().values():
+                for _, text_position, value in poi:
+                    self.canvas.draw_text(text_position[0], text_position[1], str(round(value, decimal_rounding)))
 
     def draw_structure_results(self, load_combination, draw_displacements=False, draw_shear_force=False,
                                draw_normal_force=False, draw_torque=False,
@@ -241,52 +238,105 @@ class PostProcessor2D:
     def min_max_load_combinations_generator(self, dof, coordinates):
         # For each group
         for group_id in self.line_element_sort.group_id_generator(self.structure.phase_id_filter):
-            # For each combined line value
-            for position_vector, dof_value_list, load_combination_list in \
+            # For each station of the envelope
+            for position_vector, min_values, max_values, min_load_combinations, max_load_combinations in \
                     self.linear_analysis_results.global_dof_enveloping_generator(group_id):
                 # Check if their is a coordinate on the given position vector
                 norms = map(lambda x: math_ps.point_is_near_point(position_vector, x), coordinates)
                 if True in norms:
-                    # Determine the dof value list of the correct dof
-                    dof_value_list = [dof_value[dof] for dof_value in dof_value_list]
                     # Yield the min and max value at the position True is min False is max
                     # Yield min
-                    index_min = dof_value_list.index(min(dof_value_list))
-                    yield min(dof_value_list), load_combination_list[index_min], position_vector, True
+                    yield min_values[dof], min_load_combinations[dof], position_vector, True
+                    # Yield max
+                    yield max_values[dof], max_load_combinations[dof], position_vector, False
+
+    def governing_load_combinations_generator(self, dof, coordinates, k=3):
+        # For each group
+        for group_id in self.line_element_sort.group_id_generator(self.structure.phase_id_filter):
+            # For each station with its k governing load combinations
+            for position_vector, top_k_min, top_k_max in \
+                    self.linear_analysis_results.global_dof_governing_generator(group_id, k):
+                # Check if their is a coordinate on the given position vector
+                norms = map(lambda x: math_ps.point_is_near_point(position_vector, x), coordinates)
+                if True in norms:
+                    # Yield the k governing values of the dof, their load combinations and their concurrent dof values
+                    # at the position, True is min False is max
+                    # Yield min
+                    yield top_k_min[0][:, dof], top_k_min[1][:, dof], top_k_min[2][:, dof], position_vector, True
                     # Yield max
-                    index_max = dof_value_list.index(max(dof_value_list))
-                    yield max(dof_value_list), load_combination_list[index_max], position_vector, False
+                    yield top_k_max[0][:, dof], top_k_max[1][:, dof], top_k_max[2][:, dof], position_vector, False
 
 
 class PointOfInterestDetector:
     def __init__(self, error=0.001, slope_error=0.001):
-        self.values = None
         self.error = error
         self.slope_error = slope_error
+        # The positions, the text positions, the values and the group ids of the added values in the order in which
+        # they are added
+        self.positions = []
+        self.text_positions = []
+        self.values = []
+        self.group_ids = []
+
+    def add_value(self, position, text_position, value, group_id=0):
+        # Add a value of a group, the values at a position that the group already has are ignored
+        self.positions.append(position)
+        self.text_positions.append(text_position)
+        self.values.append(value)
+        self.group_ids.append(group_id)
+
+    def add_values(self, positions, text_positions, values, group_id=0):
+        # Add the values of a group at once
+        values = np.asarray(values, dtype=float).ravel()
+        self.positions.extend(np.asarray(positions, dtype=float).reshape(-1, 2))
+        self.text_positions.extend(np.asarray(text_positions, dtype=float).reshape(-1, 2))
+        self.values.extend(values)
+        self.group_ids.extend([group_id] * len(values))
 
-    def add_value(self, position, text_position, value):
-        if self.values is not None:
-            for p, _, v in self.values:
-                if np.linalg.norm(p - position) < self.error:
-                    break
-            else:
-                self.values.append([position, text_position, value])
-        else:
-            self.values = [[position, text_position, value]]
+    def get_points_of_interest(self, group_id=0):
+        # Get the points of interest of a group
+        return self.get_group_points_of_interest().get(group_id, [])
 
-    def get_points_of_interest(self):
-        points_of_interest = []
-        previous_slope = None
-        for i in range(0, len(self.values)):
-            if i == 0 or i == len(self.values) - 1:
-                points_of_interest.append(self.values[i])
-            else:
-                length = np.linalg.norm(self.values[i][0] - self.values[i - 1][0])
-                slope = (self.values[i][2] - self.values[i - 1][2]) / length
-                if previous_slope is not None and (slope > 0.0 > previous_slope or slope < 0.0 < previous_slope)\
-                        and abs(slope - previous_slope) > self.slope_error:
-                    points_of_interest.append(self.values[i - 1])
-                previous_slope = copy.deepcopy(slope)
+    def get_group_points_of_interest(self):
+        # Get the points of interest of every group at once, the first and the last value of a group and the values
+        # where the slope of the values changes sign
+        if len(self.values) == 0:
+            return {}
+        positions = np.array(self.positions, dtype=float).reshape(-1, 2)
+        text_positions = np.array(self.text_positions, dtype=float).reshape(-1, 2)
+        values = np.array(self.values, dtype=float)
+        group_list, group_index = np.unique(np.array(self.group_ids), return_inverse=True)
+        group_list = group_list.tolist()
+        group_index = group_index.reshape(-1)
+        # Keep the first value at every position of a group, the positions are rounded to a grid with a spacing of the
+        # error
+        keys = np.column_stack((group_index, np.round(positions / self.error).astype(np.int64)))
+        _, first_index = np.unique(keys, axis=0, return_index=True)
+        # Sort the kept values by their group and by the order in which they are added
+        kept = np.sort(first_index)
+        kept = kept[np.argsort(group_index[kept], kind='stable')]
+        positions, text_positions, values, group_index = \
+            positions[kept], text_positions[kept], values[kept], group_index[kept]
+        # The first and the last value of every group are points of interest
+        is_group_start = np.concatenate(([True], group_index[1:] != group_index[:-1]))
+        is_point_of_interest = is_group_start | np.concatenate((is_group_start[1:], [True]))
+        # The slopes between the consecutive values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slopes = np.diff(values) / np.linalg.norm(np.diff(positions, axis=0), axis=1)
+        # A value is a point of interest if the slopes before and after it have an opposite sign, the value before the
+        # last value of a group is never checked
+        i = np.arange(1, len(values) - 2)
+        previous_slopes = slopes[i - 1]
+        next_slopes = slopes[i]
+        is_sign_change = (((next_slopes > 0.0) & (previous_slopes < 0.0)) |
+                          ((next_slopes < 0.0) & (previous_slopes > 0.0))) & \
+            (np.abs(next_slopes - previous_slopes) > self.slope_error)
+        is_point_of_interest[i[is_sign_change & (group_index[i - 1] == group_index[i + 2])]] = True
+        # Return the position, the text position and the value of the points of interest of every group
+        points_of_interest = {}
+        for k in np.nonzero(is_point_of_interest)[0]:
+            points_of_interest.setdefault(group_list[group_index[k]], []).append(
+                [positions[k], text_positions[k], values[k]])
         return points_of_interest
 
 
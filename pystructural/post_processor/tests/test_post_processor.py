@@ -0,0 +1,34 @@
+import numpy as np
+
+from pystructural.post_processor.post_processor import PointOfInterestDetector
+
+
+def test_points_of_interest():
+    poid = PointOfInterestDetector()
+    x = np.linspace(0.0, 4.0, 9)
+    positions = np.column_stack((x, np.zeros(9)))
+    # The value at the second position is a copy of the first position and is ignored
+    poid.add_value(positions[0], positions[0], 0.0)
+    poid.add_value(positions[0] + 0.0001, positions[0], 5.0)
+    for position, value in zip(positions[1:], np.sin(x[1:])):
+        poid.add_value(position, position, value)
+    poi = poid.get_points_of_interest()
+
+    # The first value, the max of the sine at x = 1.5 and the last value
+    assert [value for _, _, value in poi] == [0.0, np.sin(1.5), np.sin(4.0)]
+    assert np.allclose(poi[1][0], [1.5, 0.0])
+
+
+def test_group_points_of_interest():
+    poid = PointOfInterestDetector()
+    x = np.linspace(0.0, 4.0, 9)
+    positions = np.column_stack((x, np.zeros(9)))
+    # Add the values of two groups at the same positions at once
+    poid.add_values(positions, positions, np.sin(x), 'a')
+    poid.add_values(positions, positions, -(x - 2.0) ** 2, 'b')
+    group_points_of_interest = poid.get_group_points_of_interest()
+
+    assert set(group_points_of_interest) == {'a', 'b'}
+    assert np.allclose([value for _, _, value in group_points_of_interest['a']], [0.0, np.sin(1.5), np.sin(4.0)])
+    assert np.allclose([value for _, _, value in group_points_of_interest['b']], [-4.0, 0.0, -4.0])
+    assert poid.get_points_of_interest('c') == []
@@ -6,21 +6,27 @@ __all__ = ['PreProcessor2D']
 
 
 class PreProcessor2D(catecs.System):
-    def __init__(self, minimum_node_distance=0.001, minimum_element_distance=0.1):
+    def __init__(self, minimum_node_distance=0.001, minimum_element_distance=0.1, subdivision='uniform',
+                 maximum_element_length=None):
         # Initialize the system
         super().__init__()
         # Initialize the variables of the pre processor
         self.minimum_node_distance = minimum_node_distance
         self.minimum_element_distance = minimum_element_distance
+        # The subdivision of the line elements, the line elements are only split at their nodes if it is None
+        self.subdivision = subdivision
+        self.maximum_element_length = maximum_element_length
 
     def process(self):
         # Run system instance: check overlapping nodes 2d
         self.world.run_system(CheckOverlappingNodes2D(self.minimum_node_distance))
         # Run system instance: split line 2d
         self.world.run_system(SplitLine2D())
-        # Run system instance: add split nodes 2d
-        self.world.run_system(AddSplitNodes2D(self.minimum_element_distance))
-        # Run system instance: split line 2d
-        self.world.run_system(SplitLine2D())
+        if self.subdivision is not None:
+            # Run system instance: add split nodes 2d
+            self.world.run_system(AddSplitNodes2D(self.minimum_element_distance, self.subdivision,
+                                                  self.maximum_element_length))
+            # Run system instance: split line 2d
+            self.world.run_system(SplitLine2D())
         # Run system instance: line element sort 2d
         self.world.run_system(LineElementSort2D())
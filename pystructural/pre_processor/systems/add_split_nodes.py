@@ -2,16 +2,26 @@ import numpy as np
 import catecs
 
 from pystructural.solver.components.geometry import Point2D, Line2D
+from pystructural.solver.components.load import QLoad2D
 
 __all__ = ['AddSplitNodes2D']
 
 
 class AddSplitNodes2D(catecs.System):
-    def __init__(self, minimum_element_distance):
+    def __init__(self, minimum_element_distance, subdivision='uniform', maximum_element_length=None,
+                 load_tolerance=0.001):
         self.minimum_distance = minimum_element_distance
+        # The subdivision strategy: 'uniform' splits every line at the minimum distance, 'adaptive' only splits a
+        # line where its q-loads need it and where it is longer than the maximum element length
+        self.subdivision = subdivision
+        self.maximum_element_length = maximum_element_length
+        # The relative error of the linear interpolation of a q-load between two nodes that is allowed
+        self.load_tolerance = load_tolerance
         super().__init__()
 
     def process(self):
+        # The item count is the amount of added split nodes
+        self.item_count = 0
         # For every line the structure
         for line_id, line in self.world.get_component(Line2D):
             # Get the start and end node of the line
@@ -19,12 +29,71 @@ class AddSplitNodes2D(catecs.System):
             line_end_point = self.world.get_component_from_entity(line.point_id_list[1], Point2D).point_list[0]
             # Get the vector from start to end
             line_vector = line_end_point - line_start_point
-            # The amount of splits
-            splits = int(np.linalg.norm(line_vector) / self.minimum_distance)
+            # Determine the positions of the split nodes on the unit interval of the line
+            if self.subdivision == 'adaptive':
+                units = self.adaptive_units(line_id, line_start_point, line_end_point)
+            else:
+                # The amount of splits
+                splits = int(np.linalg.norm(line_vector) / self.minimum_distance)
+                units = [(i + 1) / float(splits) for i in range(splits - 1)]
             # Add points at the splits
-            for i in range(splits - 1):
-                node_position = line_start_point + (i + 1) * (line_vector / float(splits))
+            for unit in units:
+                self.item_count += 1
+                node_position = line_start_point + unit * line_vector
                 if hasattr(line, 'phase_id_list'):
                     self.world.add_entity(Point2D(*node_position), phase_id_list=line.phase_id_list)
                 else:
                     self.world.add_entity(Point2D(*node_position))
+
+    def adaptive_units(self, line_id, line_start_point, line_end_point):
+        # Get the length of the line and the smallest distance between two split nodes on the unit interval
+        length = np.linalg.norm(line_end_point - line_start_point)
+        minimum_unit = self.minimum_distance / length
+        # Get the q-loads of the line
+        components = self.world.get_all_component_types_from_entity(line_id, QLoad2D)
+        q_loads = components[0] if components is not None else []
+        # Start with the discontinuities of the q-loads
+        units = [0.0, 1.0]
+        if abs(line_end_point[0] - line_start_point[0]) > 0.0:
+            for q_load in q_loads:
+                for x in q_load.discontinuity_list:
+                    unit = (x - line_start_point[0]) / (line_end_point[0] - line_start_point[0])
+                    if minimum_unit <= unit <= 1.0 - minimum_unit:
+                        units.append(unit)
+        units = sorted(set(units))
+
+        # Define the value of a q-load at a position on the unit interval of the line
+        def q_load_value(q_load, unit):
+            return q_load.q_load_func((1.0 - unit) * line_start_point + unit * line_end_point)
+
+        # Bisect an interval while the linear interpolation of a q-load at its middle is not accurate enough
+        def bisect(unit_0, unit_1, q_load, scale):
+            unit_m = 0.5 * (unit_0 + unit_1)
+            if unit_m - unit_0 < minimum_unit:
+                return []
+            error = abs(q_load_value(q_load, unit_m) -
+                        0.5 * (q_load_value(q_load, unit_0) + q_load_value(q_load, unit_1)))
+            if error <= self.load_tolerance * scale:
+                return []
+            return bisect(unit_0, unit_m, q_load, scale) + [unit_m] + bisect(unit_m, unit_1, q_load, scale)
+
+        # Add the split nodes that are needed by the q-loads, evaluated just inside every interval such that the
+        # discontinuities themselves are not measured as an error
+        for q_load in q_loads:
+            samples = np.linspace(0.0, 1.0, 9)
+            scale = max([abs(q_load_value(q_load, unit)) for unit in samples])
+            if scale == 0.0:
+                continue
+            new_units = []
+            for unit_0, unit_1 in zip(units[:-1], units[1:]):
+                new_units += bisect(unit_0 + 1e-9, unit_1 - 1e-9, q_load, scale)
+            units = sorted(set(units + new_units))
+        # Split the intervals that are longer than the maximum element length
+        if self.maximum_element_length is not None:
+            new_units = []
+            for unit_0, unit_1 in zip(units[:-1], units[1:]):
+                splits = int(np.ceil((unit_1 - unit_0) * length / self.maximum_element_length - 1e-9))
+                new_units += [unit_0 + (unit_1 - unit_0) * (i + 1) / float(splits) for i in range(splits - 1)]
+            units = sorted(set(units + new_units))
+        # Return the units of the split nodes without the start and end of the line
+        return units[1:-1]
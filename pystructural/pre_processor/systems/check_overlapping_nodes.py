@@ -3,7 +3,7 @@ import copy
 import catecs
 
 from pystructural.core.math_ps import quotient_set_of_equivalence_relation, point_is_near_point
-from pystructural.solver.components.geometry import Point2D, Line2D
+from pystructural.solver.components.geometry import Point2D, Line2D, NodeSet2D
 
 __all__ = ['CheckOverlappingNodes2D']
 
@@ -21,28 +21,33 @@ class CheckOverlappingNodes2D(catecs.System):
         # Get the quotient set defined by the point equivalence relation
         quotient_set = quotient_set_of_equivalence_relation(self.world.get_component(Point2D),
                                                             point_equivalence_relation)
+        # The item count is the amount of nodes after merging the overlapping nodes
+        self.item_count = len(quotient_set)
 
         # Create a copy node for each equivalence class and copy the components to that node
         for equivalence_class in quotient_set:
-            # Create the copied node
-            equ_point = Point2D(equivalence_class[1].point_list[0][0], equivalence_class[1].point_list[0][1])
-            equ_point_id = self.world.add_entity(equ_point)
             # Add all the phase_id lists to each other
-            equ_point.phase_id_list = []
+            phase_id_list = []
             for point in quotient_set[equivalence_class]:
                 if hasattr(point[1], 'phase_id_list'):
                     for phase_id in point[1].phase_id_list:
-                        if phase_id not in equ_point.phase_id_list:
-                            equ_point.phase_id_list.append(phase_id)
+                        if phase_id not in phase_id_list:
+                            phase_id_list.append(phase_id)
+            # Create the copied node
+            equ_point = Point2D(equivalence_class[1].point_list[0][0], equivalence_class[1].point_list[0][1])
+            equ_point_id = self.world.add_entity(equ_point, phase_id_list=phase_id_list)
+            for point in quotient_set[equivalence_class]:
                 # Copy all the components that are not an instance of the point 2d class
                 for component in self.world.get_all_components_from_entity(point[0]):
                     if not isinstance(component, Point2D):
                         self.world.add_component(equ_point_id, copy.deepcopy(component))
-                # Set all the node id's of the line elements correctly that have a node in this equivalence class
-                for line_id, line in self.world.get_component(Line2D):
-                    for i in range(2):
-                        if point[0] == line.point_id_list[i]:
-                            line.point_id_list[i] = equ_point_id
+                # Set all the node id's of the line elements and the node sets correctly that have a node in this
+                # equivalence class
+                for geometry_class in (Line2D, NodeSet2D):
+                    for geometry_id, geometry in self.world.get_component(geometry_class):
+                        for i in range(len(geometry.point_id_list)):
+                            if point[0] == geometry.point_id_list[i]:
+                                geometry.point_id_list[i] = equ_point_id
             # Delete all the other nodes
             for point in quotient_set[equivalence_class]:
                 self.world.delete_entity(point[0], True)
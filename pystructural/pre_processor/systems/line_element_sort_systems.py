@@ -16,10 +16,15 @@ class LineElementSort2D(catecs.System):
         super().__init__()
 
     def initialize(self):
+        # Replace the line element sort component of a previous run
+        if self.world.has_component(self.world.general_entity_id, LineElementSortComponent):
+            self.world.remove_component_type(self.world.general_entity_id, LineElementSortComponent)
         self.line_element_sort_component = self.world.add_component(self.world.general_entity_id,
                                                                     LineElementSortComponent())
 
     def process(self):
+        # The item count is the amount of sorted groups
+        self.item_count = len(self.world.group_component.groups)
         for group_id in self.world.group_component.groups:
             # Initialize the group in the line element sort component
             self.line_element_sort_component.groups[group_id] = []
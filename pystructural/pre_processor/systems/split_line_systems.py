@@ -1,4 +1,6 @@
 import catecs
+import numpy as np
+import scipy.spatial
 
 from pystructural.core.math_ps import point_is_near_point, point_is_on_line
 from pystructural.solver.components.geometry import Point2D, Line2D
@@ -7,22 +9,70 @@ __all__ = ['SplitLine2D']
 
 
 class SplitLine2D(catecs.System):
+    def __init__(self, error=0.001):
+        # The error of the near point and the on line tests
+        self.error = error
+        # The coordinates of the points and the index of every point id in the coordinates
+        self.coordinates = None
+        self.point_index = None
+        super().__init__()
+
+    def points_near_line(self, point_ids, line_start, line_end):
+        # A point can only be near a node of a line or on a line if it is within half the length of the line plus the
+        # error from the midpoint of the line
+        coordinates = self.coordinates[[self.point_index[point_id] for point_id in point_ids]].reshape(-1, 2)
+        radius = np.linalg.norm(line_end - line_start) / 2.0 + self.error
+        is_near = np.linalg.norm(coordinates - (line_start + line_end) / 2.0, axis=1) <= radius
+        return [point_id for point_id, near in zip(point_ids, is_near) if near]
+
+    def candidate_lines(self, point_ids):
+        # Get the candidate lines of every point, sorted by their entity id, and the candidate points of every line. The
+        # candidate points are found with a k-d tree of the points
+        candidates = {point_id: [] for point_id in point_ids}
+        line_points = {}
+        lines = sorted(self.world.get_component(Line2D), key=lambda line: line[0])
+        if not lines or not point_ids:
+            return candidates, line_points
+        line_start_points = np.array([self.world.get_component_from_entity(line.point_id_list[0], Point2D).point_list[0]
+                                      for line_id, line in lines], dtype=float)
+        line_end_points = np.array([self.world.get_component_from_entity(line.point_id_list[1], Point2D).point_list[0]
+                                    for line_id, line in lines], dtype=float)
+        radii = np.linalg.norm(line_end_points - line_start_points, axis=1) / 2.0 + self.error
+        point_tree = scipy.spatial.cKDTree(self.coordinates)
+        for (line_id, line), indices in zip(lines, point_tree.query_ball_point(
+                (line_start_points + line_end_points) / 2.0, radii)):
+            line_points[line_id] = [point_ids[i] for i in sorted(indices)]
+            for point_id in line_points[line_id]:
+                candidates[point_id].append(line_id)
+        return candidates, line_points
+
     def process(self):
+        # The item count is the amount of split lines
+        self.item_count = 0
+        # Get the candidate lines of every point
+        point_components = list(self.world.get_component(Point2D))
+        point_ids = [point_id for point_id, point in point_components]
+        self.coordinates = np.array([point.point_list[0] for point_id, point in point_components],
+                                    dtype=float).reshape(-1, 2)
+        self.point_index = {point_id: i for i, point_id in enumerate(point_ids)}
+        candidates, line_points = self.candidate_lines(point_ids)
         # Split a line if a point intersects it and is not currently a start of end node of a line
-        # For every point for every line
-        for point_id, point in self.world.get_component(Point2D):
-            for line_id, line in self.world.get_component(Line2D):
+        # For every point for every candidate line
+        for point_id, point in point_components:
+            for line_id in candidates[point_id]:
+                line = self.world.get_component_from_entity(line_id, Line2D)
                 # Get the start and end node of the line
                 line_start_point = self.world.get_component_from_entity(line.point_id_list[0], Point2D)
                 line_end_point = self.world.get_component_from_entity(line.point_id_list[1], Point2D)
 
                 # If the point is near a node of the line then break
-                if point_is_near_point(point.point_list[0], line_start_point.point_list[0]) or \
-                        point_is_near_point(point.point_list[0], line_end_point.point_list[0]):
+                if point_is_near_point(point.point_list[0], line_start_point.point_list[0], self.error) or \
+                        point_is_near_point(point.point_list[0], line_end_point.point_list[0], self.error):
                     break
 
                 # Check if the point is on the line
-                if point_is_on_line(point.point_list[0], line_start_point.point_list[0], line_end_point.point_list[0]):
+                if point_is_on_line(point.point_list[0], line_start_point.point_list[0], line_end_point.point_list[0],
+                                    self.error):
                     # Create two new lines that exist on top of the existing line
                     line_1_id = self.world.copy_entity(line_id)
                     line_2_id = self.world.copy_entity(line_id)
@@ -31,10 +81,7 @@ class SplitLine2D(catecs.System):
                     self.world.get_component_from_entity(line_2_id, Line2D).point_id_list[0] = point_id
                     # Add the phase id's of the line to the point
                     if hasattr(line, 'phase_id_list'):
-                        if not hasattr(point, 'phase_id_list'):
-                            point.phase_id_list = []
-                        for phase_id in line.phase_id_list:
-                            point.phase_id_list.append(phase_id)
+                        self.world.add_phase_ids(point_id, point, line.phase_id_list)
                     # Add the two lines to the group of the group of the original frame element entity
                     group_id = self.world.group_component.get_group_id_from_entity(line_id)
                     self.world.group_component.add_entity_to_group(line_1_id, group_id)
@@ -43,5 +90,18 @@ class SplitLine2D(catecs.System):
                     self.world.group_component.remove_entity(line_id)
                     # Delete the line from the structure
                     self.world.delete_entity(line_id, True)
+                    self.item_count += 1
+                    # The two new lines lie within the original line, so their candidate points are the candidate
+                    # points of the original line that are near them
+                    candidate_point_ids = line_points.pop(line_id)
+                    for candidate_point_id in candidate_point_ids:
+                        candidates[candidate_point_id].remove(line_id)
+                    for new_line_id, new_line_start, new_line_end in [
+                            (line_1_id, line_start_point.point_list[0], point.point_list[0]),
+                            (line_2_id, point.point_list[0], line_end_point.point_list[0])]:
+                        line_points[new_line_id] = self.points_near_line(candidate_point_ids, new_line_start,
+                                                                         new_line_end)
+                        for candidate_point_id in line_points[new_line_id]:
+                            candidates[candidate_point_id].append(new_line_id)
                     # Break the for loop
                     break
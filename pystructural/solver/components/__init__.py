@@ -3,6 +3,7 @@ from .connection import *
 from .degree_of_freedom import *
 from .support import *
 
+from .load_distribution import *
 from .load import *
 from .load_combination import *
 
@@ -1,7 +1,8 @@
 __all__ = ['GroupComponent', 'DOFCalculationComponent',
            'LinearCalculationComponent',
            'ReducedLoadVectorsComponent',
-           'DisplacementAndLoadVectorsComponent']
+           'DisplacementAndLoadVectorsComponent',
+           'ChainCondensationComponent']
 
 
 class GroupComponent:
@@ -20,6 +21,16 @@ class GroupComponent:
         self.current_group_id += 1
         return self.current_group_id - 1
 
+    def create_groups(self, entity_ids, phase_id_list):
+        # Create a group for every entity at once
+        group_ids = range(self.current_group_id, self.current_group_id + len(entity_ids))
+        for group_id, entity_id in zip(group_ids, entity_ids):
+            self.groups[group_id] = [entity_id]
+            self.groups_phase_id_list[group_id] = phase_id_list
+            self.entities[entity_id] = group_id
+        self.current_group_id += len(entity_ids)
+        return list(group_ids)
+
     def add_entity_to_group(self, entity_id, group_id):
         # If the group id is created
         if group_id in self.groups:
@@ -58,6 +69,18 @@ class LinearCalculationComponent:
         # stiffness matrices
         self.global_stiffness_matrix = None
         self.reduced_global_stiffness_matrix = None
+        # The cached factorization of the reduced global stiffness matrix, None if it needs to be factorized
+        self.factorization = None
+        # The low rank update of the factorized matrix to the reduced global stiffness matrix, a list: [reduced dof ids,
+        # update matrix of the dofs, solution of the factorized matrix for the unit vectors of the dofs, factorization
+        # of the capacitance matrix], None if the factorization is of the reduced global stiffness matrix itself
+        self.low_rank_update = None
+        # The spring values that are in the global stiffness matrix: spring_values[entity_id][global_id] = value
+        self.spring_values = {}
+        # The element stiffness matrices that are in the global stiffness matrix, such that the global stiffness matrix
+        # of another phase can be determined from the changed elements: element_stiffness_matrices[entity_id] =
+        # [element, stiffness matrix]
+        self.element_stiffness_matrices = {}
         # Dof calculation component
         self.dof_calculation_component = None
 
@@ -66,6 +89,8 @@ class ReducedLoadVectorsComponent:
     def __init__(self):
         # The reduced load vector
         self.reduced_load_vectors = {}
+        # The (reduced dofs x load cases) matrix with the reduced load vector of every load case
+        self.reduced_load_case_vectors = None
 
 
 class DisplacementAndLoadVectorsComponent:
@@ -75,3 +100,15 @@ class DisplacementAndLoadVectorsComponent:
         # The displacement and load vectors
         self.displacement_vectors = {}
         self.load_vectors = {}
+
+
+class ChainCondensationComponent:
+    def __init__(self):
+        # The reduced dof ids that are kept in the condensed stiffness matrix
+        self.retained_dof_list = None
+        # Every chain is a list: [interior reduced dof ids, end reduced dof ids, end retained dof ids,
+        # factorization of the interior stiffness matrix, stiffness matrix from the interior to the end dofs]
+        self.chains = []
+        # The condensed stiffness matrix of the retained dofs and its cached factorization
+        self.condensed_stiffness_matrix = None
+        self.factorization = None
@@ -13,6 +13,7 @@ __all__ = ['Connection',
 class Connection:
     """The basic connection class which each geometry needs to inherit.
     """
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -28,6 +29,7 @@ class Spring(Connection, DOF):
     :param rotation_spring_y: Rotational spring value for the y axis, dof id: 4.
     :param rotation_spring_z: Rotational spring value for the z axis, dof id: 5.
     """
+    __slots__ = ('spring_x', 'spring_y', 'spring_z', 'rotation_spring_x', 'rotation_spring_y', 'rotation_spring_z')
 
     def __init__(self, spring_x=None, spring_y=None, spring_z=None,
                  rotation_spring_x=None, rotation_spring_y=None, rotation_spring_z=None):
@@ -18,6 +18,8 @@ class DOF:
     :param rotation_y: DOF for the rotation around the y axis, dof id: 4.
     :param rotation_z: DOF for the rotation around the z axis, dof id: 5.
     """
+    __slots__ = ('displacement_x', 'displacement_y', 'displacement_z', 'rotation_x', 'rotation_y', 'rotation_z',
+                 'dof_id_list', 'entity_id', 'phase_id_list')
 
     def __init__(self, displacement_x=False, displacement_y=False, displacement_z=False,
                  rotation_x=False, rotation_y=False, rotation_z=False):
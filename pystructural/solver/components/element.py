@@ -1,16 +1,18 @@
 import numpy as np
 
-from pystructural.solver.components.geometry import Line2D, Triangle2D
+from pystructural.solver.components.geometry import Line2D, Triangle2D, NodeSet2D
 from pystructural.solver.components.degree_of_freedom import DOF
 from pystructural.solver.components.material import LinearElasticity2DMaterial
 from pystructural.solver.components.element_geometry import BeamElementGeometry
 
 __all__ = ['Element',
-           'FrameElement2D', 'LinearTriangleElement2D',
-           'line_elements', 'triangle_elements']
+           'FrameElement2D', 'LinearTriangleElement2D', 'SuperElement2D',
+           'line_elements', 'triangle_elements', 'frame_local_stiffness_matrix', 'rotation_matrix_2d']
 
 
 class Element:
+    __slots__ = ('geometry', 'material', 'element_geometry', 'strain_matrix', 'stiffness_matrix', 'mass_matrix',
+                 'nodal_force_vector', 'DOF', 'entity_id', 'phase_id_list')
     compatible_geometry = None
     compatible_materials = None
     compatible_element_geometries = None
@@ -69,6 +71,7 @@ class Element:
 
 
 class FrameElement2D(Element):
+    __slots__ = ('ea', 'ei', 'local_stiffness_matrix', 'global_to_local_matrix')
     compatible_geometry = Line2D
     compatible_materials = [LinearElasticity2DMaterial]
     compatible_element_geometries = [BeamElementGeometry]
@@ -107,32 +110,7 @@ class FrameElement2D(Element):
 
         :return: (Numpy Array) the local stiffness matrix.
         """
-        self.local_stiffness_matrix = np.zeros((6, 6))
-        self.local_stiffness_matrix[0, 0] = 1.0 * (self.ea / self.geometry.length)
-        self.local_stiffness_matrix[0, 3] = -1.0 * (self.ea / self.geometry.length)
-        self.local_stiffness_matrix[3, 0] = -1.0 * (self.ea / self.geometry.length)
-        self.local_stiffness_matrix[3, 3] = 1.0 * (self.ea / self.geometry.length)
-        # If node 1 is fixed and node 2 is fixed:
-        # First quadrant
-        self.local_stiffness_matrix[1, 1] = 12.0 * (self.ei / (self.geometry.length ** 3))
-        self.local_stiffness_matrix[2, 1] = -6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[1, 2] = -6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[2, 2] = 4.0 * (self.ei / self.geometry.length)
-        # Second quadrant
-        self.local_stiffness_matrix[4, 1] = -12.0 * (self.ei / (self.geometry.length ** 3))
-        self.local_stiffness_matrix[5, 1] = -6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[4, 2] = 6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[5, 2] = 2.0 * (self.ei / self.geometry.length)
-        # Third quadrant
-        self.local_stiffness_matrix[1, 4] = -12.0 * (self.ei / (self.geometry.length ** 3))
-        self.local_stiffness_matrix[2, 4] = 6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[1, 5] = -6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[2, 5] = 2.0 * (self.ei / self.geometry.length)
-        # Fourth quadrant
-        self.local_stiffness_matrix[4, 4] = 12.0 * (self.ei / (self.geometry.length ** 3))
-        self.local_stiffness_matrix[5, 4] = 6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[4, 5] = 6.0 * (self.ei / (self.geometry.length ** 2))
-        self.local_stiffness_matrix[5, 5] = 4.0 * (self.ei / self.geometry.length)
+        self.local_stiffness_matrix = frame_local_stiffness_matrix(self.ea, self.ei, self.geometry.length)
 
     def rotate_by_local_to_global_matrix(self, input_matrix, clockwise=True):
         """Rotate the input vector or matrix by the local to global matrix.
@@ -155,6 +133,16 @@ class FrameElement2D(Element):
         """
         self.stiffness_matrix = self.rotate_by_local_to_global_matrix(self.local_stiffness_matrix)
 
+    def compute_stiffness_matrix_derivatives(self):
+        """Calculate the derivatives of the global stiffness matrix to the ea and to the ei, the stiffness matrix is
+        linear in both.
+
+        :return: (List) the derivative to the ea and the derivative to the ei.
+        """
+        # The element properties are not changed, such that the element can be shared by threads
+        return [self.rotate_by_local_to_global_matrix(frame_local_stiffness_matrix(ea, ei, self.geometry.length))
+                for ea, ei in ((1.0, 0.0), (0.0, 1.0))]
+
     def compute_mass_matrix(self):
         pass
 
@@ -163,6 +151,7 @@ class FrameElement2D(Element):
 
 
 class LinearTriangleElement2D(Element):
+    __slots__ = ()
     compatible_geometry = Triangle2D
     compatible_materials = []
     compatible_element_geometries = []
@@ -201,5 +190,98 @@ class LinearTriangleElement2D(Element):
         pass
 
 
+class SuperElement2D(Element):
+    """A super element is the condensed stiffness of a substructure at its boundary nodes. The condensed stiffness
+    matrix is shared by every instance of the substructure, an instance only rotates it to its own orientation.
+
+    :param substructure: The condensed substructure instance.
+    :param rotation: The counterclockwise rotation of the instance in radians.
+    :param translation: The translation of the instance.
+    """
+    __slots__ = ('substructure', 'rotation', 'translation', 'rotation_matrix')
+    compatible_geometry = NodeSet2D
+    compatible_materials = []
+    compatible_element_geometries = []
+
+    def __init__(self, substructure, rotation=0.0, translation=(0.0, 0.0)):
+        super().__init__()
+        self.substructure = substructure
+        self.rotation = rotation
+        self.translation = np.array(translation, dtype=float)
+        # The matrix that rotates the local dofs of the substructure to the global dofs of the instance
+        self.rotation_matrix = np.kron(np.eye(len(substructure.boundary_coordinates)), rotation_matrix_2d(rotation))
+        # DOF
+        self.DOF = DOF(displacement_x=True, displacement_y=True, rotation_z=True)
+
+    @property
+    def element_dimension(self):
+        return 3 * len(self.substructure.boundary_coordinates)
+
+    def get_stiffness_coordinate_to_node_and_dof_variable(self, x):
+        return self.geometry.point_id_list[x // 3], self.DOF.dof_id_list[x % 3]
+
+    def get_node_and_dof_variable_to_stiffness_coordinate(self, node_id, dof_id):
+        return 3 * self.geometry.point_id_list.index(node_id) + {0: 0, 1: 1, 5: 2}[dof_id]
+
+    def compute_stiffness_matrix(self):
+        """Calculate the global stiffness matrix, an instance without rotation shares the condensed stiffness matrix
+        of the substructure.
+        """
+        if self.rotation == 0.0:
+            self.stiffness_matrix = self.substructure.condensed_stiffness_matrix
+        else:
+            self.stiffness_matrix = np.matmul(np.matmul(self.rotation_matrix,
+                                                        self.substructure.condensed_stiffness_matrix),
+                                              self.rotation_matrix.T)
+
+
+def frame_local_stiffness_matrix(ea, ei, length):
+    """Get the local stiffness matrix of a frame element that is fixed at both nodes.
+
+    :param ea: The axial stiffness of the element.
+    :param ei: The bending stiffness of the element.
+    :param length: The length of the element.
+    :return: A (6, 6) NumPy array.
+    """
+    local_stiffness_matrix = np.zeros((6, 6))
+    local_stiffness_matrix[0, 0] = 1.0 * (ea / length)
+    local_stiffness_matrix[0, 3] = -1.0 * (ea / length)
+    local_stiffness_matrix[3, 0] = -1.0 * (ea / length)
+    local_stiffness_matrix[3, 3] = 1.0 * (ea / length)
+    # If node 1 is fixed and node 2 is fixed:
+    # First quadrant
+    local_stiffness_matrix[1, 1] = 12.0 * (ei / (length ** 3))
+    local_stiffness_matrix[2, 1] = -6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[1, 2] = -6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[2, 2] = 4.0 * (ei / length)
+    # Second quadrant
+    local_stiffness_matrix[4, 1] = -12.0 * (ei / (length ** 3))
+    local_stiffness_matrix[5, 1] = -6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[4, 2] = 6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[5, 2] = 2.0 * (ei / length)
+    # Third quadrant
+    local_stiffness_matrix[1, 4] = -12.0 * (ei / (length ** 3))
+    local_stiffness_matrix[2, 4] = 6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[1, 5] = -6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[2, 5] = 2.0 * (ei / length)
+    # Fourth quadrant
+    local_stiffness_matrix[4, 4] = 12.0 * (ei / (length ** 3))
+    local_stiffness_matrix[5, 4] = 6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[4, 5] = 6.0 * (ei / (length ** 2))
+    local_stiffness_matrix[5, 5] = 4.0 * (ei / length)
+    return local_stiffness_matrix
+
+
+def rotation_matrix_2d(rotation):
+    """Get the matrix that rotates the displacement x, displacement y and rotation z dofs of a node counterclockwise.
+
+    :param rotation: The counterclockwise rotation in radians.
+    :return: A (3, 3) NumPy array.
+    """
+    c = np.cos(rotation)
+    s = np.sin(rotation)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
 line_elements = [FrameElement2D]
 triangle_elements = [LinearTriangleElement2D]
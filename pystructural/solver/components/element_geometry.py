@@ -11,6 +11,7 @@ __all__ = ['ElementGeometry',
 class ElementGeometry:
     """The basic element geometry class which each element geometry needs to inherit.
     """
+    __slots__ = ('entity_id', 'phase_id_list')
 
     def __init__(self):
         pass
@@ -22,6 +23,7 @@ class BeamElementGeometry(ElementGeometry):
     :param cross_section_area: The cross section area of the element geometry.
     :param moment_of_inertia: The moment of inertia of the element geometry.
     """
+    __slots__ = ('cross_section_area', 'moment_of_inertia')
 
     def __init__(self, cross_section_area, moment_of_inertia):
         self.cross_section_area = cross_section_area
@@ -7,7 +7,7 @@ Implements the various geometries.
 import numpy as np
 
 __all__ = ['Geometry',
-           'Point2D', 'Line2D', 'Triangle2D']
+           'Point2D', 'Line2D', 'Triangle2D', 'NodeSet2D']
 
 
 class Geometry:
@@ -17,6 +17,7 @@ class Geometry:
     :param point_id_list: A list of the id's of each point used in the geometry.
     :param point_list: A list of the coordinates of each point used in the geometry.
     """
+    __slots__ = ('point_id_list', 'point_list', 'entity_id', 'phase_id_list')
 
     def __init__(self, point_id_list, point_list):
         self.point_id_list = point_id_list
@@ -29,14 +30,29 @@ class Geometry:
 
 
 class Point2D(Geometry):
-    """The point 2D geometry class which inherits from the geometry class.
+    """The point 2D geometry class which inherits from the geometry class. The coordinate is stored as two scalars,
+    the point list is created from them when it is requested.
 
     :param x: The x coordinate of the point.
     :param y: The y coordinate of the point.
     """
+    __slots__ = ('x', 'y')
 
     def __init__(self, x, y):
-        super().__init__(None, np.array([[x, y]]))
+        self.x = float(x)
+        self.y = float(y)
+        self.point_id_list = None
+
+    @property
+    def point_list(self):
+        """The point list of the point as a (1, 2) NumPy array.
+        """
+        return np.array([[self.x, self.y]])
+
+    @point_list.setter
+    def point_list(self, point_list):
+        self.x = float(point_list[0][0])
+        self.y = float(point_list[0][1])
 
 
 class Line2D(Geometry):
@@ -45,6 +61,7 @@ class Line2D(Geometry):
     :param point_id_1: The id of the start point of the line.
     :param point_id_2: The id of the end point of the line.
     """
+    __slots__ = ('length', 'angle', 'global_to_local_matrix')
 
     def __init__(self, point_id_1, point_id_2):
         self.length = None
@@ -90,6 +107,7 @@ class Triangle2D(Geometry):
     :param point_id_2: The id of the second point of the triangle.
     :param point_id_3: The id of the third point of the triangle.
     """
+    __slots__ = ('area',)
 
     def __init__(self, point_id_1, point_id_2, point_id_3):
         self.area = None
@@ -100,3 +118,15 @@ class Triangle2D(Geometry):
         """
         self.area = abs(0.5 * np.linalg.det(np.array([self.point_list[1] - self.point_list[0],
                                                       self.point_list[2] - self.point_list[0]])))
+
+
+class NodeSet2D(Geometry):
+    """The node set 2D geometry class which inherits from the geometry class. A node set is an ordered set of points
+    without any further shape, it is the geometry of a super element.
+
+    :param point_id_list: A list of the id's of each point in the node set.
+    """
+    __slots__ = ()
+
+    def __init__(self, point_id_list):
+        super().__init__(list(point_id_list), None)
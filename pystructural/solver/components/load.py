@@ -1,14 +1,18 @@
+import copy
+
 import numpy as np
 
 from pystructural.solver.components.degree_of_freedom import DOF
-from pystructural.solver.components.geometry import Point2D, Line2D
+from pystructural.solver.components.geometry import Point2D, Line2D, NodeSet2D
+from pystructural.solver.components.load_distribution import LoadDistribution, FunctionDistribution
 
 __all__ = ['Load', 'ImposedLoad',
            'PointLoad2D', 'QLoad2D',
-           'ImposedLoad2D']
+           'ImposedLoad2D', 'SuperElementLoad2D']
 
 
 class Load:
+    __slots__ = ('geometry', 'load_case_id', 'entity_id', 'phase_id_list')
     compatible_geometry = None
 
     def __init__(self, load_case_id):
@@ -25,11 +29,14 @@ class Load:
 
 
 class ImposedLoad(Load):
+    __slots__ = ()
+
     def __init__(self, load_case_id):
         super().__init__(load_case_id)
 
 
 class PointLoad2D(Load):
+    __slots__ = ('point_load', 'DOF')
     compatible_geometry = Point2D
 
     def __init__(self, point_load, load_case_id=None):
@@ -63,43 +70,64 @@ class PointLoad2D(Load):
 # TODO change the class such that it is possible to choose for a global or local q_load
 # and add a general direction vector
 class QLoad2D(Load):
+    __slots__ = ('q_load_func', 'discontinuity_list', 'DOF', 'nodal_loads')
     compatible_geometry = Line2D
 
-    def __init__(self, q_load_func, load_case_id=None):
-        # Initialize the q-load function
+    def __init__(self, q_load_func, load_case_id=None, discontinuity_list=None, quadrature_order=None):
+        # Initialize the load distribution, a function is evaluated on the slow path of the function distribution
+        if isinstance(q_load_func, LoadDistribution):
+            # A load distribution has its own discontinuities and is integrated exactly
+            if discontinuity_list is not None or quadrature_order is not None:
+                raise ValueError('The discontinuity list and the quadrature order can only be given for a function, '
+                                 'not for a load distribution.')
+        else:
+            q_load_func = FunctionDistribution(q_load_func, discontinuity_list,
+                                               3 if quadrature_order is None else quadrature_order)
         self.q_load_func = q_load_func
+        # The global x coordinates where the q-load is discontinuous
+        self.discontinuity_list = list(q_load_func.discontinuity_list)
         # DOF
         self.DOF = DOF(displacement_y=True, rotation_z=True)
+        # The consistent nodal loads, they are determined for all the q-loads at once when the loads are updated
+        self.nodal_loads = None
         # Initialize the init of the super class
         super().__init__(load_case_id)
 
     def __add__(self, other):
-        self.q_load_func = lambda x: self.q_load_func(x) + other.q_load_func(x)
+        self.q_load_func = self.q_load_func + other.q_load_func
+        self.discontinuity_list = list(self.q_load_func.discontinuity_list)
+        self.nodal_loads = None
         return self
 
+    def __deepcopy__(self, memo):
+        # The load distribution is never changed in place, the copies of a split line share it such that the nodal
+        # loads of all the parts of the line are determined at once
+        memo[id(self.q_load_func)] = self.q_load_func
+        q_load = QLoad2D.__new__(QLoad2D)
+        for name in Load.__slots__ + QLoad2D.__slots__:
+            if hasattr(self, name):
+                setattr(q_load, name, copy.deepcopy(getattr(self, name), memo))
+        return q_load
+
     def get_dof(self):
         return self.DOF
 
     def load_dof_generator(self):
-        q_1 = self.q_load_func(self.geometry.point_list[0])
-        q_2 = self.q_load_func(self.geometry.point_list[1])
+        # Get the consistent nodal loads of the load distribution
+        loads = self.nodal_loads
+        if loads is None:
+            loads = self.q_load_func.consistent_loads(self.geometry.point_list[0], self.geometry.point_list[1],
+                                                      self.geometry.length)[0]
         for i in range(2):
             for dof in self.get_dof().dof_id_list:
-                if i == 0:
-                    if dof == 1:
-                        yield [self.geometry.point_id_list[i], dof], (7 * q_1 + 3 * q_2) * self.geometry.length / 20.0
-                    elif dof == 5:
-                        yield [self.geometry.point_id_list[i], dof],\
-                              -1 * (3 * q_1 + 2 * q_2) * self.geometry.length ** 2 / 60.0
-                else:
-                    if dof == 1:
-                        yield [self.geometry.point_id_list[i], dof], (3 * q_1 + 7 * q_2) * self.geometry.length / 20.0
-                    elif dof == 5:
-                        yield [self.geometry.point_id_list[i], dof],\
-                              (2 * q_1 + 3 * q_2) * self.geometry.length ** 2 / 60.0
+                if dof == 1:
+                    yield [self.geometry.point_id_list[i], dof], loads[2 * i]
+                elif dof == 5:
+                    yield [self.geometry.point_id_list[i], dof], loads[2 * i + 1]
 
 
 class ImposedLoad2D(ImposedLoad):
+    __slots__ = ('imposed_load', 'DOF')
     compatible_geometry = Line2D
 
     def __init__(self, imposed_load, load_case_id=None):
@@ -128,3 +156,24 @@ class ImposedLoad2D(ImposedLoad):
                     yield [self.geometry.point_id_list[i], dof], local_force_vector[{0: 0, 1: 1, 5: 2}[dof]]
                 else:
                     yield [self.geometry.point_id_list[i], dof], local_force_vector[{0: 3, 1: 4, 5: 5}[dof]]
+
+
+class SuperElementLoad2D(Load):
+    __slots__ = ('load_vector', 'DOF')
+    compatible_geometry = NodeSet2D
+
+    def __init__(self, load_vector, load_case_id=None):
+        # The condensed load vector of the substructure at the boundary nodes of the super element
+        self.load_vector = np.array(load_vector, dtype=float)
+        # DOF
+        self.DOF = DOF(displacement_x=True, displacement_y=True, rotation_z=True)
+        # Initialize the init of the super class
+        super().__init__(load_case_id)
+
+    def get_dof(self):
+        return self.DOF
+
+    def load_dof_generator(self):
+        dof_id_list = self.get_dof().dof_id_list
+        for i in range(len(self.load_vector)):
+            yield [self.geometry.point_id_list[i // 3], dof_id_list[i % 3]], self.load_vector[i]
@@ -1,7 +1,11 @@
+import hashlib
 import itertools
 
+import numpy as np
+import scipy.sparse
 
-__all__ = ['LoadCombinationsComponent']
+
+__all__ = ['LoadCombinationsComponent', 'load_combination_key', 'load_combination_chunks']
 
 
 class LoadCombinationsComponent:
@@ -15,11 +19,18 @@ class LoadCombinationsComponent:
         self.current_load_combination_id = 0
         self.load_combination_names = {}
         self.load_combination_names_inverse = {}
+        # The load combination id of every canonical load combination key, to find copies of load combinations
+        self.load_combination_keys = {}
+        # The sparse (load combinations x load cases) factor matrix in the csr and the csc format, they are built from
+        # the load combinations when they are needed and reset when a load case or a load combination is added
+        self.factor_matrix_csr = None
+        self.factor_matrix_csc = None
 
     def _add_new_load_case(self, load_case_name):
         self.load_cases[self.current_load_case_id] = load_case_name
         self.load_case_names[load_case_name] = self.current_load_case_id
         self.current_load_case_id += 1
+        self.reset_factor_matrix()
         return self.current_load_case_id - 1
 
     def add_generic_load_combination(self):
@@ -40,50 +51,125 @@ class LoadCombinationsComponent:
                 load_cases_dict[self.load_case_names[k]] = v
             load_cases = load_cases_dict
         # If the load case already exists as a load combination then don't add it
-        if check_copy:
-            for load_combination_name in self.load_combinations:
-                if load_cases == self.load_combinations[load_combination_name]:
-                    return load_combination_name
+        key = load_combination_key(load_cases)
+        if check_copy and key in self.load_combination_keys:
+            return self.load_combination_keys[key]
+        self.load_combination_keys.setdefault(key, self.current_load_combination_id)
         # Load cases is a dict of {load_case_name: factor}
         self.load_combinations[self.current_load_combination_id] = load_cases
         self.load_combination_names[load_combination_name] = self.current_load_combination_id
         self.load_combination_names_inverse[self.current_load_combination_id] = load_combination_name
         self.current_load_combination_id += 1
+        self.reset_factor_matrix()
         return self.current_load_combination_id - 1
 
+    def reset_factor_matrix(self):
+        # The factor matrix is built again from the load combinations when it is needed
+        self.factor_matrix_csr = None
+        self.factor_matrix_csc = None
+
+    @property
+    def factor_matrix(self):
+        # The factor matrix in the csr format: the row of a load combination id has the factors of its load cases
+        if self.factor_matrix_csr is None:
+            rows = []
+            columns = []
+            factors = []
+            for load_combination_id, load_cases in self.load_combinations.items():
+                for load_case_id, factor in load_cases.items():
+                    rows.append(load_combination_id)
+                    columns.append(load_case_id)
+                    factors.append(factor)
+            shape = (self.current_load_combination_id, max([self.current_load_case_id] + [i + 1 for i in columns]))
+            self.factor_matrix_csr = scipy.sparse.csr_matrix((np.array(factors, dtype=float),
+                                                              (np.array(rows, dtype=int),
+                                                               np.array(columns, dtype=int))), shape=shape)
+        return self.factor_matrix_csr
+
+    @property
+    def load_case_index(self):
+        # The factor matrix in the csc format: the column of a load case id has the load combinations it is in
+        if self.factor_matrix_csc is None:
+            self.factor_matrix_csc = self.factor_matrix.tocsc()
+            self.factor_matrix_csc.sort_indices()
+        return self.factor_matrix_csc
+
+    def load_combination_factors(self, load_combination_ids):
+        # Return the (load combinations x load cases) factor matrix of a list of load combination ids
+        return self.factor_matrix[np.asarray(load_combination_ids, dtype=int)]
+
+    def load_case_factors(self, load_combination_id):
+        # Return a dict with the factor of every load case of a load combination from the row of the factor matrix
+        factor_matrix = self.factor_matrix
+        start, end = factor_matrix.indptr[load_combination_id], factor_matrix.indptr[load_combination_id + 1]
+        return dict(zip(factor_matrix.indices[start:end].tolist(), factor_matrix.data[start:end].tolist()))
+
     def load_case_generator(self, load_case_id):
-        for load_combination_id in self.load_combinations:
-            if load_case_id in self.load_combinations[load_combination_id]:
-                yield load_combination_id, self.load_combinations[load_combination_id][load_case_id]
+        # Yield the load combination id and the factor of every load combination of a load case from the column of the
+        # factor matrix
+        load_case_index = self.load_case_index
+        if load_case_id >= load_case_index.shape[1]:
+            return
+        start, end = load_case_index.indptr[load_case_id], load_case_index.indptr[load_case_id + 1]
+        for load_combination_id, factor in zip(load_case_index.indices[start:end].tolist(),
+                                               load_case_index.data[start:end].tolist()):
+            yield load_combination_id, factor
+
+    def remove_load_combinations(self):
+        # Remove all the load combinations, the load cases are kept. The load combination ids start at zero again, such
+        # that the factor matrix only has the rows of the load combinations that replace them
+        self.load_combinations = {}
+        self.current_load_combination_id = 0
+        self.load_combination_names = {}
+        self.load_combination_names_inverse = {}
+        self.load_combination_keys = {}
+        self.reset_factor_matrix()
 
     def load_combination_creator(self, load_combination_name,
                                  permanent_load_cases=None, switch_load_cases=None, switch_list_load_cases=None,
                                  check_copy=False):
-        # If there is are permanent load cases
-        if permanent_load_cases is None:
-            permanent_load_cases = {}
-        # If there are a switch load cases
-        if switch_load_cases:
-            switch_load_cases = powerset([list(load_case.items())[0] for load_case in switch_load_cases])
-            switch_load_cases = [{load_case[0]: load_case[1] for load_case in load_combination} for load_combination in
-                                 switch_load_cases]
-        # If there are switch list load cases
-        if switch_list_load_cases:
-            switch_list_load_cases = [itertools.product(*[load_case.items() for load_case in switch_load_case]) for
-                                      switch_load_case in switch_list_load_cases]
-            switch_list_load_cases = [[{load_case[0]: load_case[1] for load_case in load_combination} for
-                                      load_combination in switch_load_case] for
-                                      switch_load_case in switch_list_load_cases]
-        # Add the three load cases to each other to obtain all the load combinations
-        load_combination_list = itertools.product(switch_load_cases, *switch_list_load_cases)
-        load_combination_list = [{k: v for load_case in load_combination for k, v in load_case.items()} for
-                                 load_combination in load_combination_list]
-        # Add the permanent load cases to each load combination
-        for load_case in load_combination_list:
-            load_case.update(permanent_load_cases)
-        # Add the load combinations
-        for i in range(len(load_combination_list)):
-            self.add_load_combination(load_combination_name + str(i), load_combination_list[i], True, check_copy)
+        # Add the load combinations one by one as they are generated, the copies are only removed if check copy is true
+        for i, load_cases in enumerate(self.load_combination_generator(permanent_load_cases, switch_load_cases,
+                                                                       switch_list_load_cases, unique=False)):
+            self.add_load_combination(load_combination_name + str(i), load_cases, True, check_copy)
+
+    @staticmethod
+    def load_combination_generator(permanent_load_cases=None, switch_load_cases=None, switch_list_load_cases=None,
+                                   unique=True):
+        # The load combinations are generated lazily: every subset of the switch load cases is combined with one load
+        # case of every dict of the switch lists and with all the permanent load cases
+        switch_load_cases = [list(load_case.items())[0] for load_case in switch_load_cases or []]
+        switch_list_load_cases = [list(load_case.items()) for switch_load_case in switch_list_load_cases or [] for
+                                  load_case in switch_load_case]
+        permanent_load_cases = list((permanent_load_cases or {}).items())
+        # The digests of the canonical keys of the generated load combinations, to skip the copies
+        digests = set()
+        for switch_load_combination in powerset(switch_load_cases):
+            for switch_list_load_combination in itertools.product(*switch_list_load_cases):
+                load_cases = dict(switch_load_combination)
+                load_cases.update(switch_list_load_combination)
+                load_cases.update(permanent_load_cases)
+                if unique:
+                    digest = hashlib.blake2b(repr(load_combination_key(load_cases)).encode(), digest_size=16).digest()
+                    if digest in digests:
+                        continue
+                    digests.add(digest)
+                yield load_cases
+
+
+def load_combination_key(load_cases):
+    # The canonical key of a load combination: its (load case, factor) tuples sorted by the load case
+    return tuple(sorted(((load_case, float(factor)) for load_case, factor in load_cases.items()),
+                        key=lambda item: repr(item[0])))
+
+
+def load_combination_chunks(load_combinations, chunk_size):
+    # Yield lists of at most chunk size load combinations of an iterable of load combinations
+    load_combinations = iter(load_combinations)
+    chunk = list(itertools.islice(load_combinations, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(load_combinations, chunk_size))
 
 
 def powerset(iterable):
@@ -0,0 +1,255 @@
+"""
+pystructural.solver.components.load_distribution
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+Implements the load distributions of the q-loads. A load distribution is data only, such that it can be pickled, and it
+is evaluated with NumPy at many positions at once. The value of a load distribution depends on the global x coordinate
+of the position.
+"""
+import numpy as np
+
+__all__ = ['LoadDistribution', 'ConstantDistribution', 'PiecewiseLinearDistribution', 'TrapezoidalDistribution',
+           'PolynomialDistribution', 'SumDistribution', 'FunctionDistribution']
+
+
+class LoadDistribution:
+    """The basic load distribution class which each load distribution needs to inherit. A load distribution is a
+    polynomial of the global x coordinate between the x coordinates of its discontinuity list.
+    """
+    __slots__ = ()
+    # The degree of the polynomial pieces of the load distribution
+    degree = 0
+
+    def __call__(self, position):
+        """Evaluate the load distribution at a position.
+
+        :param position: The position.
+        :return: The value of the load distribution.
+        """
+        return float(self.evaluate(np.asarray(position, dtype=float).reshape(1, 2))[0])
+
+    def __add__(self, other):
+        return SumDistribution([self, other])
+
+    @property
+    def discontinuity_list(self):
+        """The global x coordinates where the polynomial pieces of the load distribution start and end.
+        """
+        return []
+
+    def evaluate(self, positions):
+        """Evaluate the load distribution at many positions at once.
+
+        :param positions: A (N, 2) array with the positions.
+        :return: A (N,) array with the values of the load distribution.
+        """
+        return self.evaluate_x(np.asarray(positions, dtype=float).reshape(-1, 2)[:, 0])
+
+    def evaluate_x(self, x):
+        """Evaluate the load distribution at global x coordinates.
+
+        :param x: A (N,) array with the global x coordinates.
+        :return: A (N,) array with the values of the load distribution.
+        """
+        pass
+
+    @property
+    def quadrature_order(self):
+        """The amount of Gauss points of every piece, the Gauss rule is exact for the degree of the load plus the
+        degree of the shape functions.
+        """
+        return (self.degree + 5) // 2
+
+    def consistent_loads(self, start_points, end_points, lengths):
+        """Determine the consistent nodal loads of the load distribution on many line elements at once. The integral of
+        the load times the shape functions is integrated with a Gauss rule on every piece of the elements between the
+        discontinuities.
+
+        :param start_points: A (E, 2) array with the start points of the line elements.
+        :param end_points: A (E, 2) array with the end points of the line elements.
+        :param lengths: A (E,) array with the lengths of the line elements.
+        :return: A (E, 4) array with the force and the moment at the start node and the force and the moment at the end
+            node of every element.
+        """
+        start_points = np.asarray(start_points, dtype=float).reshape(-1, 2)
+        end_points = np.asarray(end_points, dtype=float).reshape(-1, 2)
+        lengths = np.asarray(lengths, dtype=float).ravel()
+        # Split the unit interval of every element at the discontinuities, the discontinuities outside an element and
+        # on a vertical element give pieces of zero length
+        dx = end_points[:, 0] - start_points[:, 0]
+        discontinuities = np.asarray(self.discontinuity_list, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            units = np.where(dx[:, np.newaxis] != 0.0,
+                             (discontinuities[np.newaxis, :] - start_points[:, [0]]) / dx[:, np.newaxis], 0.0)
+        units = np.sort(np.concatenate((np.zeros((len(lengths), 1)), np.clip(units, 0.0, 1.0),
+                                        np.ones((len(lengths), 1))), axis=1), axis=1)
+        # Get the Gauss points and weights of every piece of every element, a (E, P * G) array
+        points, weights = np.polynomial.legendre.leggauss(self.quadrature_order)
+        piece_lengths = units[:, 1:] - units[:, :-1]
+        t = (piece_lengths[:, :, np.newaxis] * (points + 1.0) / 2.0 + units[:, :-1, np.newaxis]).reshape(len(lengths),
+                                                                                                       -1)
+        w = (piece_lengths[:, :, np.newaxis] * weights / 2.0).reshape(len(lengths), -1)
+        # Evaluate the load at all the Gauss points at once
+        positions = start_points[:, np.newaxis, :] + t[:, :, np.newaxis] * (end_points - start_points)[:, np.newaxis, :]
+        q = w * self.evaluate(positions.reshape(-1, 2)).reshape(t.shape) * lengths[:, np.newaxis]
+        # Integrate the load times the hermite shape functions, the moments are clockwise positive
+        shape_functions = np.stack((1.0 - 3.0 * t ** 2 + 2.0 * t ** 3,
+                                    -(t - 2.0 * t ** 2 + t ** 3) * lengths[:, np.newaxis],
+                                    3.0 * t ** 2 - 2.0 * t ** 3,
+                                    -(t ** 3 - t ** 2) * lengths[:, np.newaxis]), axis=2)
+        return np.einsum('ep,epk->ek', q, shape_functions)
+
+
+class ConstantDistribution(LoadDistribution):
+    """A constant load distribution.
+
+    :param q_load: The value of the load.
+    """
+    __slots__ = ('q_load',)
+    degree = 0
+
+    def __init__(self, q_load):
+        self.q_load = float(q_load)
+
+    def evaluate_x(self, x):
+        return np.full(len(x), self.q_load)
+
+
+class PiecewiseLinearDistribution(LoadDistribution):
+    """A piecewise linear load distribution, the load is zero outside the x values.
+
+    :param x_values: The increasing global x coordinates of the points of the load distribution.
+    :param q_values: The values of the load at the points.
+    """
+    __slots__ = ('x_values', 'q_values')
+    degree = 1
+
+    def __init__(self, x_values, q_values):
+        self.x_values = np.asarray(x_values, dtype=float)
+        self.q_values = np.asarray(q_values, dtype=float)
+        # Check if the points are valid
+        if len(self.x_values) != len(self.q_values) or len(self.x_values) < 2:
+            raise ValueError('The x values and the q values must have the same length of at least 2.')
+        if np.any(np.diff(self.x_values) < 0.0):
+            raise ValueError('The x values must be increasing.')
+
+    @property
+    def discontinuity_list(self):
+        return self.x_values.tolist()
+
+    def evaluate_x(self, x):
+        return np.interp(x, self.x_values, self.q_values, left=0.0, right=0.0)
+
+
+class TrapezoidalDistribution(PiecewiseLinearDistribution):
+    """A trapezoidal load distribution between two global x coordinates, the load is zero outside them.
+
+    :param q_start: The value of the load at the start.
+    :param q_end: The value of the load at the end.
+    :param x_start: The global x coordinate of the start.
+    :param x_end: The global x coordinate of the end.
+    """
+    __slots__ = ()
+
+    def __init__(self, q_start, q_end, x_start, x_end):
+        super().__init__([x_start, x_end], [q_start, q_end])
+
+
+class PolynomialDistribution(LoadDistribution):
+    """A polynomial load distribution of the global x coordinate, the load is zero outside the start and the end.
+
+    :param coefficients: The coefficients of the polynomial from the constant term to the highest power of x.
+    :param x_start: The global x coordinate of the start, the polynomial has no start if None.
+    :param x_end: The global x coordinate of the end, the polynomial has no end if None.
+    """
+    __slots__ = ('coefficients', 'x_start', 'x_end')
+
+    def __init__(self, coefficients, x_start=None, x_end=None):
+        self.coefficients = np.asarray(coefficients, dtype=float).ravel()
+        self.x_start = x_start
+        self.x_end = x_end
+
+    @property
+    def degree(self):
+        return max(len(self.coefficients) - 1, 0)
+
+    @property
+    def discontinuity_list(self):
+        return [x for x in (self.x_start, self.x_end) if x is not None]
+
+    def evaluate_x(self, x):
+        values = np.polynomial.polynomial.polyval(x, self.coefficients)
+        # The load is zero outside the start and the end
+        if self.x_start is not None:
+            values = np.where(x < self.x_start, 0.0, values)
+        if self.x_end is not None:
+            values = np.where(x > self.x_end, 0.0, values)
+        return values
+
+
+class SumDistribution(LoadDistribution):
+    """The sum of load distributions.
+
+    :param distributions: The load distributions.
+    """
+    __slots__ = ('distributions',)
+
+    def __init__(self, distributions):
+        # Flatten the sums of load distributions
+        self.distributions = []
+        for distribution in distributions:
+            if isinstance(distribution, SumDistribution):
+                self.distributions += distribution.distributions
+            else:
+                self.distributions.append(distribution)
+
+    @property
+    def discontinuity_list(self):
+        return sorted(set(x for distribution in self.distributions for x in distribution.discontinuity_list))
+
+    def evaluate_x(self, x):
+        return sum(distribution.evaluate_x(x) for distribution in self.distributions)
+
+    def consistent_loads(self, start_points, end_points, lengths):
+        # The consistent loads are linear in the load
+        return sum(distribution.consistent_loads(start_points, end_points, lengths)
+                   for distribution in self.distributions)
+
+
+class FunctionDistribution(LoadDistribution):
+    """A load distribution of an arbitrary function of the position. The function is evaluated at every position
+    separately and it can't be pickled if it is a lambda or a local function. The consistent nodal loads are integrated
+    with a Gauss rule of the given order on every piece between the discontinuities, which is exact if the function is
+    a polynomial of a degree up to two times the order minus four.
+
+    :param q_load_func: The function that returns the value of the load at a position.
+    :param discontinuity_list: The global x coordinates where the function is discontinuous.
+    :param order: The amount of Gauss points of every piece.
+    """
+    __slots__ = ('q_load_func', 'discontinuities', 'order')
+
+    def __init__(self, q_load_func, discontinuity_list=None, order=3):
+        self.q_load_func = q_load_func
+        self.discontinuities = [] if discontinuity_list is None else list(discontinuity_list)
+        # Check if the order is valid
+        if order < 1:
+            raise ValueError('The order of the Gauss rule must be at least 1.')
+        self.order = order
+
+    def __call__(self, position):
+        return self.q_load_func(position)
+
+    @property
+    def discontinuity_list(self):
+        return self.discontinuities
+
+    @property
+    def quadrature_order(self):
+        return self.order
+
+    def evaluate(self, positions):
+        return np.array([self.q_load_func(position) for position in np.asarray(positions, dtype=float).reshape(-1, 2)],
+                        dtype=float)
+
+    def evaluate_x(self, x):
+        return self.evaluate(np.column_stack((x, np.zeros(len(x)))))
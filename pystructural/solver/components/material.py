@@ -11,6 +11,7 @@ __all__ = ['Material',
 class Material:
     """The basic material class which each material needs to inherit.
     """
+    __slots__ = ('entity_id', 'phase_id_list')
 
     def __init__(self):
         pass
@@ -22,6 +23,7 @@ class LinearElasticity2DMaterial(Material):
     :param youngs_modulus: The youngs modulus of the material.
     :param mass_density: The mass density of the material.
     """
+    __slots__ = ('youngs_modulus', 'mass_density')
 
     def __init__(self, youngs_modulus, mass_density):
         self.youngs_modulus = youngs_modulus
@@ -2,9 +2,74 @@
 pystructural.solver.components.phased_analysis_components
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
 
-Implements the phased analysis class.
+Implements the phased analysis class and the phase set of the components.
 """
-__all__ = ['PhasedAnalysis']
+__all__ = ['PhasedAnalysis', 'PhaseSet']
+
+
+class PhaseSet:
+    """A compact set of phase id's, the phase id's are the bits of an integer. A phase set is the phase id list of a
+    component, the membership test of a phase is a single bit test. A phase set is immutable because the structure
+    indexes the components by their phases, the phases of a component are added with Structure.add_phase_ids.
+
+    :param phase_id_list: The phase id's, which are non negative integers.
+    """
+    __slots__ = ('mask',)
+
+    def __init__(self, phase_id_list=()):
+        if isinstance(phase_id_list, PhaseSet):
+            self.mask = phase_id_list.mask
+        else:
+            self.mask = 0
+            for phase_id in phase_id_list:
+                # Check if the phase id is valid
+                if not isinstance(phase_id, int) or phase_id < 0:
+                    raise ValueError('The phase id {0} is not a non negative integer.'.format(phase_id))
+                self.mask |= 1 << phase_id
+
+    def __contains__(self, phase_id):
+        return isinstance(phase_id, int) and phase_id >= 0 and (self.mask >> phase_id) & 1 == 1
+
+    def __iter__(self):
+        # Yield the phase id of every set bit in increasing order
+        mask = self.mask
+        phase_id = 0
+        while mask:
+            if mask & 1:
+                yield phase_id
+            mask >>= 1
+            phase_id += 1
+
+    def __len__(self):
+        return bin(self.mask).count('1')
+
+    def __eq__(self, other):
+        if isinstance(other, PhaseSet):
+            return self.mask == other.mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __repr__(self):
+        return 'PhaseSet({0})'.format(list(self))
+
+    def __deepcopy__(self, memo):
+        # A phase set is immutable
+        return self
+
+    def union(self, phase_id_list):
+        """Get the union of the phase set and phase id's.
+
+        :param phase_id_list: The phase id's or a phase set.
+        :return: Returns a new phase set.
+        """
+        phase_set = PhaseSet(self)
+        phase_set.mask |= PhaseSet(phase_id_list).mask
+        return phase_set
 
 
 class PhasedAnalysis:
@@ -48,3 +113,27 @@ class PhasedAnalysis:
         """
         for previous_phase in previous_phase_id_list:
             self.previous_phases[phase_id].append(previous_phase)
+
+    def topological_order(self):
+        """Determines an order of the phases in which every phase comes after its previous phases.
+
+        :return: Returns the list of phase id's in the order of their dependencies.
+        """
+        # Check if the previous phases exist
+        for phase_id, previous_phase_id_list in self.previous_phases.items():
+            for previous_phase in previous_phase_id_list:
+                if previous_phase not in self.phases:
+                    raise ValueError('The previous phase {0} of phase {1} does not exist.'.format(previous_phase,
+                                                                                                  phase_id))
+        # Add the phases of which all the previous phases are ordered, in the order in which they are created
+        order = []
+        ordered = set()
+        while len(order) < len(self.phases):
+            ready = [phase_id for phase_id in self.phases if phase_id not in ordered and
+                     all(previous_phase in ordered for previous_phase in self.previous_phases[phase_id])]
+            if not ready:
+                raise ValueError('The previous phases of the phases {0} form a cycle.'.format(
+                    [phase_id for phase_id in self.phases if phase_id not in ordered]))
+            order += ready
+            ordered.update(ready)
+        return order
@@ -21,6 +21,7 @@ class Support(DOF):
     :param rotation_y: DOF for the rotation around the y axis, dof id: 4.
     :param rotation_z: DOF for the rotation around the z axis, dof id: 5.
     """
+    __slots__ = ()
 
     def __init__(self, displacement_x=True, displacement_y=True, displacement_z=True,
                  rotation_x=True, rotation_y=True, rotation_z=True):
@@ -61,3 +61,26 @@ def test_triangle_2d_geometry_properties_area():
     triangle_2d.compute_geometry_properties()
 
     assert triangle_2d.area == 0.5
+
+
+############
+# POINT 2D #
+############
+
+def test_point_2d_point_list():
+    point_2d = Point2D(1.0, 2.0)
+
+    assert not hasattr(point_2d, '__dict__')
+    assert not hasattr(point_2d, 'phase_id_list')
+    assert np.allclose(point_2d.point_list, np.array([[1.0, 2.0]]))
+    assert np.allclose(point_2d.point_list[0], np.array([1.0, 2.0]))
+    # The point list is created from the coordinates when it is requested
+    point_2d.x = 5.0
+
+    assert np.allclose(point_2d.point_list, np.array([[5.0, 2.0]]))
+
+    point_2d.point_list = np.array([[3.0, 4.0]])
+
+    assert point_2d.x == 3.0
+    assert point_2d.y == 4.0
+    assert np.allclose(point_2d.point_list, np.array([[3.0, 4.0]]))
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from pystructural.solver.components.load_combination import *
+
+
+@pytest.fixture
+def load_combinations_component():
+    component = LoadCombinationsComponent()
+    component.add_load_combination('lc_0', {'0': 1.35, '1': 1.5}, True)
+    component.add_load_combination('lc_1', {'1': 0.5, '2': 1.5}, True)
+    return component
+
+
+def test_factor_matrix(load_combinations_component):
+    assert load_combinations_component.factor_matrix.shape == (2, 3)
+    assert np.allclose(load_combinations_component.factor_matrix.toarray(), [[1.35, 1.5, 0.0], [0.0, 0.5, 1.5]])
+    assert load_combinations_component.load_case_factors(1) == {1: 0.5, 2: 1.5}
+    assert list(load_combinations_component.load_case_generator(1)) == [(0, 1.5), (1, 0.5)]
+    # The factor matrix is built again when a load combination is added
+    load_combinations_component.add_load_combination('lc_2', {'3': 1.0}, True)
+    assert load_combinations_component.factor_matrix.shape == (3, 4)
+    assert list(load_combinations_component.load_case_generator(3)) == [(2, 1.0)]
+    # The load cases are kept when the load combinations are removed and the ids of the new load combinations start at
+    # zero again
+    load_combinations_component.remove_load_combinations()
+    assert list(load_combinations_component.load_case_generator(1)) == []
+    assert load_combinations_component.add_load_combination('lc_3', {'1': 2.0}, True) == 0
+    assert load_combinations_component.factor_matrix.shape == (1, 4)
@@ -0,0 +1,86 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from pystructural.solver.components.load_distribution import *
+
+
+@pytest.fixture
+def distributions():
+    return [ConstantDistribution(-1.0),
+            TrapezoidalDistribution(-1.0, -3.0, 1.0, 3.0),
+            PiecewiseLinearDistribution([0.0, 1.0, 4.0], [0.0, -2.0, -1.0]),
+            PolynomialDistribution([1.0, -0.5, 0.25, -0.125], 0.5, 3.5),
+            ConstantDistribution(-1.0) + PolynomialDistribution([0.0, 1.0])]
+
+
+def test_evaluate(distributions):
+    positions = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 0.0], [4.0, 0.0]])
+    # Test the vectorized evaluation against the evaluation at every position
+    for distribution in distributions:
+        assert np.allclose(distribution.evaluate(positions), [distribution(position) for position in positions])
+    assert np.allclose(distributions[1].evaluate(positions), [0.0, -1.0, -2.0, 0.0])
+    assert np.allclose(distributions[4].evaluate(positions), [-1.0, 0.0, 1.0, 3.0])
+
+
+def test_consistent_loads(distributions):
+    start_point = np.array([0.0, 0.0])
+    end_point = np.array([4.0, 0.0])
+    # Test the consistent loads against the integral of the load times the shape functions with many points
+    units = np.linspace(0.0, 1.0, 20001)
+    shape_functions = np.array([1.0 - 3.0 * units ** 2 + 2.0 * units ** 3,
+                                -4.0 * (units - 2.0 * units ** 2 + units ** 3),
+                                3.0 * units ** 2 - 2.0 * units ** 3,
+                                -4.0 * (units ** 3 - units ** 2)])
+    for distribution in distributions:
+        q = distribution.evaluate(np.outer(1.0 - units, start_point) + np.outer(units, end_point))
+        integrand = shape_functions * q
+        reference = 4.0 * np.sum(integrand[:, :-1] + integrand[:, 1:], axis=1) / 2.0 * (units[1] - units[0])
+        assert np.allclose(distribution.consistent_loads(start_point, end_point, 4.0)[0], reference, atol=1e-3)
+    # Test the closed form of a constant load
+    assert np.allclose(distributions[0].consistent_loads(start_point, end_point, 4.0),
+                       [[-2.0, 16.0 / 12.0, -2.0, -16.0 / 12.0]])
+
+
+def test_consistent_loads_elements(distributions):
+    # Define elements that are split by the discontinuities, an inclined element and a vertical element
+    start_points = np.array([[0.0, 0.0], [0.5, 0.0], [1.0, 1.0], [2.0, 0.0], [3.0, 0.0]])
+    end_points = np.array([[0.5, 0.0], [2.5, 0.0], [4.0, 3.0], [2.0, 3.0], [5.0, 0.0]])
+    lengths = np.linalg.norm(end_points - start_points, axis=1)
+    # Test the loads of all the elements at once against the loads of every element
+    for distribution in distributions:
+        nodal_loads = distribution.consistent_loads(start_points, end_points, lengths)
+        for i in range(len(lengths)):
+            assert np.allclose(nodal_loads[i], distribution.consistent_loads(start_points[i], end_points[i],
+                                                                             lengths[i])[0])
+
+
+def test_function_distribution_order():
+    start_points = np.array([[0.0, 0.0], [1.0, 0.0]])
+    end_points = np.array([[1.0, 0.0], [4.0, 0.0]])
+    lengths = np.array([1.0, 3.0])
+    # The Gauss rule of order 3 is exact for a quadratic load
+    polynomial = PolynomialDistribution([1.0, -0.5, 0.25])
+    function = FunctionDistribution(lambda x: 1.0 - 0.5 * x[0] + 0.25 * x[0] ** 2)
+    assert np.allclose(function.consistent_loads(start_points, end_points, lengths),
+                       polynomial.consistent_loads(start_points, end_points, lengths))
+    # A discontinuous function is integrated exactly if its discontinuities are given
+    trapezoidal = TrapezoidalDistribution(-1.0, -2.0, 0.5, 2.0)
+    function = FunctionDistribution(trapezoidal, [0.5, 2.0], 3)
+    assert np.allclose(function.consistent_loads(start_points, end_points, lengths),
+                       trapezoidal.consistent_loads(start_points, end_points, lengths))
+    # A higher order converges for a smooth load
+    polynomial = PolynomialDistribution([1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0])
+    function = FunctionDistribution(lambda x: 1.0 + x[0] ** 6, order=5)
+    assert np.allclose(function.consistent_loads(start_points, end_points, lengths),
+                       polynomial.consistent_loads(start_points, end_points, lengths))
+    with pytest.raises(ValueError):
+        FunctionDistribution(lambda x: 1.0, order=0)
+
+
+def test_pickle(distributions):
+    positions = np.array([[0.5, 0.0], [2.5, 0.0]])
+    for distribution in distributions:
+        assert np.allclose(pickle.loads(pickle.dumps(distribution)).evaluate(positions),
+                           distribution.evaluate(positions))
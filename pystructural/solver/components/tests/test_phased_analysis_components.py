@@ -40,3 +40,34 @@ def test_add_previous_phase(phased_analysis):
 
     assert phased_analysis.previous_phases[phase_id_0] == [phase_id_1, phase_id_2]
     assert phased_analysis.previous_phases[phase_id_2] == [phase_id_3]
+
+
+def test_topological_order(phased_analysis):
+    phase_id_0 = phased_analysis.create_phase('phase_0')
+    phase_id_1 = phased_analysis.create_phase('phase_1')
+    phase_id_2 = phased_analysis.create_phase('phase_2')
+    phase_id_3 = phased_analysis.create_phase('phase_3')
+
+    phased_analysis.add_previous_phase(phase_id_0, phase_id_1, phase_id_2)
+    phased_analysis.add_previous_phase(phase_id_2, phase_id_3)
+
+    assert phased_analysis.topological_order() == [phase_id_1, phase_id_3, phase_id_2, phase_id_0]
+
+    phased_analysis.add_previous_phase(phase_id_3, phase_id_0)
+    with pytest.raises(ValueError):
+        phased_analysis.topological_order()
+
+
+def test_phase_set():
+    phase_set = PhaseSet([3, 0, 3])
+
+    assert 0 in phase_set and 3 in phase_set
+    assert 1 not in phase_set and -1 not in phase_set and None not in phase_set
+    assert list(phase_set) == [0, 3] and len(phase_set) == 2
+
+    phase_set_1 = phase_set.union([1])
+    assert list(phase_set_1) == [0, 1, 3] and list(phase_set) == [0, 3]
+    assert phase_set | PhaseSet([3]) == phase_set
+
+    with pytest.raises(ValueError):
+        PhaseSet([-1])
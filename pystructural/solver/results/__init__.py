@@ -1,3 +1,4 @@
 from .results import *
 from .linear_analysis_results import *
 from . import result_components
+from .sensitivity_analysis import *
@@ -1,21 +1,33 @@
 import numpy as np
 
+import collections
 import copy
 
+from pystructural.core import math_ps
 from pystructural.solver.components.calculation_components import *
 
 from pystructural.solver.systems.analysis.element_systems import element_subclasses_2d
-from pystructural.solver.components.geometry import Point2D
+from pystructural.solver.components.geometry import Point2D, Line2D
+from pystructural.solver.components.load import QLoad2D
+from pystructural.solver.components.load_combination import load_combination_chunks
 from pystructural.solver.components.element import line_elements
 from pystructural.pre_processor.components import LineElementSortComponent
 from pystructural.solver.systems.analysis.load_systems import imposed_load_subclasses_2d
+from pystructural.solver.results.result_components import ProfileReportComponent
 
 from .results import *
 
 __all__ = ['LinearAnalysisResults2D']
 
 
+# The index in the displacement and the force vectors of a node of every dof id
+node_dof_index = {0: 0, 1: 1, 5: 2}
+
+
 class LinearAnalysisResults2D:
+    # The maximum amount of result arrays of every cache, the oldest result arrays are removed first
+    maximum_cached_result_arrays = 256
+
     def __init__(self, structure, result_entity_id):
         self.structure = structure
         self.result_entity_id = result_entity_id
@@ -28,29 +40,45 @@ class LinearAnalysisResults2D:
         # Get the line element sort component
         self.line_element_sort = self.structure.get_component_from_entity(self.structure.general_entity_id,
                                                                           LineElementSortComponent)
+        # Get the profile report of the analysis if the analysis was profiled
+        profile_report_component = self.structure.get_component_from_entity(self.result_entity_id,
+                                                                            ProfileReportComponent)
+        self.profile_report = profile_report_component.profile_report if profile_report_component else None
         # Initialize the line results dict
         self.line_results = {}
         # Initialize the linear phase analysis results
         self.linear_phase_analysis_results = []
         self.phase_analysis_id = None
+        # The result arrays of the analysis, the cumulative result arrays of the phase and the sum of the cumulative
+        # result arrays of the previous phases for every result type and load combination, the rows of the arrays are
+        # the nodes or the elements, which are found by their entity ids that all the phases of a structure share
+        self.result_arrays = collections.OrderedDict()
+        self.phase_result_arrays = collections.OrderedDict()
+        self.previous_phase_result_arrays = collections.OrderedDict()
+        # The nodes and the elements of the analysis with the global dof ids of their dofs
+        self.node_dof_ids = None
+        self.element_dof_ids = None
 
     def add_linear_phase_analysis_result(self, linear_phase_analysis_result, load_combinations):
         # Add the linear phase analysis results to the list
         self.linear_phase_analysis_results.append([linear_phase_analysis_result, load_combinations])
 
-    def calculate_line_result(self, group_id):
+    def calculate_line_result(self, group_id, chunk_size=100, top_k=None):
         line_start = self.structure.get_component_from_entity(self.line_element_sort.groups[group_id][0][1],
                                                               Point2D)
         line_end = self.structure.get_component_from_entity(self.line_element_sort.groups[group_id][-1][1], Point2D)
-        self.line_results[group_id] = LineResults(line_start.point_list[0], line_end.point_list[0])
-
-        # For each load combination add the line values of the group
-        for load_combination in self.structure.load_combinations_component.load_combinations:
-            line_values = []
-            for position_vector, dof_value in self.global_dof_generator(group_id, load_combination):
-                line_values.append([position_vector, dof_value, load_combination])
-            # Add the line values to the LineResults instance
-            self.line_results[group_id].add_line_values(line_values)
+        self.line_results[group_id] = LineResults(line_start.point_list[0], line_end.point_list[0], top_k)
+
+        # Add the line values of the group to the envelope chunk by chunk of load combinations
+        for chunk in load_combination_chunks(self.structure.load_combinations_component.load_combinations,
+                                             chunk_size):
+            positions = None
+            values = []
+            for load_combination in chunk:
+                line_values = list(self.global_dof_generator(group_id, load_combination))
+                positions = [position_vector for position_vector, _ in line_values]
+                values.append([dof_value for _, dof_value in line_values])
+            self.line_results[group_id].envelope.add_values(positions, values, chunk)
 
     def group_tangent_vector(self, group_id):
         # Get the generator for the group
@@ -73,15 +101,41 @@ class LinearAnalysisResults2D:
         # Return the normalized tangent vector
         return -tangent_vector / np.linalg.norm(tangent_vector)
 
+    def get_line_element(self, entity_id):
+        # Return the element of the line entity
+        for line_element_class in line_elements:
+            if self.structure.get_component_from_entity(entity_id, line_element_class):
+                return self.structure.get_component_from_entity(entity_id, line_element_class)
+        return None
+
+    def station_generator(self, group_id, load_combination):
+        # Get the sorted nodes of the group, every line element has two consecutive node tuples
+        node_tuples = list(self.line_element_sort.line_element_id_generator(group_id))
+        # The units of the stations of every line element
+        units = np.linspace(0.0, 1.0, max(2, self.structure.stations_per_element))
+        # For every line element in the group of line elements
+        for start_tuple, end_tuple in zip(node_tuples[0::2], node_tuples[1::2]):
+            # Get the values at the stations of the element
+            positions, force_vectors, displacement_vectors =\
+                self.get_element_station_values(self.get_line_element(start_tuple[0]), load_combination, units)
+            # Reverse the stations if the group runs from the second to the first node of the element
+            if start_tuple[2] == 1:
+                positions, force_vectors, displacement_vectors =\
+                    positions[::-1], force_vectors[::-1], displacement_vectors[::-1]
+            # Yield the position, the force vector and the displacement vector of every station
+            for i in range(len(units)):
+                yield positions[i], force_vectors[i], displacement_vectors[i]
+
     def displacement_generator(self, group_id, load_combination):
+        # If the line elements are not split, yield the displacements at the stations of the line elements
+        if self.structure.subdivision != 'uniform':
+            for position_vector, _, displacement_vector in self.station_generator(group_id, load_combination):
+                yield position_vector, displacement_vector[:2]
+            return
         # For every line in the group of line elements
         for node_tuple in self.line_element_sort.line_element_id_generator(group_id):
             # Get the corresponding element of the line
-            element = None
-            for line_element_class in line_elements:
-                if self.structure.get_component_from_entity(node_tuple[0], line_element_class):
-                    element = self.structure.get_component_from_entity(node_tuple[0], line_element_class)
-                    break
+            element = self.get_line_element(node_tuple[0])
             # Get the displacement vector of the element
             displacement_vector = self.get_element_displacement_vector(element, load_combination)
             # Get the first or last three items depending on if the node is the first or the second node in the line
@@ -94,14 +148,15 @@ class LinearAnalysisResults2D:
                                                                                                   :2]
 
     def global_dof_generator(self, group_id, load_combination):
+        # If the line elements are not split, yield the force vectors at the stations of the line elements
+        if self.structure.subdivision != 'uniform':
+            for position_vector, force_vector, _ in self.station_generator(group_id, load_combination):
+                yield position_vector, force_vector
+            return
         # For every line in the group of line elements
         for node_tuple in self.line_element_sort.line_element_id_generator(group_id):
             # Get the corresponding element of the line
-            element = None
-            for line_element_class in line_elements:
-                if self.structure.get_component_from_entity(node_tuple[0], line_element_class):
-                    element = self.structure.get_component_from_entity(node_tuple[0], line_element_class)
-                    break
+            element = self.get_line_element(node_tuple[0])
             # Get the local force vector
             local_force_vector = self.get_element_local_force_vector(element, load_combination)
             # Get the first or last three items depending on if the node is the first or the second node in the line
@@ -113,17 +168,25 @@ class LinearAnalysisResults2D:
             # Yield the position of the node and the value of the dof
             yield self.structure.get_component_from_entity(node_tuple[1], Point2D).point_list[0], local_force_vector
 
-    # TODO define a load combination variable that automatically deletes every load combination not in the variable
-    # from the yield
     def global_dof_enveloping_generator(self, group_id):
         # Initialize a LineResult instance if the group id doesn't have one yet
         if group_id not in self.line_results:
             self.calculate_line_result(group_id)
 
-        # For each combined line value
-        for position_vector, dof_value_list, load_combination_list in self.line_results[group_id]\
-                .combined_line_value_generator():
-            yield position_vector, dof_value_list, load_combination_list
+        # Yield the position, the min and the max dof values and their load combinations of every station
+        for envelope_value in self.line_results[group_id].envelope_generator():
+            yield envelope_value
+
+    def global_dof_governing_generator(self, group_id, k):
+        # Calculate the LineResult instance again if it doesn't keep the k governing load combinations
+        if group_id not in self.line_results or self.line_results[group_id].envelope.top_k is None or \
+                self.line_results[group_id].envelope.top_k < k:
+            self.calculate_line_result(group_id, top_k=k)
+
+        # Yield the position and the k governing min and max dof values, their load combinations and their concurrent
+        # dof values of every station
+        for position_vector, top_k_min, top_k_max in self.line_results[group_id].top_k_generator():
+            yield position_vector, tuple(array[:k] for array in top_k_min), tuple(array[:k] for array in top_k_max)
 
     def get_node_displacement_vector(self, node_instance, load_combination, phased=True):
         # Initialize the node displacement vector
@@ -143,14 +206,7 @@ class LinearAnalysisResults2D:
 
         # If linear phased analysis results are added to the node displacement vector then add it
         if phased:
-            # For every load combination in every phase analysis
-            for phase_analysis, load_combinations in self.linear_phase_analysis_results:
-                if load_combination in load_combinations:
-                    try:
-                        node_displacement_vector += phase_analysis.get_node_displacement_vector(node_instance,
-                                                                                                load_combination)
-                    except KeyError:
-                        pass
+            node_displacement_vector += self.previous_phase_result('node_displacement', load_combination, node_id, 3)
         # Return the node displacement vector
         return node_displacement_vector
 
@@ -172,41 +228,19 @@ class LinearAnalysisResults2D:
 
         # If linear phased analysis results are added to the node force vector then add it
         if phased:
-            # For every load combination in every phase analysis
-            for phase_analysis, load_combinations in self.linear_phase_analysis_results:
-                if load_combination in load_combinations:
-                    try:
-                        node_force_vector += phase_analysis.get_node_global_force_vector(node_instance,
-                                                                                         load_combination)
-                    except KeyError:
-                        pass
+            node_force_vector += self.previous_phase_result('node_force', load_combination, node_id, 3)
         # Return the node global force vector
         return node_force_vector
 
     def get_support_node_global_force(self, node_instance, load_combination, phased=True):
-        # Initialize the support force vector
-        support_force_vector = np.zeros(3)
-
-        # For all elements in the structure
-        for element_class in element_subclasses_2d:
-            for entity, components in self.structure.get_components(element_class.compatible_geometry, element_class):
-                # Check if the node_instance is used in the element
-                for i in range(len(components[1].geometry.point_id_list)):
-                    if node_instance.entity_id == components[1].geometry.point_id_list[i]:
-                        support_force_vector += self.get_element_global_force_vector(components[1], load_combination)[
-                            3*i:3*i+3]
-                        break
+        # The support force vector is the sum of the global force vectors of the elements of the analysis at the node
+        support_force_vector = self.result_row(self.result_array('support_force', load_combination),
+                                               node_instance.entity_id, 3)
 
         # If linear phased analysis results are added to the support force vector then add it
         if phased:
-            # For every load combination in every phase analysis
-            for phase_analysis, load_combinations in self.linear_phase_analysis_results:
-                if load_combination in load_combinations:
-                    try:
-                        support_force_vector += phase_analysis.get_support_node_global_force(node_instance,
-                                                                                             load_combination)
-                    except KeyError:
-                        pass
+            support_force_vector += self.previous_phase_result('support_force', load_combination,
+                                                               node_instance.entity_id, 3)
         # Return the support global force vector
         return support_force_vector
 
@@ -227,23 +261,31 @@ class LinearAnalysisResults2D:
 
         # If linear phased analysis results are added to the element displacement vector then add it
         if phased:
-            # For every load combination in every phase analysis
-            for phase_analysis, load_combinations in self.linear_phase_analysis_results:
-                if load_combination in load_combinations:
-                    try:
-                        element_displacement_vector += phase_analysis.get_element_displacement_vector(element_instance,
-                                                                                                      load_combination)
-                    except KeyError:
-                        pass
+            element_displacement_vector += self.previous_phase_result('element_displacement', load_combination,
+                                                                      element_instance.entity_id, dim)
         # Return the element displacement vector
         return element_displacement_vector
 
     def get_element_global_force_vector(self, element_instance, load_combination, phased=True):
         # Get the displacement vector of the element
         element_displacement_vector = self.get_element_displacement_vector(element_instance, load_combination, False)
-        # Calculate the global force vector of the element
-        element_global_force_vector = np.matmul(element_instance.stiffness_matrix, element_displacement_vector)
-        # Subtract the imposed loads from the force vector
+        # Calculate the global force vector of the element and subtract the imposed loads from it
+        element_global_force_vector = np.matmul(element_instance.stiffness_matrix, element_displacement_vector) -\
+            self.get_element_imposed_load_vector(element_instance, load_combination)
+
+        # If linear phased analysis results are added to the element global force vector then add it
+        if phased:
+            element_global_force_vector += self.previous_phase_result('element_force', load_combination,
+                                                                      element_instance.entity_id,
+                                                                      element_instance.element_dimension)
+        # Return the element global force vector
+        return element_global_force_vector
+
+    def get_element_imposed_load_vector(self, element_instance, load_combination):
+        # Initialize the imposed load vector of the element
+        imposed_load_vector = np.zeros(element_instance.element_dimension)
+        # The factors of the load cases of the load combination
+        load_cases = self.structure.load_combinations_component.load_case_factors(load_combination)
         # For each imposed load
         for load_class in imposed_load_subclasses_2d:
             components = self.structure.get_all_component_types_from_entity(element_instance.entity_id,
@@ -255,27 +297,275 @@ class LinearAnalysisResults2D:
                     # For each dof in the load
                     for data in imposed_load.load_dof_generator():
                         i = element_instance.get_node_and_dof_variable_to_stiffness_coordinate(data[0][0], data[0][1])
-                        if imposed_load.load_case_id in \
-                                self.structure.load_combinations_component.load_combinations[load_combination]:
-                            factor = self.structure.load_combinations_component.load_combinations[load_combination][
-                                imposed_load.load_case_id]
-                            # Subtract the imposed load from the load vector
-                            element_global_force_vector[i] -= factor * data[1]
+                        if imposed_load.load_case_id in load_cases:
+                            # Add the imposed load to the imposed load vector
+                            imposed_load_vector[i] += load_cases[imposed_load.load_case_id] * data[1]
+        # Return the imposed load vector
+        return imposed_load_vector
 
-        # If linear phased analysis results are added to the element global force vector then add it
+    def get_element_local_force_vector(self, element_instance, load_combination, phased=True):
+        # Return the element local force vector
+        return np.matmul(element_instance.geometry.global_to_local_matrix,
+                         self.get_element_global_force_vector(element_instance, load_combination, phased))
+
+    def get_element_q_load_vector(self, element_instance, load_combination):
+        # Initialize the global equivalent nodal load vector of the q-loads
+        q_load_vector = np.zeros(element_instance.element_dimension)
+        # Initialize the list of the q-loads with their load combination factor
+        q_loads = []
+        components = self.structure.get_all_component_types_from_entity(element_instance.entity_id, Line2D, QLoad2D)
+        if components is not None:
+            load_cases = self.structure.load_combinations_component.load_case_factors(load_combination)
+            for q_load in components[1]:
+                if self.phase_analysis_id is not None and hasattr(q_load, 'phase_id_list') and \
+                        self.phase_analysis_id not in q_load.phase_id_list:
+                    continue
+                if q_load.load_case_id in load_cases:
+                    factor = load_cases[q_load.load_case_id]
+                    q_loads.append((factor, q_load))
+                    # Add the equivalent nodal loads of the q-load
+                    for data in q_load.load_dof_generator():
+                        i = element_instance.get_node_and_dof_variable_to_stiffness_coordinate(data[0][0], data[0][1])
+                        q_load_vector[i] += factor * data[1]
+        # Return the equivalent nodal load vector and the q-loads
+        return q_load_vector, q_loads
+
+    def get_element_station_values(self, element_instance, load_combination, units, phased=True,
+                                   integration_points=8):
+        # The internal forces follow from the end forces of the element and the equilibrium with the q-loads, the
+        # displacements follow from integrating the strain and the curvature from the start node of the element
+        units = np.asarray(units, dtype=float)
+        geometry = element_instance.geometry
+        length = geometry.length
+        rotation_matrix = geometry.global_to_local_matrix[:2, :2]
+        # Determine the integration grid, it contains the stations and the start and end of the element
+        grid = np.unique(np.concatenate((units, np.linspace(0.0, 1.0, max(32, integration_points * (len(units) - 1))
+                                                            + 1))))
+        station_index = np.searchsorted(grid, units)
+        x = grid * length
+        positions = np.outer(1.0 - grid, geometry.point_list[0]) + np.outer(grid, geometry.point_list[1])
+        # Determine the local q-load at every point of the integration grid
+        q_load_vector, q_loads = self.get_element_q_load_vector(element_instance, load_combination)
+        # The q-load is evaluated just inside the ends of the element, such that a load that starts or ends at a node
+        # only acts on the element it is on. The Gauss points of the equivalent nodal loads are inside the element too
+        q_positions = np.outer(1.0 - np.clip(grid, 1e-9, 1.0 - 1e-9), geometry.point_list[0]) +\
+            np.outer(np.clip(grid, 1e-9, 1.0 - 1e-9), geometry.point_list[1])
+        q = np.zeros(len(grid))
+        for factor, q_load in q_loads:
+            q += factor * q_load.q_load_func.evaluate(q_positions)
+        q_x = q * rotation_matrix[0, 1]
+        q_y = q * rotation_matrix[1, 1]
+        # Determine the local end forces and displacements of the element without the equivalent nodal loads
+        end_forces = np.matmul(geometry.global_to_local_matrix,
+                               self.get_element_global_force_vector(element_instance, load_combination, False) -
+                               q_load_vector)
+        end_displacements = np.matmul(geometry.global_to_local_matrix,
+                                      self.get_element_displacement_vector(element_instance, load_combination, False))
+        # Determine the normal force, the shear force and the moment from the equilibrium with the q-loads
+        force_vectors = np.zeros((len(grid), 3))
+        force_vectors[:, 0] = end_forces[0] + math_ps.cumulative_integral(q_x, x)
+        force_vectors[:, 1] = end_forces[1] + math_ps.cumulative_integral(q_y, x)
+        force_vectors[:, 2] = end_forces[2] + math_ps.cumulative_integral(force_vectors[:, 1], x, q_y)
+        # Determine the axial displacement from the strain
+        u = end_displacements[0] - math_ps.cumulative_integral(force_vectors[:, 0], x, q_x) / element_instance.ea
+        u += (end_displacements[3] - u[-1]) * grid
+        # Determine the deflection from the curvature, the rotations are clockwise positive
+        curvature = force_vectors[:, 2] / element_instance.ei
+        slope = -end_displacements[2] + math_ps.cumulative_integral(curvature, x,
+                                                                   force_vectors[:, 1] / element_instance.ei)
+        v = end_displacements[1] + math_ps.cumulative_integral(slope, x, curvature)
+        # Correct the integration error such that the deflection matches the end node
+        slope += (end_displacements[4] - v[-1]) / length
+        v += (end_displacements[4] - v[-1]) * grid
+        # Transform the displacements to the global space
+        displacement_vectors = np.zeros((len(grid), 3))
+        displacement_vectors[:, :2] = np.matmul(np.column_stack((u, v)), rotation_matrix)
+        displacement_vectors[:, 2] = -slope
+        # Select the stations
+        positions = positions[station_index]
+        force_vectors = force_vectors[station_index]
+        displacement_vectors = displacement_vectors[station_index]
+
+        # If linear phased analysis results are added to the station values then add them
         if phased:
             # For every load combination in every phase analysis
             for phase_analysis, load_combinations in self.linear_phase_analysis_results:
                 if load_combination in load_combinations:
                     try:
-                        element_global_force_vector += phase_analysis.get_element_global_force_vector(element_instance,
-                                                                                                      load_combination)
+                        _, phase_force_vectors, phase_displacement_vectors =\
+                            phase_analysis.get_element_station_values(element_instance, load_combination, units)
+                        force_vectors += phase_force_vectors
+                        displacement_vectors += phase_displacement_vectors
                     except KeyError:
                         pass
-        # Return the element global force vector
-        return element_global_force_vector
-
-    def get_element_local_force_vector(self, element_instance, load_combination, phased=True):
-        # Return the element local force vector
-        return np.matmul(element_instance.geometry.global_to_local_matrix,
-                         self.get_element_global_force_vector(element_instance, load_combination, phased))
+        # Return the positions, the force vectors and the displacement vectors of the stations
+        return positions, force_vectors, displacement_vectors
+
+    def previous_phase_result(self, result_type, load_combination, entity_id, size):
+        # Get the sum of the cumulative results of the previous phases of a node or an element
+        return self.result_row(self.previous_phase_result_array(result_type, load_combination), entity_id, size)
+
+    def previous_phase_result_array(self, result_type, load_combination):
+        # Get the sum of the cumulative result arrays of the previous phases with the load combination, None if there
+        # are no previous phases with the load combination
+        def compute_previous_phase_result_array():
+            result_array = None
+            for phase_analysis, load_combinations in self.linear_phase_analysis_results:
+                if load_combination in load_combinations:
+                    result_array = add_result_arrays(result_array,
+                                                     phase_analysis.phase_result_array(result_type, load_combination))
+            return result_array
+        return self.cached_result_array(self.previous_phase_result_arrays, (result_type, load_combination),
+                                        compute_previous_phase_result_array)
+
+    def phase_result_array(self, result_type, load_combination):
+        # Get the cumulative result array of the phase: the result array of the analysis plus the cumulative result
+        # arrays of the previous phases
+        return self.cached_result_array(
+            self.phase_result_arrays, (result_type, load_combination),
+            lambda: add_result_arrays(self.result_array(result_type, load_combination),
+                                      self.previous_phase_result_array(result_type, load_combination)))
+
+    def result_array(self, result_type, load_combination):
+        # Get the result array of the analysis, it is computed once for every result type and load combination
+        return self.cached_result_array(self.result_arrays, (result_type, load_combination),
+                                        lambda: self.compute_result_array(result_type, load_combination))
+
+    def cached_result_array(self, cache, key, compute_result_array):
+        # Get a result array from a cache or compute it, the oldest result arrays are removed when the cache is full.
+        # The phases can be solved by threads, so the cache is never read twice for the same result array
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        result_array = compute_result_array()
+        cache[key] = result_array
+        while len(cache) > self.maximum_cached_result_arrays:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+        return result_array
+
+    def compute_result_array(self, result_type, load_combination):
+        # Compute the results of the analysis of all the nodes or all the elements at once
+        if self.node_dof_ids is None:
+            self.initialize_dof_ids()
+        displacement_vector = np.append(
+            self.displacement_and_load_vectors_component.displacement_vectors[load_combination], 0.0)
+        node_ids, node_dof_ids = self.node_dof_ids
+        elements, element_ids, element_dof_ids, element_node_dofs = self.element_dof_ids
+        if result_type == 'node_displacement':
+            return ResultArray(node_ids, displacement_vector[node_dof_ids])
+        elif result_type == 'node_force':
+            load_vector = np.append(self.displacement_and_load_vectors_component.load_vectors[load_combination], 0.0)
+            return ResultArray(node_ids, load_vector[node_dof_ids])
+        elif result_type == 'element_displacement':
+            return ResultArray(element_ids, displacement_vector[element_dof_ids])
+        # Determine the global force vectors of the elements with their stiffness matrices at once
+        stiffness_matrices = np.zeros((len(elements), element_dof_ids.shape[1], element_dof_ids.shape[1]))
+        for i, element in enumerate(elements):
+            stiffness_matrices[i, :element.element_dimension, :element.element_dimension] = element.stiffness_matrix
+        force_vectors = np.einsum('eij,ej->ei', stiffness_matrices, displacement_vector[element_dof_ids])
+        # Subtract the imposed loads of the elements
+        for i, element in enumerate(elements):
+            force_vectors[i, :element.element_dimension] -= \
+                self.get_element_imposed_load_vector(element, load_combination)
+        if result_type == 'element_force':
+            return ResultArray(element_ids, force_vectors)
+        # The support force of a node is the sum of the force vectors of the elements at the node
+        support_force_vectors = np.zeros((len(node_ids), 3))
+        element_index, coordinate_index = np.nonzero(element_node_dofs[:, :, 0] >= 0)
+        np.add.at(support_force_vectors, (element_node_dofs[element_index, coordinate_index, 0],
+                                          element_node_dofs[element_index, coordinate_index, 1]),
+                  force_vectors[element_index, coordinate_index])
+        return ResultArray(node_ids, support_force_vectors)
+
+    def initialize_dof_ids(self):
+        # Get the global dof ids of the nodes sorted by their entity id, the missing dofs point to the zero at the end of
+        # the vectors
+        local_to_global_dof_dict = self.dof_calculation_component.local_to_global_dof_dict
+        node_ids = np.array(sorted(local_to_global_dof_dict.keys()), dtype=int)
+        node_index = {node_id: i for i, node_id in enumerate(node_ids.tolist())}
+        node_dof_ids = np.array([[local_to_global_dof_dict[node_id].get(dof_id, -1) for dof_id in (0, 1, 5)]
+                                 for node_id in node_ids], dtype=int).reshape(-1, 3)
+        self.node_dof_ids = node_ids, node_dof_ids
+        # Get the elements of the analysis sorted by their entity id with the global dof ids of their stiffness
+        # coordinates and the index of the node and the index in the node vectors of their stiffness coordinates
+        elements = []
+        for element_class in element_subclasses_2d:
+            for entity, components in self.structure.get_components(element_class.compatible_geometry, element_class):
+                elements.append(components[1])
+        elements.sort(key=lambda element: element.entity_id)
+        width = max([element.element_dimension for element in elements], default=0)
+        element_dof_ids = np.full((len(elements), width), -1, dtype=int)
+        element_node_dofs = np.full((len(elements), width, 2), -1, dtype=int)
+        for i, element in enumerate(elements):
+            for j in range(element.element_dimension):
+                node_id, dof_id = element.get_stiffness_coordinate_to_node_and_dof_variable(j)
+                element_dof_ids[i, j] = local_to_global_dof_dict[node_id][dof_id]
+                element_node_dofs[i, j] = node_index[node_id], node_dof_index[dof_id]
+        element_ids = np.array([element.entity_id for element in elements], dtype=int)
+        self.element_dof_ids = elements, element_ids, element_dof_ids, element_node_dofs
+
+    def get_result_rows(self, result_type, load_combinations, entity_ids, size, phased=True):
+        # Get the results of many nodes or elements for many load combinations at once as a (N, L, size) array, the
+        # rows of the entity ids that are negative are nan
+        entity_ids = np.asarray(entity_ids, dtype=int).ravel()
+        is_found = entity_ids >= 0
+        result_rows = np.full((len(entity_ids), len(load_combinations), size), np.nan)
+        # The result arrays of the load combinations of an analysis share their entity ids, so the rows of the entity
+        # ids are only searched again if the entity ids of the result array are different
+        row_index = None
+        for j, load_combination in enumerate(load_combinations):
+            result_array = self.phase_result_array(result_type, load_combination) if phased else \
+                self.result_array(result_type, load_combination)
+            if row_index is None or row_index[0] is not result_array.entity_ids:
+                row_index = (result_array.entity_ids,) + result_array.row_index(entity_ids[is_found])
+            result_rows[is_found, j] = result_array.rows(entity_ids[is_found], size, row_index[1:])
+        return result_rows
+
+    @staticmethod
+    def result_row(result_array, entity_id, size):
+        # Get the result of a node or an element from a result array, zero if the array doesn't have it
+        if result_array is None:
+            return np.zeros(size)
+        return result_array.rows([entity_id], size)[0]
+
+
+class ResultArray:
+    # The results of the nodes or the elements of an analysis: a row of values for every entity id, the entity ids are
+    # sorted such that the rows of many entity ids are found at once
+    __slots__ = ('entity_ids', 'values')
+
+    def __init__(self, entity_ids, values):
+        self.entity_ids = entity_ids
+        self.values = values
+
+    def row_index(self, entity_ids):
+        # Get the row of every entity id and if the array has the entity id
+        entity_ids = np.asarray(entity_ids, dtype=int).ravel()
+        if len(self.entity_ids) == 0:
+            return np.zeros(len(entity_ids), dtype=int), np.zeros(len(entity_ids), dtype=bool)
+        index = np.minimum(np.searchsorted(self.entity_ids, entity_ids), len(self.entity_ids) - 1)
+        return index, self.entity_ids[index] == entity_ids
+
+    def rows(self, entity_ids, size, row_index=None):
+        # Get the rows of the entity ids as a (N, size) array, zero for the entity ids that the array doesn't have
+        index, is_found = self.row_index(entity_ids) if row_index is None else row_index
+        rows = np.zeros((len(index), size))
+        width = min(size, self.values.shape[1])
+        rows[is_found, :width] = self.values[index[is_found], :width]
+        return rows
+
+
+def add_result_arrays(result_array_0, result_array_1):
+    # Add two result arrays, the rows of the entity ids that an array doesn't have and its missing columns are zero
+    if result_array_0 is None or result_array_1 is None:
+        return result_array_1 if result_array_0 is None else result_array_0
+    entity_ids = np.union1d(result_array_0.entity_ids, result_array_1.entity_ids)
+    values = np.zeros((len(entity_ids), max(result_array_0.values.shape[1], result_array_1.values.shape[1])))
+    for result_array in (result_array_0, result_array_1):
+        values[np.searchsorted(entity_ids, result_array.entity_ids), :result_array.values.shape[1]] += \
+            result_array.values
+    return ResultArray(entity_ids, values)
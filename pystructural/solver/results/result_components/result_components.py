@@ -1,6 +1,12 @@
-__all__ = ["ResultComponent"]
+__all__ = ["ResultComponent", "ProfileReportComponent"]
 
 
 class ResultComponent:
     def __init__(self, name):
-        self.name = name
\ No newline at end of file
+        self.name = name
+
+
+class ProfileReportComponent:
+    def __init__(self, profile_report):
+        # A list with a dict for every profiled system run of the analysis
+        self.profile_report = profile_report
@@ -1,7 +1,7 @@
-from pystructural.core.math_ps import *
+import numpy as np
 
 
-__all__ = ['Results', 'LineResults']
+__all__ = ['Results', 'LineResults', 'EnvelopeAccumulator', 'top_k_indices']
 
 
 class Results:
@@ -9,70 +9,133 @@ class Results:
         pass
 
 
+class EnvelopeAccumulator:
+    def __init__(self, top_k=None):
+        # The amount of governing load combinations of every station and dof that are kept, none if only the min and
+        # the max are kept
+        self.top_k = top_k
+        # The positions of the stations, a (S, 2) array
+        self.positions = None
+        # The running min and max values of every station and dof, (S, D) arrays
+        self.min_values = None
+        self.max_values = None
+        # The load combinations that govern the min and the max values of every station and dof, (S, D) arrays
+        self.min_load_combinations = None
+        self.max_load_combinations = None
+        # The top k min and max values, their load combinations and their concurrent values, the values of all the
+        # dofs of the load combination at the station, from the most critical one: tuples of (k, S, D), (k, S, D) and
+        # (k, S, D, D) arrays
+        self.top_k_min = None
+        self.top_k_max = None
+        # The amount of load combinations that are accumulated
+        self.load_combination_count = 0
+
+    def add_values(self, positions, values, load_combinations):
+        # Add a chunk of K load combinations: the (S, 2) positions of the stations, the (K, S, D) values of every load
+        # combination at the stations and the K load combinations, only the envelope of the values is kept
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 2:
+            values = values[np.newaxis]
+        load_combinations = np.asarray(load_combinations).reshape(-1)
+        if len(values) == 0:
+            return
+        # Determine the envelope of the chunk
+        k_min = np.argmin(values, axis=0)
+        k_max = np.argmax(values, axis=0)
+        chunk_min_values = np.take_along_axis(values, k_min[np.newaxis], axis=0)[0]
+        chunk_max_values = np.take_along_axis(values, k_max[np.newaxis], axis=0)[0]
+        # Initialize the envelope with the envelope of the first chunk
+        if self.positions is None:
+            self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+            self.min_values = chunk_min_values
+            self.max_values = chunk_max_values
+            self.min_load_combinations = load_combinations[k_min]
+            self.max_load_combinations = load_combinations[k_max]
+        else:
+            # The load combinations need to have the same stations
+            if chunk_min_values.shape != self.min_values.shape:
+                raise ValueError('The load combinations have {0} stations and dofs instead of {1}.'.
+                                 format(chunk_min_values.shape, self.min_values.shape))
+            # Merge the envelope of the chunk, the first load combination governs if the values are equal
+            is_min = chunk_min_values < self.min_values
+            is_max = chunk_max_values > self.max_values
+            self.min_values = np.where(is_min, chunk_min_values, self.min_values)
+            self.max_values = np.where(is_max, chunk_max_values, self.max_values)
+            self.min_load_combinations = np.where(is_min, load_combinations[k_min], self.min_load_combinations)
+            self.max_load_combinations = np.where(is_max, load_combinations[k_max], self.max_load_combinations)
+        # Merge the chunk into the top k values
+        if self.top_k is not None:
+            self.add_top_k_values(values, load_combinations)
+        self.load_combination_count += len(values)
+
+    def add_top_k_values(self, values, load_combinations):
+        # The candidates of the chunk: every load combination for every station and dof with the values of all the
+        # dofs of the load combination as the concurrent values
+        candidates = (values, np.broadcast_to(load_combinations[:, np.newaxis, np.newaxis], values.shape),
+                      np.broadcast_to(values[:, :, np.newaxis, :], values.shape + values.shape[2:]))
+        for largest in (False, True):
+            top_k = self.top_k_max if largest else self.top_k_min
+            # The top k values that are kept are candidates as well
+            top_k_candidates = candidates if top_k is None else \
+                tuple(np.concatenate((kept, candidate)) for kept, candidate in zip(top_k, candidates))
+            indices = top_k_indices(top_k_candidates[0], self.top_k, largest)
+            top_k = (np.take_along_axis(top_k_candidates[0], indices, axis=0),
+                     np.take_along_axis(top_k_candidates[1], indices, axis=0),
+                     np.take_along_axis(top_k_candidates[2], indices[..., np.newaxis], axis=0))
+            if largest:
+                self.top_k_max = top_k
+            else:
+                self.top_k_min = top_k
+
+    def envelope_generator(self):
+        # Yield the position, the min and the max values and their load combinations of every station
+        if self.positions is None:
+            return
+        for i in range(len(self.positions)):
+            yield self.positions[i], self.min_values[i], self.max_values[i], self.min_load_combinations[i], \
+                self.max_load_combinations[i]
+
+    def top_k_generator(self):
+        # Yield the position and the top k min and max values, their load combinations and their concurrent values of
+        # every station
+        if self.positions is None or self.top_k is None:
+            return
+        for i in range(len(self.positions)):
+            yield self.positions[i], tuple(array[:, i] for array in self.top_k_min), \
+                tuple(array[:, i] for array in self.top_k_max)
+
+
 class LineResults(Results):
-    def __init__(self, line_start, line_end):
+    def __init__(self, line_start, line_end, top_k=None):
         self.line_start = line_start
         self.line_end = line_end
-        # Initialize the variables for the combined line value generator
-        self.is_initialized = False
-        self.combined_line_values = []
-        # line_values_dict{line_id}[line][node_unit, value]
-        self.line_values_dict = {}
-        self.current_line_values_list_id = 0
+        # The envelope of the line values of the load combinations
+        self.envelope = EnvelopeAccumulator(top_k)
         super().__init__()
 
     def add_line_values(self, line_values):
-        self.is_initialized = False
-        self.line_values_dict[self.current_line_values_list_id] = \
-            [[line_to_unit_interval(line[0], self.line_start, self.line_end), line[1], line[2]] for line in line_values]
-        self.current_line_values_list_id += 1
-        return self.current_line_values_list_id - 1
-
-    def initialize_combined_line_value_generator(self):
-        # Delete the current combined line value list and initialize it as a new list
-        del self.combined_line_values
-        self.combined_line_values = []
-        # Initialize the line generator list
-        line_generator_list = {k: 0 for k in self.line_values_dict.keys()}
-
-        # Define the advance line generator list
-        def advance_line_generator_list(k):
-            if line_generator_list[k] + 1 < len(self.line_values_dict[k]):
-                line_generator_list[k] += 1
-                return True
-            else:
-                return False
-
-        # While the lines haven't all ended
-        while True:
-            # Get the minimum value in the unit interval
-            min_unit = min(*[self.line_values_dict[k][v][0] for k, v in line_generator_list.items()])
-
-            # Find all the line points that have this minimum unit interval
-            k_min_dict = {k: v for k, v in line_generator_list.items() if self.line_values_dict[k][v][0] == min_unit}
-            k_min_values = [self.line_values_dict[k][v][1] for k, v in k_min_dict.items()]
-            k_load_combinations = [self.line_values_dict[k][v][2] for k, v in k_min_dict.items()]
-
-            # Yield the unit interval and the values at the interval
-            self.combined_line_values.append([line_embedding(min_unit, self.line_start, self.line_end), k_min_values,
-                                              k_load_combinations])
-
-            # Advance the lines in the k_min_list
-            is_all_none = True
-            for k in k_min_dict:
-                if advance_line_generator_list(k) is True:
-                    is_all_none = False
-
-            # End the while loop if no k has advanced
-            if is_all_none:
-                break
-        # Set the is initialized value to true
-        self.is_initialized = True
-
-    def combined_line_value_generator(self):
-        # If the combined line value generator is not yet initialized
-        if not self.is_initialized:
-            self.initialize_combined_line_value_generator()
-        # Yield every element in the combined line values list
-        for combined_line_value in self.combined_line_values:
-            yield combined_line_value
+        # Add the line values [position, value, load combination] of a load combination to the envelope
+        self.envelope.add_values([line[0] for line in line_values], [[line[1] for line in line_values]],
+                                 [line_values[0][2]])
+        return self.envelope.load_combination_count - 1
+
+    def envelope_generator(self):
+        # Yield every station of the envelope
+        for envelope_value in self.envelope.envelope_generator():
+            yield envelope_value
+
+    def top_k_generator(self):
+        # Yield the top k values of every station of the envelope
+        for top_k_value in self.envelope.top_k_generator():
+            yield top_k_value
+
+
+def top_k_indices(values, k, largest=False):
+    # Return the indices along the first axis of the k smallest or largest values of a (N, ...) array as a (k, ...)
+    # array that is sorted from the smallest or the largest value, the order of equal values is arbitrary
+    keys = -values if largest else values
+    if k < len(keys):
+        # Partition the k smallest keys in front of the others and sort only the k smallest keys
+        indices = np.argpartition(keys, k - 1, axis=0)[:k]
+        return np.take_along_axis(indices, np.argsort(np.take_along_axis(keys, indices, axis=0), axis=0), axis=0)
+    return np.argsort(keys, axis=0)
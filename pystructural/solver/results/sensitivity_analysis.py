@@ -0,0 +1,177 @@
+import numpy as np
+
+from pystructural.solver.components.element import FrameElement2D, line_elements
+from pystructural.solver.components.geometry import Line2D
+from pystructural.solver.systems.analysis.stiffness_systems import solve_reduced_system
+
+__all__ = ['Response', 'DisplacementResponse', 'ReactionResponse', 'ElementEndForceResponse',
+           'SensitivityAnalysis2D']
+
+
+# The dof ids of the displacement, the force and the rotation indices of the result vectors
+result_dof_ids = {0: 0, 1: 1, 2: 5}
+
+
+class Response:
+    # A response is a linear function of the global displacement vector u of an analysis:
+    # response = adjoint_load_vector . u, where the adjoint load vector can depend on the element stiffness matrices
+    def initialize(self, results):
+        # Find the nodes or the elements of the response in the results
+        pass
+
+    def adjoint_load_vector(self, results):
+        pass
+
+    def explicit_derivatives(self, results, element, stiffness_matrix_derivatives, element_displacement_vectors):
+        # The derivatives of the response to the element properties at constant displacements, a (2, L) array for
+        # the L load combinations, zero if the response doesn't depend on the stiffness matrix of the element
+        return np.zeros((len(stiffness_matrix_derivatives), element_displacement_vectors.shape[1]))
+
+    @staticmethod
+    def get_node(results, coordinate):
+        # Get the node at the coordinate
+        point_tuple = results.structure.search_for_point(coordinate)
+        if point_tuple is None:
+            raise ValueError('There is no node at the coordinate {0}.'.format(list(coordinate)))
+        return point_tuple[0]
+
+
+class DisplacementResponse(Response):
+    def __init__(self, coordinate, dof_index):
+        # The coordinate of the node and the index of the displacement: 0 and 1 for x and y, 2 for the rotation
+        self.coordinate = coordinate
+        self.dof_index = dof_index
+        self.node_id = None
+
+    def initialize(self, results):
+        self.node_id = self.get_node(results, self.coordinate)
+
+    def adjoint_load_vector(self, results):
+        # The response is a single value of the displacement vector
+        node_id = self.node_id
+        adjoint_load_vector = np.zeros(len(results.linear_calculation_component.global_stiffness_matrix))
+        adjoint_load_vector[results.dof_calculation_component.local_to_global_dof_dict[node_id][
+            result_dof_ids[self.dof_index]]] = 1.0
+        return adjoint_load_vector
+
+
+class ReactionResponse(Response):
+    def __init__(self, coordinate, dof_index):
+        # The coordinate of the support node and the index of the reaction: 0 and 1 for x and y, 2 for the moment
+        self.coordinate = coordinate
+        self.dof_index = dof_index
+        self.node_id = None
+
+    def initialize(self, results):
+        self.node_id = self.get_node(results, self.coordinate)
+
+    def adjoint_load_vector(self, results):
+        # The reaction is the sum of the forces of the elements at the node, the row of the global stiffness matrix
+        # without the springs of the node
+        node_id = self.node_id
+        global_id = results.dof_calculation_component.local_to_global_dof_dict[node_id][result_dof_ids[self.dof_index]]
+        adjoint_load_vector = np.array(results.linear_calculation_component.global_stiffness_matrix[global_id])
+        adjoint_load_vector[global_id] -= \
+            results.linear_calculation_component.spring_values.get(node_id, {}).get(global_id, 0.0)
+        return adjoint_load_vector
+
+    def explicit_derivatives(self, results, element, stiffness_matrix_derivatives, element_displacement_vectors):
+        explicit_derivatives = super().explicit_derivatives(results, element, stiffness_matrix_derivatives,
+                                                            element_displacement_vectors)
+        # If the element is connected to the node then its force at the node depends on its stiffness matrix
+        node_id = self.node_id
+        if node_id in element.geometry.point_id_list:
+            i = element.get_node_and_dof_variable_to_stiffness_coordinate(node_id, result_dof_ids[self.dof_index])
+            for k, stiffness_matrix_derivative in enumerate(stiffness_matrix_derivatives):
+                explicit_derivatives[k] = np.matmul(stiffness_matrix_derivative[i], element_displacement_vectors)
+        return explicit_derivatives
+
+
+class ElementEndForceResponse(Response):
+    def __init__(self, coordinate, end, dof_index=2):
+        # The coordinate on the line element, the end of the line element (0 or 1) and the index of the local force:
+        # 0 for the normal force, 1 for the shear force and 2 for the moment
+        self.coordinate = coordinate
+        self.end = end
+        self.dof_index = dof_index
+        self.element = None
+
+    def initialize(self, results):
+        # Get the line element at the coordinate
+        line_tuple = results.structure.search_for_line_element(self.coordinate)
+        if line_tuple is not None:
+            for line_element_class in line_elements:
+                if results.structure.has_component(line_tuple[0], line_element_class):
+                    self.element = results.structure.get_component_from_entity(line_tuple[0], line_element_class)
+                    return
+        raise ValueError('There is no line element at the coordinate {0}.'.format(list(self.coordinate)))
+
+    def adjoint_load_vector(self, results):
+        # The local force is a row of the local stiffness matrix times the element displacement vector
+        element = self.element
+        i = 3 * self.end + self.dof_index
+        row = np.matmul(element.geometry.global_to_local_matrix, element.stiffness_matrix)[i]
+        adjoint_load_vector = np.zeros(len(results.linear_calculation_component.global_stiffness_matrix))
+        for j in range(element.element_dimension):
+            node_id, dof_id = element.get_stiffness_coordinate_to_node_and_dof_variable(j)
+            adjoint_load_vector[results.dof_calculation_component.local_to_global_dof_dict[node_id][dof_id]] += row[j]
+        return adjoint_load_vector
+
+    def explicit_derivatives(self, results, element, stiffness_matrix_derivatives, element_displacement_vectors):
+        explicit_derivatives = super().explicit_derivatives(results, element, stiffness_matrix_derivatives,
+                                                            element_displacement_vectors)
+        # The local force of the element depends on its own stiffness matrix
+        if element is self.element:
+            i = 3 * self.end + self.dof_index
+            for k, stiffness_matrix_derivative in enumerate(stiffness_matrix_derivatives):
+                explicit_derivatives[k] = np.matmul(np.matmul(element.geometry.global_to_local_matrix,
+                                                              stiffness_matrix_derivative)[i],
+                                                    element_displacement_vectors)
+        return explicit_derivatives
+
+
+class SensitivityAnalysis2D:
+    def __init__(self, linear_analysis_results):
+        self.results = linear_analysis_results
+        self.dof_calculation_component = linear_analysis_results.dof_calculation_component
+        self.linear_calculation_component = linear_analysis_results.linear_calculation_component
+        self.displacement_and_load_vectors_component = linear_analysis_results.displacement_and_load_vectors_component
+
+    def element_sensitivities(self, response, load_combinations):
+        # Get the displacement vectors of the load combinations, a (N, L) array
+        displacement_vectors = np.column_stack([self.displacement_and_load_vectors_component.
+                                                displacement_vectors[load_combination]
+                                                for load_combination in load_combinations])
+        # Solve the adjoint system once with the cached factorization, the adjoint displacements don't depend on the
+        # load combination: response = g . u, K u = f -> d response = d g . u - adjoint . dK u with K adjoint = g
+        response.initialize(self.results)
+        adjoint_load_vector = response.adjoint_load_vector(self.results)
+        reduced_to_global = np.array([self.dof_calculation_component.reduced_to_global_dof_dict[i]
+                                      for i in range(len(self.dof_calculation_component.reduced_to_global_dof_dict))],
+                                     dtype=int)
+        adjoint_vector = np.zeros(len(adjoint_load_vector))
+        adjoint_vector[reduced_to_global] = solve_reduced_system(self.linear_calculation_component,
+                                                                 adjoint_load_vector[reduced_to_global])
+
+        # Determine the derivatives of the response to the ea and the ei of every frame element
+        entity_ids = []
+        sensitivities = []
+        for entity, components in self.results.structure.get_components(Line2D, FrameElement2D):
+            element = components[1]
+            # Get the global dof ids of the element
+            global_ids = [self.dof_calculation_component.local_to_global_dof_dict[node_id][dof_id] for
+                          node_id, dof_id in (element.get_stiffness_coordinate_to_node_and_dof_variable(i)
+                                              for i in range(element.element_dimension))]
+            element_displacement_vectors = displacement_vectors[global_ids]
+            stiffness_matrix_derivatives = element.compute_stiffness_matrix_derivatives()
+            # The explicit derivative minus the adjoint term of every element property
+            element_sensitivities = response.explicit_derivatives(self.results, element, stiffness_matrix_derivatives,
+                                                                  element_displacement_vectors)
+            for k, stiffness_matrix_derivative in enumerate(stiffness_matrix_derivatives):
+                element_sensitivities[k] -= np.matmul(adjoint_vector[global_ids],
+                                                      np.matmul(stiffness_matrix_derivative,
+                                                                element_displacement_vectors))
+            entity_ids.append(entity)
+            sensitivities.append(element_sensitivities.T)
+        # Return the entity ids and a (E, L, 2) array with the derivatives to the ea and the ei of every element
+        return entity_ids, np.array(sensitivities).reshape(len(entity_ids), len(load_combinations), 2)
@@ -1,10 +1,11 @@
+import concurrent.futures
 import copy
 
 import catecs
 
 from pystructural.solver.results.result_components.result_components import ResultComponent
 from .geometry_systems import UpdateGeometries
-from .element_systems import UpdateElements
+from .element_systems import element_subclasses_2d, UpdateElements
 from .dof_systems import UpdateDOFs, UpdateReducedDOFs
 from .load_systems import UpdateLoads
 from .stiffness_systems import ExecuteLinearCalculation
@@ -25,7 +26,20 @@ class AnalysisSystem(catecs.System):
 
 
 class LinearAnalysisSystem(AnalysisSystem):
+    def __init__(self, name, load_combinations):
+        # The change level of the structure since the previous process: 'topology' runs the whole analysis, 'stiffness'
+        # and 'load' only run the invalidated stages, None runs no stages
+        self.change_level = 'topology'
+        # The entities that have changed since the previous process, all the entities if None
+        self.dirty_entities = None
+        super().__init__(name, load_combinations)
+
     def process(self):
+        # If the topology of the structure is unchanged then only run the invalidated stages
+        if self.change_level != 'topology':
+            self.process_changes()
+            return
+
         # Check if a linear calculation system category is in self.world then remove it
         if self.world.has_system_category(self.name):
             self.world.remove_system_category(self.name)
@@ -36,8 +50,12 @@ class LinearAnalysisSystem(AnalysisSystem):
         # Add system -> update the elements
         self.world.add_system(UpdateElements(), self.name)
 
+        # The results of a previous phase of which the dofs and the stiffness matrices are reused
+        base_results = getattr(self.world, 'phase_base_results', None)
+
         # Add system -> update the DOFs
-        self.world.add_system(UpdateDOFs(self.result_entity_id), self.name)
+        self.world.add_system(UpdateDOFs(self.result_entity_id, base_results.dof_calculation_component if
+                                         base_results is not None else None), self.name)
 
         # Add system -> update the reduced DOFs
         self.world.add_system(UpdateReducedDOFs(self.result_entity_id), self.name)
@@ -46,32 +64,109 @@ class LinearAnalysisSystem(AnalysisSystem):
         self.world.add_system(UpdateLoads(), self.name)
 
         # Add system -> execute linear calculation (determine reduced stuff and solve the matrix equation)
-        self.world.add_system(ExecuteLinearCalculation(self.result_entity_id, self.load_combinations), self.name)
+        self.world.add_system(ExecuteLinearCalculation(self.result_entity_id, self.load_combinations,
+                                                       base_results=base_results), self.name)
 
         # Process the 'linear calculation' system category
         self.world.process_system_categories(self.name, ordered=True)
 
+    def process_changes(self):
+        # If the stiffness of unknown entities has changed then update all the elements, the dofs are unchanged
+        if self.change_level == 'stiffness' and self.dirty_entities is None:
+            self.world.run_system(UpdateElements())
+        # Update the loads and solve the system, the stiffness matrices are only updated if they have changed, the
+        # changes of known entities are a low rank update of the cached factorization
+        if self.change_level in ('stiffness', 'load'):
+            self.world.run_system(UpdateLoads())
+            self.world.run_system(ExecuteLinearCalculation(self.result_entity_id, self.load_combinations,
+                                                           self.change_level == 'stiffness',
+                                                           self.dirty_entities if self.change_level == 'stiffness'
+                                                           else None))
+
 
 class LinearPhaseAnalysisSystem(AnalysisSystem):
-    def __init__(self, name, load_combinations, phased_analysis):
+    def __init__(self, name, load_combinations, phased_analysis, max_workers=None, delta_assembly=True):
         self.phased_analysis = phased_analysis
+        # The amount of threads that solve the independent phases at the same time
+        self.max_workers = max_workers
+        # If true the stiffness matrix of a phase is determined from the stiffness matrix of its most similar previous
+        # phase and the elements that are added, removed or changed
+        self.delta_assembly = delta_assembly
+        # The linear analysis results of every phase
+        self.linear_analysis_results = {}
         super().__init__(name, load_combinations)
 
     def process(self):
         # List of linear analysis results
         lar_list = {}
-        # For every phase
-        for phase_id in self.phased_analysis.phase_generator():
-            # Get the structure with only the current phase
-            self.world.phase_id_filter = phase_id
-            self.world.phase_id_adder_list = [phase_id]
-            # Solve the linear system for the structure
-            if len(self.phased_analysis.previous_phases) == 0:
-                lar_list[phase_id] = self.world.solve_linear_system(str(self.phased_analysis.phases[phase_id]), False)
-            else:
-                phase_analysis_list = [lar_list[prev_phase] for prev_phase in self.phased_analysis.previous_phases[
-                    phase_id]]
-                lar_list[phase_id] = self.world.solve_linear_system(str(self.phased_analysis.phases[phase_id]), False,
-                                                                    phase_analysis_list)
+        # Get the phases in the order of their dependencies, it checks that the previous phases don't form a cycle
+        waiting_phases = self.phased_analysis.topological_order()
+        # Every phase is solved in its own view of the structure, the views don't change the phase filter of the
+        # structure and they can be solved at the same time
+        views = {}
+
+        def solve_phase(phase_id):
+            # Solve the linear system for the view of the phase with the results of its previous phases
+            phase_analysis_list = [lar_list[prev_phase] for prev_phase in self.phased_analysis.previous_phases[
+                phase_id]]
+            linear_analysis_results = views[phase_id].solve_linear_system(str(self.phased_analysis.phases[phase_id]),
+                                                                          False, phase_analysis_list)
             # Set the current phase analysis id variable in the linear analysis
-            lar_list[phase_id].phase_analysis_id = phase_id
+            linear_analysis_results.phase_analysis_id = phase_id
+            return linear_analysis_results
+
+        # The system profiler can't profile systems at the same time
+        max_workers = 1 if self.world.profiler is not None else self.max_workers
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                running_phases = {}
+                while waiting_phases or running_phases:
+                    # Start the phases of which all the previous phases are solved
+                    for phase_id in [phase_id for phase_id in waiting_phases if
+                                     all(prev_phase in lar_list for prev_phase in
+                                         self.phased_analysis.previous_phases[phase_id])]:
+                        waiting_phases.remove(phase_id)
+                        views[phase_id] = self.world.phase_view(phase_id)
+                        if self.delta_assembly:
+                            views[phase_id].phase_base_results = self.base_phase_results(views[phase_id], phase_id,
+                                                                                         lar_list)
+                        running_phases[executor.submit(solve_phase, phase_id)] = phase_id
+                    # Wait for a phase to be solved
+                    done, _ = concurrent.futures.wait(running_phases, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        lar_list[running_phases.pop(future)] = future.result()
+        finally:
+            # The views are not solved at the same time anymore, remove the lock of the structure
+            self.world.phase_lock = None
+            for view in views.values():
+                view.phase_lock = None
+        self.linear_analysis_results = lar_list
+
+        # The views don't reuse the previous phases anymore
+        for view in views.values():
+            view.phase_base_results = None
+
+        # The structure is left with the phase filter and the post processor of the last phase
+        last_phase_id = list(self.phased_analysis.phase_generator())[-1] if lar_list else None
+        if last_phase_id is not None:
+            self.world.phase_id_filter = last_phase_id
+            self.world.phase_id_adder_list = [last_phase_id]
+            self.world.post_processor = views[last_phase_id].post_processor
+
+    def base_phase_results(self, view, phase_id, lar_list):
+        # Get the elements of the phase
+        entity_ids = set()
+        for element_class in element_subclasses_2d:
+            for entity, components in view.get_components(element_class.compatible_geometry, element_class):
+                entity_ids.add(entity)
+        # Return the results of the previous phase with the least elements that are added or removed, None if the phase
+        # has no previous phases
+        base_results = None
+        minimum_change = None
+        for prev_phase in self.phased_analysis.previous_phases[phase_id]:
+            change = len(entity_ids.symmetric_difference(
+                lar_list[prev_phase].linear_calculation_component.element_stiffness_matrices))
+            if minimum_change is None or change < minimum_change:
+                base_results = lar_list[prev_phase]
+                minimum_change = change
+        return base_results
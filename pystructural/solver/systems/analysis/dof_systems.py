@@ -11,9 +11,12 @@ support_subclasses = [Support]
 
 
 class UpdateDOFs(catecs.System):
-    def __init__(self, result_entity_id):
+    def __init__(self, result_entity_id, base_dof_calculation_component=None):
         self.dof_calculation_component = None
         self.result_entity_id = result_entity_id
+        # The dofs of a previous phase, the dofs that are in both phases are numbered first in the order of the previous
+        # phase such that the matrices of the previous phase can be reused
+        self.base_dof_calculation_component = base_dof_calculation_component
         super().__init__()
 
     def initialize(self):
@@ -26,12 +29,24 @@ class UpdateDOFs(catecs.System):
     def process(self):
         # Set the current DOF id to zero
         current_dof_id = 0
+        # Get the dofs in the order of the previous phase, followed by the other dofs
+        dof_list = []
+        if self.base_dof_calculation_component is None:
+            for entity, component in self.world.get_component(DOF):
+                dof_list.append([entity, component.dof_id_list])
+        else:
+            dof_id_lists = {entity: component.dof_id_list for entity, component in self.world.get_component(DOF)}
+            is_numbered = set()
+            for entity, dof_id in self.base_dof_calculation_component.global_to_local_dof_dict.values():
+                if dof_id in dof_id_lists.get(entity, []):
+                    dof_list.append([entity, [dof_id]])
+                    is_numbered.add((entity, dof_id))
+            for entity, dof_id_list in dof_id_lists.items():
+                dof_list.append([entity, [dof_id for dof_id in dof_id_list if (entity, dof_id) not in is_numbered]])
         # For each DOF instance in the world
-        for entity, component in self.world.get_component(DOF):
+        for entity, dof_id_list in dof_list:
             # dictionary value to a dictionary
-            self.dof_calculation_component.local_to_global_dof_dict[entity] = {}
-            # Get the dof id list
-            dof_id_list = component.dof_id_list
+            self.dof_calculation_component.local_to_global_dof_dict.setdefault(entity, {})
             # Put each id of the list in the dictionary
             for dof_id in dof_id_list:
                 # Put the current_id in the local_to_global_to_local_dof_dict
@@ -40,6 +55,8 @@ class UpdateDOFs(catecs.System):
                 self.dof_calculation_component.global_to_local_dof_dict[current_dof_id] = [entity, dof_id]
                 # Update the current dof id
                 current_dof_id += 1
+        # The item count is the amount of DOFs
+        self.item_count = current_dof_id
 
 
 class UpdateReducedDOFs(catecs.System):
@@ -84,3 +101,5 @@ class UpdateReducedDOFs(catecs.System):
                 self.dof_calculation_component.reduced_to_global_dof_dict[current_dof_id] = global_dof_id
 
                 current_dof_id += 1
+        # The item count is the amount of reduced DOFs
+        self.item_count = current_dof_id
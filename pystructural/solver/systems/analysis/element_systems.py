@@ -1,20 +1,30 @@
 import catecs
 
 from pystructural.solver.components import DOF
-from pystructural.solver.components.element import FrameElement2D, LinearTriangleElement2D
+from pystructural.solver.components.element import FrameElement2D, LinearTriangleElement2D, SuperElement2D
 
 __all__ = ["element_subclasses_2d", "UpdateElements"]
 
 
 # List of all Element subclasses
-element_subclasses_2d = [FrameElement2D, LinearTriangleElement2D]
+element_subclasses_2d = [FrameElement2D, LinearTriangleElement2D, SuperElement2D]
 
 
 class UpdateElements(catecs.System):
+    def __init__(self, entity_ids=None):
+        # The entities of the elements that are updated, all the elements are updated if None
+        self.entity_ids = entity_ids
+        super().__init__()
+
     def process(self):
+        # The item count is the amount of updated elements
+        self.item_count = 0
         # Process all the 2d elements
         for element_class in element_subclasses_2d:
             for entity, components in self.world.get_components(element_class.compatible_geometry, element_class):
+                if self.entity_ids is not None and entity not in self.entity_ids:
+                    continue
+                self.item_count += 1
 
                 # Determine the geometry of the element
                 components[1].geometry = components[0]
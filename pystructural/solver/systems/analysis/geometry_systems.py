@@ -1,20 +1,23 @@
 import numpy as np
 import catecs
 
-from pystructural.solver.components.geometry import Point2D, Line2D, Triangle2D
+from pystructural.solver.components.geometry import Point2D, Line2D, Triangle2D, NodeSet2D
 
 __all__ = ['geometry_subclasses_2d', 'UpdateGeometries']
 
 
 # List of geometries subclasses
-geometry_subclasses_2d = [Point2D, Line2D, Triangle2D]
+geometry_subclasses_2d = [Point2D, Line2D, Triangle2D, NodeSet2D]
 
 
 class UpdateGeometries(catecs.System):
     def process(self):
+        # The item count is the amount of updated geometries
+        self.item_count = 0
         # Process all the 2d geometries subclasses
         for geometry_class in geometry_subclasses_2d:
             for entity, component in self.world.get_component(geometry_class):
+                self.item_count += 1
 
                 # Compute the point lists of the geometries
                 if geometry_class is Point2D:
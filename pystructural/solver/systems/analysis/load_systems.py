@@ -1,20 +1,37 @@
 import catecs
+import numpy as np
 
-from pystructural.solver.components.load import PointLoad2D, QLoad2D, ImposedLoad2D
+from pystructural.solver.components.load import PointLoad2D, QLoad2D, ImposedLoad2D, SuperElementLoad2D
 
 __all__ = ['load_subclasses_2d', 'imposed_load_subclasses_2d', 'UpdateLoads']
 
 
 # List of all the load subclasses
-load_subclasses_2d = [QLoad2D, PointLoad2D, ImposedLoad2D]
+load_subclasses_2d = [QLoad2D, PointLoad2D, ImposedLoad2D, SuperElementLoad2D]
 imposed_load_subclasses_2d = [ImposedLoad2D]
 
 
 class UpdateLoads(catecs.System):
     def process(self):
+        # The item count is the amount of updated loads
+        self.item_count = 0
         # Process all the 2d loads
         for load_class in load_subclasses_2d:
             for entity, components in self.world.get_components(load_class.compatible_geometry, load_class):
+                self.item_count += 1
 
                 # Determine the geometry of the element
                 components[1].geometry = components[0]
+
+        # Determine the consistent nodal loads of the q-loads, the q-loads that share a load distribution are
+        # integrated at once
+        q_load_groups = {}
+        for entity, components in self.world.get_components(QLoad2D.compatible_geometry, QLoad2D):
+            q_load_groups.setdefault(id(components[1].q_load_func), []).append(components[1])
+        for q_loads in q_load_groups.values():
+            nodal_loads = q_loads[0].q_load_func.consistent_loads(
+                np.array([q_load.geometry.point_list[0] for q_load in q_loads]),
+                np.array([q_load.geometry.point_list[1] for q_load in q_loads]),
+                np.array([q_load.geometry.length for q_load in q_loads]))
+            for q_load, q_load_nodal_loads in zip(q_loads, nodal_loads):
+                q_load.nodal_loads = q_load_nodal_loads
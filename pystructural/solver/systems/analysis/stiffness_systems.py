@@ -3,26 +3,44 @@ import catecs
 
 import copy
 
+from pystructural.core import math_ps
+from pystructural.pre_processor.components import LineElementSortComponent
 from pystructural.solver.components.calculation_components import *
 from pystructural.solver.components.connection import Spring
-from pystructural.solver.systems.analysis.element_systems import element_subclasses_2d
+from pystructural.solver.components.support import Support
+from pystructural.solver.systems.analysis.element_systems import element_subclasses_2d, UpdateElements
 from pystructural.solver.systems.analysis.load_systems import load_subclasses_2d, imposed_load_subclasses_2d
 
 __all__ = ['ExecuteLinearCalculation',
            'UpdateGlobalAndReducedStiffnessMatrices',
+           'UpdateLowRankStiffness',
+           'UpdatePhaseStiffnessMatrices',
+           'UpdateChainCondensation',
            'UpdateLoadCombinations',
-           'UpdateDisplacementAndLoadVectors']
+           'FactorizeStiffnessMatrix',
+           'UpdateDisplacementAndLoadVectors',
+           'solve_reduced_system']
 
 
 # TODO See Asana entry in the Results section <- the load combinations need to be done inside the data components
 class ExecuteLinearCalculation(catecs.System):
-    def __init__(self, result_entity_id, load_combinations):
+    def __init__(self, result_entity_id, load_combinations, update_stiffness=True, changed_entity_ids=None,
+                 base_results=None):
         self.dof_calculation_component = None
         self.linear_calculation_component = None
         self.reduced_load_vectors_component = None
         self.displacement_and_load_vectors_component = None
+        self.chain_condensation_component = None
         self.result_entity_id = result_entity_id
         self.load_combinations = load_combinations
+        # If false the stiffness matrices and their factorizations of a previous calculation are reused
+        self.update_stiffness = update_stiffness
+        # The entities whose elements or springs have changed since the previous calculation, if given the stiffness
+        # matrices are updated instead of assembled
+        self.changed_entity_ids = changed_entity_ids
+        # The linear analysis results of a previous phase, if given the stiffness matrices are determined from the
+        # stiffness matrices of the previous phase and the changed elements
+        self.base_results = base_results
         super().__init__()
 
     def initialize(self):
@@ -50,19 +68,56 @@ class ExecuteLinearCalculation(catecs.System):
         self.displacement_and_load_vectors_component =\
             self.world.get_component_from_entity(self.result_entity_id, DisplacementAndLoadVectorsComponent)
 
+        # If the chains of line elements are condensed and the result entity doesn't have the chain condensation
+        # component then add it
+        if getattr(self.world, 'condense_chains', False):
+            if not self.world.has_component(self.result_entity_id, ChainCondensationComponent):
+                self.world.add_component(self.result_entity_id, ChainCondensationComponent())
+            self.chain_condensation_component = self.world.get_component_from_entity(self.result_entity_id,
+                                                                                     ChainCondensationComponent)
+
     def process(self):
-        # Run system instance: update global and reduced stiffness matrices
-        self.world.run_system(UpdateGlobalAndReducedStiffnessMatrices(self.dof_calculation_component,
-                                                                      self.linear_calculation_component))
+        # Run system instance: update global and reduced stiffness matrices, with a low rank update of the factorization
+        # if only a few elements or springs have changed
+        if self.update_stiffness and self.base_results is not None:
+            self.world.run_system(UpdatePhaseStiffnessMatrices(self.dof_calculation_component,
+                                                               self.linear_calculation_component,
+                                                               self.base_results.dof_calculation_component,
+                                                               self.base_results.linear_calculation_component,
+                                                               getattr(self.world, 'maximum_update_rank', 32)))
+        elif self.update_stiffness and self.changed_entity_ids is not None and \
+                self.chain_condensation_component is None and \
+                self.linear_calculation_component.factorization is not None:
+            self.world.run_system(UpdateLowRankStiffness(self.dof_calculation_component,
+                                                         self.linear_calculation_component, self.changed_entity_ids,
+                                                         getattr(self.world, 'maximum_update_rank', 32)))
+        elif self.update_stiffness:
+            if self.changed_entity_ids is not None:
+                self.world.run_system(UpdateElements(self.changed_entity_ids))
+            self.world.run_system(UpdateGlobalAndReducedStiffnessMatrices(self.dof_calculation_component,
+                                                                          self.linear_calculation_component))
+        # Run system instance: update chain condensation
+        if self.chain_condensation_component is not None and (self.update_stiffness or
+                                                              self.chain_condensation_component.
+                                                              condensed_stiffness_matrix is None):
+            self.world.run_system(UpdateChainCondensation(self.dof_calculation_component,
+                                                          self.linear_calculation_component,
+                                                          self.chain_condensation_component))
         # Run system instance: update load combinations
         self.world.run_system(UpdateLoadCombinations(self.dof_calculation_component, self.linear_calculation_component,
                                                      self.reduced_load_vectors_component, self.load_combinations))
+        # Run system instance: factorize stiffness matrix
+        self.world.run_system(FactorizeStiffnessMatrix(self.linear_calculation_component,
+                                                       self.chain_condensation_component))
         # Run system instance: update displacement and load vectors
         self.world.run_system(UpdateDisplacementAndLoadVectors(self.dof_calculation_component,
                                                                self.linear_calculation_component,
                                                                self.reduced_load_vectors_component,
                                                                self.displacement_and_load_vectors_component,
-                                                               self.load_combinations))
+                                                               self.load_combinations,
+                                                               self.chain_condensation_component))
+        # The item count is the amount of reduced DOFs
+        self.item_count = len(self.linear_calculation_component.reduced_global_stiffness_matrix)
 
 
 class UpdateGlobalAndReducedStiffnessMatrices(catecs.System):
@@ -77,9 +132,15 @@ class UpdateGlobalAndReducedStiffnessMatrices(catecs.System):
         dim_global_stiffness_matrix = len(self.dof_calculation_component.global_to_local_dof_dict)
         self.linear_calculation_component.global_stiffness_matrix = \
             np.zeros([dim_global_stiffness_matrix, dim_global_stiffness_matrix])
+        # The item count is the amount of assembled elements
+        self.item_count = 0
         # Process all the 2d elements and put its local stiffness matrices in the global stiffness matrix
+        self.linear_calculation_component.element_stiffness_matrices = {}
         for element_class in element_subclasses_2d:
             for entity, components in self.world.get_components(element_class.compatible_geometry, element_class):
+                self.item_count += 1
+                self.linear_calculation_component.element_stiffness_matrices[entity] = \
+                    [components[1], components[1].stiffness_matrix]
                 # For each dof in the element
                 for data in components[1].stiffness_matrix_dof_generator():
                     i = self.dof_calculation_component.local_to_global_dof_dict[data[0][0][0]][data[0][0][1]]
@@ -87,12 +148,14 @@ class UpdateGlobalAndReducedStiffnessMatrices(catecs.System):
                     self.linear_calculation_component.global_stiffness_matrix[i][j] += data[1]
 
         # Add the connection springs to the global stiffness matrix
+        self.linear_calculation_component.spring_values = {}
         for entity, component in self.world.get_component(Spring):
-            for dof, spring_value in component.spring_dof_generator():
-                if entity in self.dof_calculation_component.local_to_global_dof_dict:
-                    if dof in self.dof_calculation_component.local_to_global_dof_dict[entity]:
-                        global_id = self.dof_calculation_component.local_to_global_dof_dict[entity][dof]
-                        self.linear_calculation_component.global_stiffness_matrix[global_id][global_id] += spring_value
+            for global_id, spring_value in spring_value_generator(self.world, self.dof_calculation_component, entity,
+                                                                  [component]):
+                self.linear_calculation_component.global_stiffness_matrix[global_id][global_id] += spring_value
+                # Keep the spring values such that a change of a spring can be determined
+                spring_values = self.linear_calculation_component.spring_values.setdefault(entity, {})
+                spring_values[global_id] = spring_values.get(global_id, 0.0) + spring_value
 
         # Determine the reduced global stiffness matrix
         # Initialize the reduced global stiffness matrix as a copy of the global stiffness matrix
@@ -110,6 +173,335 @@ class UpdateGlobalAndReducedStiffnessMatrices(catecs.System):
             np.delete(self.linear_calculation_component.reduced_global_stiffness_matrix, remove_id_list, 0)
         self.linear_calculation_component.reduced_global_stiffness_matrix = \
             np.delete(self.linear_calculation_component.reduced_global_stiffness_matrix, remove_id_list, 1)
+        # The reduced global stiffness matrix has changed, it is factorized again when it is solved
+        self.linear_calculation_component.factorization = None
+        self.linear_calculation_component.low_rank_update = None
+
+
+def spring_value_generator(world, dof_calculation_component, entity, springs):
+    # Yield the global dof id and the spring value of every dof of the springs of the entity
+    for component in springs:
+        for dof, spring_value in component.spring_dof_generator():
+            if entity in dof_calculation_component.local_to_global_dof_dict:
+                if dof in dof_calculation_component.local_to_global_dof_dict[entity]:
+                    yield dof_calculation_component.local_to_global_dof_dict[entity][dof], spring_value
+
+
+def solve_reduced_system(linear_calculation_component, reduced_load_vector):
+    # Solve the system with the cached factorization of the reduced global stiffness matrix
+    linear_calculation = linear_calculation_component
+    if linear_calculation.factorization is None:
+        linear_calculation.factorization = math_ps.factorize(linear_calculation.reduced_global_stiffness_matrix)
+        linear_calculation.low_rank_update = None
+    reduced_displacement_vector = math_ps.solve_factorized(linear_calculation.factorization, reduced_load_vector)
+    # Correct the solution for the low rank update of the factorized matrix with the Woodbury identity
+    if linear_calculation.low_rank_update is not None:
+        dof_list, update_matrix, z, capacitance_factorization = linear_calculation.low_rank_update
+        reduced_displacement_vector = reduced_displacement_vector - np.matmul(z, math_ps.solve_factorized(
+            capacitance_factorization, np.matmul(update_matrix, reduced_displacement_vector[dof_list])))
+    # Return the reduced displacement vector
+    return reduced_displacement_vector
+
+
+class UpdateLowRankStiffness(catecs.System):
+    def __init__(self, dof_calculation_component, linear_calculation_component, entity_ids, maximum_rank):
+        self.dof_calculation_component = dof_calculation_component
+        self.linear_calculation_component = linear_calculation_component
+        # The entities whose elements or springs have changed
+        self.entity_ids = entity_ids
+        # The maximum rank of the accumulated update, if it is higher the reduced global stiffness matrix is factorized
+        self.maximum_rank = maximum_rank
+        super().__init__()
+
+    def element_generator(self):
+        # Yield the elements of the changed entities
+        for entity in self.entity_ids:
+            for element_class in element_subclasses_2d:
+                if self.world.has_component(entity, element_class):
+                    yield self.world.get_component_from_entity(entity, element_class)
+
+    def add_element_stiffness(self, stiffness_change, sign):
+        # Add the stiffness matrices of the elements of the changed entities to the stiffness change
+        for element in self.element_generator():
+            for data in element.stiffness_matrix_dof_generator():
+                i = self.dof_calculation_component.local_to_global_dof_dict[data[0][0][0]][data[0][0][1]]
+                j = self.dof_calculation_component.local_to_global_dof_dict[data[0][1][0]][data[0][1][1]]
+                stiffness_change[(i, j)] = stiffness_change.get((i, j), 0.0) + sign * data[1]
+
+    def process(self):
+        linear_calculation = self.linear_calculation_component
+        # Determine the change of the global stiffness matrix: subtract the old stiffness matrices of the changed
+        # elements, compute the elements again and add their new stiffness matrices
+        stiffness_change = {}
+        self.add_element_stiffness(stiffness_change, -1.0)
+        self.world.run_system(UpdateElements(self.entity_ids))
+        self.add_element_stiffness(stiffness_change, 1.0)
+        for element in self.element_generator():
+            linear_calculation.element_stiffness_matrices[element.entity_id] = [element, element.stiffness_matrix]
+        # Add the change of the springs of the changed entities
+        for entity in self.entity_ids:
+            components = self.world.get_all_component_types_from_entity(entity, Spring)
+            spring_values = {}
+            for global_id, spring_value in spring_value_generator(self.world, self.dof_calculation_component, entity,
+                                                                  components[0] if components is not None else []):
+                spring_values[global_id] = spring_values.get(global_id, 0.0) + spring_value
+            old_spring_values = linear_calculation.spring_values.get(entity, {})
+            for global_id in set(spring_values) | set(old_spring_values):
+                stiffness_change[(global_id, global_id)] = stiffness_change.get((global_id, global_id), 0.0) + \
+                    spring_values.get(global_id, 0.0) - old_spring_values.get(global_id, 0.0)
+            linear_calculation.spring_values[entity] = spring_values
+
+        # Update the global and the reduced global stiffness matrix and determine the change of the reduced dofs
+        reduced_change = {}
+        for (i, j), value in stiffness_change.items():
+            if value == 0.0:
+                continue
+            linear_calculation.global_stiffness_matrix[i][j] += value
+            if i in self.dof_calculation_component.global_to_reduced_dof_dict and \
+                    j in self.dof_calculation_component.global_to_reduced_dof_dict:
+                r_i = self.dof_calculation_component.global_to_reduced_dof_dict[i]
+                r_j = self.dof_calculation_component.global_to_reduced_dof_dict[j]
+                linear_calculation.reduced_global_stiffness_matrix[r_i][r_j] += value
+                reduced_change[(r_i, r_j)] = value
+
+        # Add the change to the accumulated update of the factorization
+        self.item_count = add_low_rank_update(linear_calculation, reduced_change, self.maximum_rank)
+
+
+def add_low_rank_update(linear_calculation_component, reduced_change, maximum_rank):
+    # Add a change of the reduced global stiffness matrix, a dict with the change of every changed (row, column), to the
+    # accumulated low rank update of the factorization and return the rank of the accumulated update
+    linear_calculation = linear_calculation_component
+    # The dofs of the previous updates come first
+    n = len(linear_calculation.reduced_global_stiffness_matrix)
+    if linear_calculation.low_rank_update is None:
+        dof_list, update_matrix, z = [], np.zeros((0, 0)), np.zeros((n, 0))
+    else:
+        dof_list = list(linear_calculation.low_rank_update[0])
+        update_matrix, z = linear_calculation.low_rank_update[1:3]
+    new_dof_list = sorted(set(r_i for key in reduced_change for r_i in key) - set(dof_list))
+    dof_list += new_dof_list
+    # If the rank is too high then the reduced global stiffness matrix is factorized again when it is solved
+    if len(dof_list) > min(maximum_rank, n // 4):
+        linear_calculation.factorization = None
+        linear_calculation.low_rank_update = None
+        return len(dof_list)
+    position = {r_i: k for k, r_i in enumerate(dof_list)}
+    update_matrix = np.pad(update_matrix, (0, len(new_dof_list)))
+    for (r_i, r_j), value in reduced_change.items():
+        update_matrix[position[r_i], position[r_j]] += value
+    # Solve the factorized matrix for the unit vectors of the new dofs
+    unit_vectors = np.zeros((len(z), len(new_dof_list)))
+    unit_vectors[new_dof_list, np.arange(len(new_dof_list))] = 1.0
+    z = np.concatenate((z, math_ps.solve_factorized(linear_calculation.factorization, unit_vectors)), axis=1)
+    # Factorize the capacitance matrix of the Woodbury identity
+    capacitance_matrix = np.identity(len(dof_list)) + np.matmul(update_matrix, z[dof_list, :])
+    linear_calculation.low_rank_update = [np.array(dof_list, dtype=int), update_matrix, z,
+                                          math_ps.factorize(capacitance_matrix)]
+    return len(dof_list)
+
+
+class UpdatePhaseStiffnessMatrices(catecs.System):
+    def __init__(self, dof_calculation_component, linear_calculation_component, base_dof_calculation_component,
+                 base_linear_calculation_component, maximum_rank):
+        self.dof_calculation_component = dof_calculation_component
+        self.linear_calculation_component = linear_calculation_component
+        # The dofs and the stiffness matrices of the previous phase
+        self.base_dof_calculation_component = base_dof_calculation_component
+        self.base_linear_calculation_component = base_linear_calculation_component
+        # The maximum rank of the change of the reduced global stiffness matrix for which the factorization of the
+        # previous phase is reused
+        self.maximum_rank = maximum_rank
+        # The global dof ids of the changed elements and springs
+        self.changed_global_ids = set()
+        super().__init__()
+
+    def add_element_stiffness(self, element, stiffness_matrix, sign):
+        # Add the stiffness matrix of the element to the global stiffness matrix, the dofs that are not in this phase
+        # are skipped
+        local_to_global_dof_dict = self.dof_calculation_component.local_to_global_dof_dict
+        global_ids = []
+        for i in range(len(stiffness_matrix)):
+            node_id, dof_id = element.get_stiffness_coordinate_to_node_and_dof_variable(i)
+            global_ids.append(local_to_global_dof_dict.get(node_id, {}).get(dof_id, -1))
+        global_ids = np.array(global_ids, dtype=int)
+        is_in_phase = global_ids >= 0
+        self.changed_global_ids.update(global_ids[is_in_phase].tolist())
+        self.linear_calculation_component.global_stiffness_matrix[np.ix_(global_ids[is_in_phase],
+                                                                         global_ids[is_in_phase])] += \
+            sign * stiffness_matrix[np.ix_(is_in_phase, is_in_phase)]
+
+    def process(self):
+        linear_calculation = self.linear_calculation_component
+        base_linear_calculation = self.base_linear_calculation_component
+        local_to_global_dof_dict = self.dof_calculation_component.local_to_global_dof_dict
+        base_global_to_local_dof_dict = self.base_dof_calculation_component.global_to_local_dof_dict
+        # Copy the global stiffness matrix of the previous phase at the dofs that are in both phases
+        base_ids = []
+        global_ids = []
+        for base_id, (node_id, dof_id) in base_global_to_local_dof_dict.items():
+            global_id = local_to_global_dof_dict.get(node_id, {}).get(dof_id)
+            if global_id is not None:
+                base_ids.append(base_id)
+                global_ids.append(global_id)
+        n = len(self.dof_calculation_component.global_to_local_dof_dict)
+        linear_calculation.global_stiffness_matrix = np.zeros([n, n])
+        linear_calculation.global_stiffness_matrix[np.ix_(global_ids, global_ids)] = \
+            base_linear_calculation.global_stiffness_matrix[np.ix_(base_ids, base_ids)]
+
+        # Get the elements of this phase
+        linear_calculation.element_stiffness_matrices = {}
+        for element_class in element_subclasses_2d:
+            for entity, components in self.world.get_components(element_class.compatible_geometry, element_class):
+                linear_calculation.element_stiffness_matrices[entity] = [components[1],
+                                                                         components[1].stiffness_matrix]
+        # The item count is the amount of removed, added and changed elements
+        self.item_count = 0
+        # Subtract the elements of the previous phase that are removed or changed
+        for entity, (element, stiffness_matrix) in base_linear_calculation.element_stiffness_matrices.items():
+            element_stiffness = linear_calculation.element_stiffness_matrices.get(entity)
+            if element_stiffness is None or not np.array_equal(element_stiffness[1], stiffness_matrix):
+                self.item_count += 1
+                self.add_element_stiffness(element, stiffness_matrix, -1.0)
+        # Add the elements of this phase that are added or changed
+        for entity, (element, stiffness_matrix) in linear_calculation.element_stiffness_matrices.items():
+            base_element_stiffness = base_linear_calculation.element_stiffness_matrices.get(entity)
+            if base_element_stiffness is None or not np.array_equal(base_element_stiffness[1], stiffness_matrix):
+                self.item_count += 1
+                self.add_element_stiffness(element, stiffness_matrix, 1.0)
+
+        # Subtract the springs of the previous phase at the dofs that are in both phases and add the springs of this
+        # phase
+        for entity, spring_values in base_linear_calculation.spring_values.items():
+            for base_id, spring_value in spring_values.items():
+                node_id, dof_id = base_global_to_local_dof_dict[base_id]
+                global_id = local_to_global_dof_dict.get(node_id, {}).get(dof_id)
+                if global_id is not None:
+                    linear_calculation.global_stiffness_matrix[global_id][global_id] -= spring_value
+                    self.changed_global_ids.add(global_id)
+        linear_calculation.spring_values = {}
+        for entity, component in self.world.get_component(Spring):
+            for global_id, spring_value in spring_value_generator(self.world, self.dof_calculation_component, entity,
+                                                                  [component]):
+                linear_calculation.global_stiffness_matrix[global_id][global_id] += spring_value
+                self.changed_global_ids.add(global_id)
+                spring_values = linear_calculation.spring_values.setdefault(entity, {})
+                spring_values[global_id] = spring_values.get(global_id, 0.0) + spring_value
+
+        # Determine the reduced global stiffness matrix
+        reduced_to_global_dof_dict = self.dof_calculation_component.reduced_to_global_dof_dict
+        reduced_ids = [reduced_to_global_dof_dict[i] for i in range(len(reduced_to_global_dof_dict))]
+        linear_calculation.reduced_global_stiffness_matrix = \
+            linear_calculation.global_stiffness_matrix[np.ix_(reduced_ids, reduced_ids)]
+        linear_calculation.factorization = None
+        linear_calculation.low_rank_update = None
+
+        # If the reduced dofs of both phases are the same then the factorization of the previous phase is reused with a
+        # low rank update of the change of the reduced global stiffness matrix
+        base_reduced_to_global_dof_dict = self.base_dof_calculation_component.reduced_to_global_dof_dict
+        if base_linear_calculation.factorization is None or \
+                len(base_reduced_to_global_dof_dict) != len(reduced_ids):
+            return
+        for i, global_id in enumerate(reduced_ids):
+            if base_global_to_local_dof_dict[base_reduced_to_global_dof_dict[i]] != \
+                    self.dof_calculation_component.global_to_local_dof_dict[global_id]:
+                return
+        # The reduced global stiffness matrix only changes at the dofs of the changed elements and springs. The largest
+        # entry of a stiffness matrix is on its diagonal
+        global_to_reduced_dof_dict = self.dof_calculation_component.global_to_reduced_dof_dict
+        changed_ids = np.array(sorted(global_to_reduced_dof_dict[global_id] for global_id in self.changed_global_ids
+                                      if global_id in global_to_reduced_dof_dict), dtype=int)
+        change = linear_calculation.reduced_global_stiffness_matrix[np.ix_(changed_ids, changed_ids)] - \
+            base_linear_calculation.reduced_global_stiffness_matrix[np.ix_(changed_ids, changed_ids)]
+        rows, columns = np.nonzero(np.abs(change) > 1e-14 * np.abs(
+            np.diag(linear_calculation.reduced_global_stiffness_matrix)).max(initial=0.0))
+        linear_calculation.factorization = base_linear_calculation.factorization
+        linear_calculation.low_rank_update = base_linear_calculation.low_rank_update
+        add_low_rank_update(linear_calculation, {(changed_ids[r_i], changed_ids[r_j]): change[r_i, r_j]
+                                                 for r_i, r_j in zip(rows, columns)}, self.maximum_rank)
+
+
+class UpdateChainCondensation(catecs.System):
+    def __init__(self, dof_calculation_component, linear_calculation_component, chain_condensation_component):
+        self.dof_calculation_component = dof_calculation_component
+        self.linear_calculation_component = linear_calculation_component
+        self.chain_condensation_component = chain_condensation_component
+        super().__init__()
+
+    def node_reduced_dof_list(self, node_id):
+        # Get the reduced dof ids of the node
+        reduced_dof_list = []
+        for global_id in self.dof_calculation_component.local_to_global_dof_dict.get(node_id, {}).values():
+            if global_id in self.dof_calculation_component.global_to_reduced_dof_dict:
+                reduced_dof_list.append(self.dof_calculation_component.global_to_reduced_dof_dict[global_id])
+        return reduced_dof_list
+
+    def chain_generator(self):
+        # Count the elements of every class of every node, nodes with more than two elements are branching nodes. The
+        # nodes inside a group of line elements have two line elements, so a node with two elements has no other
+        # elements, such as triangle elements or super elements, that couple its dofs to dofs outside the chain
+        element_count = {}
+        for element_class in element_subclasses_2d:
+            for entity, components in self.world.get_components(element_class.compatible_geometry, element_class):
+                for point_id in components[0].point_id_list:
+                    element_count[point_id] = element_count.get(point_id, 0) + 1
+
+        # Define the interior nodes: nodes with two line elements and no other elements, without a support and without
+        # a spring
+        def is_interior_node(node_id):
+            return element_count.get(node_id, 0) == 2 and not self.world.has_component(node_id, Support) and \
+                not self.world.has_component(node_id, Spring)
+
+        # For every sorted group of line elements
+        line_element_sort = self.world.get_component_from_entity(self.world.general_entity_id,
+                                                                 LineElementSortComponent)
+        for group_id in line_element_sort.group_id_generator(self.world.phase_id_filter):
+            # Get the nodes of the group in order, every line element has two consecutive node tuples
+            node_tuples = list(line_element_sort.line_element_id_generator(group_id))
+            node_ids = [node_tuple[1] for node_tuple in node_tuples[0::2]] + [node_tuples[-1][1]]
+            # Yield every run of interior nodes with the nodes at its ends, the ends of the group are always ends
+            chain = [node_ids[0]]
+            for i, node_id in enumerate(node_ids[1:]):
+                chain.append(node_id)
+                if i == len(node_ids) - 2 or not is_interior_node(node_id):
+                    if len(chain) > 2:
+                        yield chain[0], chain[1:-1], chain[-1]
+                    chain = [node_id]
+
+    def process(self):
+        # Get the reduced global stiffness matrix
+        k = self.linear_calculation_component.reduced_global_stiffness_matrix
+        # Determine the interior dofs and the end dofs of every chain
+        chains = []
+        is_retained = np.ones(len(k), dtype=bool)
+        for start_node_id, interior_node_ids, end_node_id in self.chain_generator():
+            interior = np.array([i for node_id in interior_node_ids for i in self.node_reduced_dof_list(node_id)],
+                                dtype=int)
+            ends = np.array(self.node_reduced_dof_list(start_node_id) + self.node_reduced_dof_list(end_node_id),
+                            dtype=int)
+            if len(interior) > 0:
+                chains.append([interior, ends])
+                is_retained[interior] = False
+        # The item count is the amount of condensed dofs
+        self.item_count = int(len(k) - np.count_nonzero(is_retained))
+        # Determine the position of every retained dof in the condensed stiffness matrix
+        retained_dof_list = np.flatnonzero(is_retained)
+        retained_position = np.full(len(k), -1, dtype=int)
+        retained_position[retained_dof_list] = np.arange(len(retained_dof_list))
+        # Condense every chain into the stiffness matrix of the retained dofs with the Schur complement
+        condensed_stiffness_matrix = k[np.ix_(retained_dof_list, retained_dof_list)]
+        self.chain_condensation_component.chains = []
+        for interior, ends in chains:
+            interior_factorization = math_ps.factorize(k[np.ix_(interior, interior)])
+            interior_to_end = k[np.ix_(interior, ends)]
+            end_positions = retained_position[ends]
+            condensed_stiffness_matrix[np.ix_(end_positions, end_positions)] -= \
+                np.matmul(interior_to_end.T, math_ps.solve_factorized(interior_factorization, interior_to_end))
+            self.chain_condensation_component.chains.append([interior, ends, end_positions, interior_factorization,
+                                                             interior_to_end])
+        self.chain_condensation_component.retained_dof_list = retained_dof_list
+        self.chain_condensation_component.condensed_stiffness_matrix = condensed_stiffness_matrix
+        self.chain_condensation_component.factorization = None
 
 
 class UpdateLoadCombinations(catecs.System):
@@ -122,14 +514,15 @@ class UpdateLoadCombinations(catecs.System):
         super().__init__()
 
     def process(self):
+        # The item count is the amount of load combinations
+        self.item_count = len(self.load_combinations)
         # TODO Change how this works based on forces that act where supports are and other edge cases that are not covered.
         # TODO Such one edge case is if a dof load is applied where the dof is not in the reduced vector.
-        # Determine the reduced load vector
-        # Initialize the reduced load vectors
-        for load_combination_id in self.load_combinations:
-            self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id] = \
-                np.zeros([len(self.linear_calculation_component.reduced_global_stiffness_matrix)])
-        # Process all the 2d loads and put them into the reduced load vector
+        # Determine the reduced load vector of every load case
+        load_combinations_component = self.world.load_combinations_component
+        reduced_load_case_vectors = np.zeros([len(self.linear_calculation_component.reduced_global_stiffness_matrix),
+                                              load_combinations_component.factor_matrix.shape[1]])
+        # Process all the 2d loads and put them into the reduced load vector of their load case
         for load_class in load_subclasses_2d:
             for entity, components in self.world.get_components(load_class.compatible_geometry, load_class):
                 # For each dof in the load
@@ -138,38 +531,129 @@ class UpdateLoadCombinations(catecs.System):
                     # If the load is in the reduced load vector then add it
                     if i in self.dof_calculation_component.global_to_reduced_dof_dict:
                         r_i = self.dof_calculation_component.global_to_reduced_dof_dict[i]
-                        # Add the load to the correct load combinations and use the correct factors
-                        for load_combination_id, factor in self.world.load_combinations_component.load_case_generator(
-                                components[1].load_case_id):
-                            if load_combination_id not in self.reduced_load_vectors_component.reduced_load_vectors:
-                                self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id] =\
-                                    np.zeros([len(self.linear_calculation_component.reduced_global_stiffness_matrix)])
-                            self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id][r_i] +=\
-                                factor * data[1]
+                        reduced_load_case_vectors[r_i, components[1].load_case_id] += data[1]
+        self.reduced_load_vectors_component.reduced_load_case_vectors = reduced_load_case_vectors
+        # Combine the reduced load vectors of the load cases with the factor matrix of the load combinations
+        if self.load_combinations:
+            reduced_load_vectors = load_combinations_component.load_combination_factors(self.load_combinations).dot(
+                reduced_load_case_vectors.T)
+            for k, load_combination_id in enumerate(self.load_combinations):
+                self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id] = \
+                    reduced_load_vectors[k]
+
+
+class FactorizeStiffnessMatrix(catecs.System):
+    def __init__(self, linear_calculation_component, chain_condensation_component=None):
+        self.linear_calculation_component = linear_calculation_component
+        self.chain_condensation_component = chain_condensation_component
+        super().__init__()
+
+    def process(self):
+        # The item count is the amount of rows of the factorized matrix, zero if the cached factorization is reused
+        self.item_count = 0
+        # Factorize the condensed stiffness matrix if the chains are condensed, else the reduced global stiffness matrix
+        if self.chain_condensation_component is not None:
+            if self.chain_condensation_component.factorization is None:
+                self.chain_condensation_component.factorization = \
+                    math_ps.factorize(self.chain_condensation_component.condensed_stiffness_matrix)
+                self.item_count = len(self.chain_condensation_component.condensed_stiffness_matrix)
+        elif self.linear_calculation_component.factorization is None:
+            self.linear_calculation_component.factorization = \
+                math_ps.factorize(self.linear_calculation_component.reduced_global_stiffness_matrix)
+            self.linear_calculation_component.low_rank_update = None
+            self.item_count = len(self.linear_calculation_component.reduced_global_stiffness_matrix)
 
 
 class UpdateDisplacementAndLoadVectors(catecs.System):
     def __init__(self, dof_calculation_component, linear_calculation_component, reduced_load_vectors_component,
-                 displacement_and_load_vectors_component, load_combinations):
+                 displacement_and_load_vectors_component, load_combinations, chain_condensation_component=None):
         self.dof_calculation_component = dof_calculation_component
         self.linear_calculation_component = linear_calculation_component
         self.reduced_load_vectors_component = reduced_load_vectors_component
         self.displacement_and_load_vectors_component = displacement_and_load_vectors_component
         self.load_combinations = load_combinations
+        self.chain_condensation_component = chain_condensation_component
+        self.reduced_to_global_dof_ids = None
+        self.other_global_dof_ids = None
         super().__init__()
 
     def process(self):
-        if isinstance(self.load_combinations, list):
-            for load_combination_id in self.load_combinations:
-                self.solve_system_for_load_case(load_combination_id)
-        else:
-            self.solve_system_for_load_case(self.load_combinations)
-
-    def solve_system_for_load_case(self, load_combination_id):
-        # Compute the reduced displacement vector
-        self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id] = \
-            np.linalg.solve(self.linear_calculation_component.reduced_global_stiffness_matrix,
-                            self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id])
+        # The item count is the amount of solved load combinations
+        load_combinations = self.load_combinations if isinstance(self.load_combinations, list) else \
+            [self.load_combinations]
+        self.item_count = len(load_combinations)
+        # The global dof id of every reduced dof id
+        reduced_to_global_dof_dict = self.dof_calculation_component.reduced_to_global_dof_dict
+        self.reduced_to_global_dof_ids = np.array([reduced_to_global_dof_dict[i] for i in
+                                                   range(len(reduced_to_global_dof_dict))], dtype=int)
+        # The global dof ids that are not in the reduced dofs
+        self.other_global_dof_ids = np.setdiff1d(np.arange(len(self.linear_calculation_component.
+                                                               global_stiffness_matrix)),
+                                                 self.reduced_to_global_dof_ids)
+        # The factors of the load cases of the load combinations
+        load_combinations_component = self.world.load_combinations_component
+        factor_matrix = load_combinations_component.load_combination_factors(load_combinations)
+        # Solve the system for all the load combinations at once with the cached factorization
+        if self.chain_condensation_component is None and load_combinations:
+            reduced_load_case_vectors = self.reduced_load_vectors_component.reduced_load_case_vectors
+            if reduced_load_case_vectors is not None and 0 < reduced_load_case_vectors.shape[1] < \
+                    len(load_combinations):
+                # If there are less load cases than load combinations then solve the load cases and superpose their
+                # displacements with the factor matrix
+                reduced_displacement_vectors = factor_matrix.dot(
+                    solve_reduced_system(self.linear_calculation_component, reduced_load_case_vectors).T).T
+            else:
+                reduced_displacement_vectors = solve_reduced_system(
+                    self.linear_calculation_component,
+                    np.column_stack([self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id]
+                                     for load_combination_id in load_combinations]))
+            for i, load_combination_id in enumerate(load_combinations):
+                self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id] = \
+                    reduced_displacement_vectors[:, i]
+        # Determine the imposed load vector of every load case
+        imposed_load_case_vectors = np.zeros([len(self.linear_calculation_component.global_stiffness_matrix),
+                                              factor_matrix.shape[1]])
+        # For each imposed load
+        for load_class in imposed_load_subclasses_2d:
+            for entity, components in self.world.get_components(load_class.compatible_geometry, load_class):
+                # For each dof in the load
+                for data in components[1].load_dof_generator():
+                    i = self.dof_calculation_component.local_to_global_dof_dict[data[0][0]][data[0][1]]
+                    imposed_load_case_vectors[i, components[1].load_case_id] += data[1]
+        # Combine the imposed load vectors of the load cases with the factor matrix of the load combinations
+        imposed_load_vectors = factor_matrix.dot(imposed_load_case_vectors.T)
+        for k, load_combination_id in enumerate(load_combinations):
+            self.solve_system_for_load_case(load_combination_id, imposed_load_vectors[k])
+
+    def solve_condensed_system(self, reduced_load_vector):
+        # Condense the load vector of every chain into the load vector of the retained dofs
+        condensation = self.chain_condensation_component
+        condensed_load_vector = reduced_load_vector[condensation.retained_dof_list]
+        for interior, ends, end_positions, interior_factorization, interior_to_end in condensation.chains:
+            condensed_load_vector[end_positions] -= \
+                np.matmul(interior_to_end.T, math_ps.solve_factorized(interior_factorization,
+                                                                      reduced_load_vector[interior]))
+        # Solve the condensed system with the cached factorization of the condensed stiffness matrix
+        if condensation.factorization is None:
+            condensation.factorization = math_ps.factorize(condensation.condensed_stiffness_matrix)
+        reduced_displacement_vector = np.zeros(len(reduced_load_vector))
+        reduced_displacement_vector[condensation.retained_dof_list] = \
+            math_ps.solve_factorized(condensation.factorization, condensed_load_vector)
+        # Recover the interior displacements of every chain by back substitution
+        for interior, ends, end_positions, interior_factorization, interior_to_end in condensation.chains:
+            reduced_displacement_vector[interior] = math_ps.solve_factorized(
+                interior_factorization,
+                reduced_load_vector[interior] - np.matmul(interior_to_end, reduced_displacement_vector[ends]))
+        # Return the reduced displacement vector
+        return reduced_displacement_vector
+
+    def solve_system_for_load_case(self, load_combination_id, imposed_load_vector=None):
+        # Compute the reduced displacement vector, without the chain condensation it is solved for all the load
+        # combinations at once
+        if self.chain_condensation_component is not None:
+            self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id] = \
+                self.solve_condensed_system(
+                    self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id])
 
         # Determine the displacement vector
         # Initialize the displacement vector
@@ -177,27 +661,20 @@ class UpdateDisplacementAndLoadVectors(catecs.System):
             self.displacement_and_load_vectors_component.displacement_vectors[load_combination_id] = \
                 np.zeros([len(self.linear_calculation_component.global_stiffness_matrix)])
         # Put the values of the reduced displacement vector in the displacement vector
-        for i in range(0, len(self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id])):
-            self.displacement_and_load_vectors_component.displacement_vectors[load_combination_id][
-                self.dof_calculation_component.reduced_to_global_dof_dict[i]] = \
-                self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id][i]
-
-        # Determine the load vector
-        self.displacement_and_load_vectors_component.load_vectors[load_combination_id] = \
-            np.matmul(self.linear_calculation_component.global_stiffness_matrix,
+        self.displacement_and_load_vectors_component.displacement_vectors[load_combination_id][
+            self.reduced_to_global_dof_ids] = \
+            self.displacement_and_load_vectors_component.reduced_displacement_vectors[load_combination_id]
+
+        # Determine the load vector, at the reduced dofs it is the reduced load vector that has been solved and at the
+        # other dofs it is the product of their rows of the global stiffness matrix and the displacement vector
+        load_vector = np.zeros([len(self.linear_calculation_component.global_stiffness_matrix)])
+        load_vector[self.reduced_to_global_dof_ids] = \
+            self.reduced_load_vectors_component.reduced_load_vectors[load_combination_id]
+        load_vector[self.other_global_dof_ids] = \
+            np.matmul(self.linear_calculation_component.global_stiffness_matrix[self.other_global_dof_ids],
                       self.displacement_and_load_vectors_component.displacement_vectors[load_combination_id])
+        self.displacement_and_load_vectors_component.load_vectors[load_combination_id] = load_vector
 
         # Subtract the imposed loads from the load vector
-        # For each imposed load
-        for load_class in imposed_load_subclasses_2d:
-            for entity, components in self.world.get_components(load_class.compatible_geometry, load_class):
-                # For each dof in the load
-                for data in components[1].load_dof_generator():
-                    i = self.dof_calculation_component.local_to_global_dof_dict[data[0][0]][data[0][1]]
-                    if components[1].load_case_id in \
-                            self.world.load_combinations_component.load_combinations[load_combination_id]:
-                        factor = self.world.load_combinations_component.load_combinations[load_combination_id][
-                            components[1].load_case_id]
-                        # Subtract the imposed load from the load vector
-                        self.displacement_and_load_vectors_component.load_vectors[load_combination_id][i] -= \
-                            factor * data[1]
+        if imposed_load_vector is not None:
+            self.displacement_and_load_vectors_component.load_vectors[load_combination_id] -= imposed_load_vector
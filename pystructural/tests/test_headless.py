@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+
+def test_headless_import_and_solve():
+    """Tests that a structure can be imported, built and solved without importing a visualization package.
+    """
+    code = '\n'.join([
+        'import sys',
+        'from pystructural.headless import Structure2D, visualization_modules',
+        'structure = Structure2D()',
+        'structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)',
+        'structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)',
+        'structure.add_support([10.0, 0.0], displacement_y=False)',
+        'structure.add_point_load([5.0, 0.0], [0.0, -1.0, 0.0])',
+        'structure.solve_linear_system()',
+        'print(structure.get_point_displacement_vector([5.0, 0.0])[1])',
+        'print(",".join(m for m in visualization_modules if m in sys.modules))',
+    ])
+    output = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).split('\n')
+    assert abs(float(output[0]) + 1000 / 48) < 1.0e-6
+    assert output[1] == ''
@@ -1,5 +1,100 @@
 import pystructural as ps
 import numpy as np
+import pytest
+
+
+def create_continuous_beam(horizontal_loads=False):
+    """Create a continuous beam of three spans with a point load in the middle of every span, every point load has its
+    own load case.
+
+    :param horizontal_loads: If true the point loads also have a horizontal component.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D()
+    for i in range(3):
+        structure.add_frame_element([5.0 * i, 0.0], [5.0 * (i + 1), 0.0], 1.0, 1.0, 1.0, 1.0)
+        structure.add_point_load([5.0 * i + 2.5, 0.0], [0.5 + i if horizontal_loads else 0.0, -1.0 - i, 0.0], str(i))
+    for i in range(4):
+        structure.add_support([5.0 * i, 0.0], displacement_x=i > 0, displacement_y=False)
+    return structure
+
+
+def create_simply_supported_beam(point_loads=(), springs=(), q_load_func=None, discontinuity_list=None,
+                                 subdivision='uniform'):
+    """Create a simply supported beam of one frame element with a span of 10.
+
+    :param point_loads: A list of (coordinate, point load) tuples.
+    :param springs: A list of the coordinates of the vertical springs.
+    :param q_load_func: The global q-load function of the frame element, if None no q-load is added.
+    :param discontinuity_list: The discontinuities of the q-load function.
+    :param subdivision: The subdivision of the line elements of the structure.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(subdivision=subdivision)
+    frame_id = structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    if q_load_func is not None:
+        structure.add_global_q_load_func(frame_id, q_load_func, discontinuity_list=discontinuity_list)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+    structure.add_support([10.0, 0.0], displacement_y=False)
+    for coordinate, point_load in point_loads:
+        structure.add_point_load(coordinate, point_load)
+    for coordinate in springs:
+        structure.add_spring(coordinate, spring_y=1.0)
+    return structure
+
+
+def create_portal_frame(spring_y, moment_of_inertia):
+    """Create a frame of a beam, a column and a beam that is supported at the free ends of the beams, with a spring
+    and a vertical point load in the middle of the lower beam and a horizontal point load at the top of the column.
+
+    :param spring_y: The value of the vertical spring.
+    :param moment_of_inertia: The moment of inertia of the column.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(subdivision=None)
+    structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_frame_element([10.0, 0.0], [10.0, 4.0], 1.0, 1.0, 1.0, moment_of_inertia)
+    structure.add_frame_element([10.0, 4.0], [0.0, 4.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False, rotation_z=False)
+    structure.add_support([0.0, 4.0], displacement_x=False, displacement_y=False)
+    structure.add_spring([5.0, 0.0], spring_y=spring_y)
+    structure.add_point_load([5.0, 0.0], [0.0, -1.0, 0.0])
+    structure.add_point_load([10.0, 4.0], [1.0, 0.0, 0.0])
+    return structure
+
+
+def create_sway_frame(cross_section_areas, moments_of_inertia):
+    """Create a solved portal frame with a fixed and a pinned support, a vertical point load in the middle of the beam
+    and a horizontal point load at the top of the first column.
+
+    :param cross_section_areas: The cross section areas of the first column, the beam and the second column.
+    :param moments_of_inertia: The moments of inertia of the first column, the beam and the second column.
+    :return: The structure instance.
+    """
+    structure = ps.core.Structure2D(subdivision=None)
+    coordinates = [[0.0, 0.0], [0.0, 4.0], [6.0, 4.0], [6.0, 0.0]]
+    for i in range(3):
+        structure.add_frame_element(coordinates[i], coordinates[i + 1], 1.0, 1.0, cross_section_areas[i],
+                                    moments_of_inertia[i])
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False, rotation_z=False)
+    structure.add_support([6.0, 0.0], displacement_x=False, displacement_y=False)
+    structure.add_point_load([3.0, 4.0], [0.0, -1.0, 0.0])
+    structure.add_point_load([0.0, 4.0], [0.5, 0.0, 0.0])
+    structure.solve_linear_system()
+    return structure
+
+
+def assert_equal_displacements(structure_0, structure_1, coordinates):
+    """Assert that two solved structures have the same displacements at their nodes at the given coordinates.
+
+    :param structure_0: The first structure.
+    :param structure_1: The second structure.
+    :param coordinates: A list of the coordinates of the nodes.
+    """
+    for coordinate in coordinates:
+        displacements = [structure.post_processor.linear_analysis_results.get_node_displacement_vector(
+            structure.search_for_point(coordinate)[1], 0) for structure in (structure_0, structure_1)]
+        assert np.allclose(displacements[0], displacements[1])
 
 
 ######################
@@ -117,6 +212,103 @@ def test_load_combination_result_0():
     assert np.allclose(structure.get_point_displacement_vector([5.0, 0.0], 'lc'), np.array([0.0, -50000 / 384, 0.0]))
 
 
+def test_load_combination_result_1():
+    """Tests that the load combinations that are solved chunk by chunk give the same results as the load combinations
+    that are added to the structure, and that the copies of the load combinations are removed.
+    """
+    generator_arguments = ({'0': 1.35}, [{'1': 1.5}, {'2': 1.5}], [[{'1': 1.5, '2': 0.5}]])
+    load_combinations = list(ps.solver.components.LoadCombinationsComponent.load_combination_generator(
+        *generator_arguments))
+    assert len(load_combinations) == 4
+    # Add the load combinations to a structure, the copies are not added
+    structure_0 = create_continuous_beam()
+    structure_0.add_load_combinations('lc', *generator_arguments, check_copy=True)
+    assert len(structure_0.load_combinations_component.load_combinations) == 4
+    structure_0.solve_linear_system()
+    # Solve the load combinations chunk by chunk
+    structure = create_continuous_beam()
+    structure.add_load_combination('generic', {'0': 1.0})
+    structure.solve_linear_system()
+    displacement_vector = structure.get_point_displacement_vector([2.5, 0.0], 'generic')
+    chunk_sizes = []
+    for chunk, results in structure.solve_load_combination_chunks(iter(load_combinations), 3):
+        chunk_sizes.append(len(chunk))
+        for load_cases in chunk:
+            load_combination_id = structure.load_combinations_component.load_combination_keys[
+                ps.solver.components.load_combination_key(
+                    {structure.load_combinations_component.load_case_names[load_case]: factor
+                     for load_case, factor in load_cases.items()})]
+            load_combination_id_0 = structure_0.load_combinations_component.load_combination_keys[
+                ps.solver.components.load_combination_key(
+                    {structure_0.load_combinations_component.load_case_names[load_case]: factor
+                     for load_case, factor in load_cases.items()})]
+            assert np.allclose(results.displacement_and_load_vectors_component.displacement_vectors[
+                                   load_combination_id],
+                               structure_0.post_processor.linear_analysis_results.
+                               displacement_and_load_vectors_component.displacement_vectors[load_combination_id_0])
+    assert chunk_sizes == [3, 1]
+    # The load combinations, the results and the analysis of the structure are restored
+    assert list(structure.load_combinations_component.load_combination_names) == ['generic']
+    assert np.allclose(structure.get_point_displacement_vector([2.5, 0.0], 'generic'), displacement_vector)
+    assert 'linear_calculation' in structure.linear_analysis_system_ids
+    assert np.allclose(structure.solve_linear_system().get_node_displacement_vector(
+        structure.search_for_point([2.5, 0.0])[1], 0), displacement_vector)
+
+
+def test_load_combination_result_2():
+    """Tests that the envelope of the line values that is accumulated chunk by chunk is the min and the max of the line
+    values of every load combination.
+    """
+    # Create a continuous beam with a point load in every span
+    structure = create_continuous_beam()
+    structure.add_load_combinations('lc', {'0': 1.35}, [{'1': 1.5}, {'2': 1.5}], [[{'1': 1.5, '2': 0.5}]])
+    results = structure.solve_linear_system()
+    load_combinations = list(structure.load_combinations_component.load_combinations)
+    group_id = next(results.line_element_sort.group_id_generator(None))
+    # The line values of every load combination, a (L, S, 3) array
+    values = np.array([[dof_value for _, dof_value in results.global_dof_generator(group_id, load_combination)]
+                       for load_combination in load_combinations])
+    # Accumulate the envelope in chunks of two load combinations
+    results.calculate_line_result(group_id, chunk_size=2)
+    envelope = results.line_results[group_id].envelope
+    assert envelope.load_combination_count == len(load_combinations)
+    assert np.allclose(envelope.min_values, values.min(axis=0))
+    assert np.allclose(envelope.max_values, values.max(axis=0))
+    assert np.array_equal(envelope.min_load_combinations, np.array(load_combinations)[values.argmin(axis=0)])
+    assert np.array_equal(envelope.max_load_combinations, np.array(load_combinations)[values.argmax(axis=0)])
+
+
+def test_load_combination_result_3():
+    """Tests that the k governing load combinations of every station and dof and their concurrent forces that are
+    accumulated chunk by chunk are the ones of a full sort of the line values of every load combination.
+    """
+    # Create a continuous beam with a point load in every span
+    structure = create_continuous_beam(horizontal_loads=True)
+    structure.add_load_combinations('lc', {'0': 1.35}, [{'1': 1.5}, {'2': 1.5}], [[{'1': 1.5, '2': 0.5}]])
+    results = structure.solve_linear_system()
+    load_combinations = np.array(list(structure.load_combinations_component.load_combinations))
+    group_id = next(results.line_element_sort.group_id_generator(None))
+    # The line values of every load combination, a (L, S, 3) array
+    values = np.array([[dof_value for _, dof_value in results.global_dof_generator(group_id, load_combination)]
+                       for load_combination in load_combinations])
+    # Accumulate the 3 governing load combinations in chunks of two load combinations
+    results.calculate_line_result(group_id, chunk_size=2, top_k=3)
+    for station, (_, top_k_min, top_k_max) in enumerate(results.line_results[group_id].top_k_generator()):
+        for dof in range(3):
+            for top_k, order in ((top_k_min, np.argsort(values[:, station, dof])[:3]),
+                                 (top_k_max, np.argsort(-values[:, station, dof])[:3])):
+                assert np.allclose(top_k[0][:, dof], values[order, station, dof])
+                # The concurrent forces are the forces of the governing load combination
+                for i in range(3):
+                    k = list(load_combinations).index(top_k[1][i, dof])
+                    assert np.allclose(top_k[2][i, dof], values[k, station])
+    # Test the governing load combinations of the moment at the middle support
+    for governing_values, governing_load_combinations, concurrent_forces, _, is_min in \
+            structure.post_processor.governing_load_combinations_generator(2, [[5.0, 0.0]], 2):
+        assert len(governing_values) == 2
+        assert np.allclose(concurrent_forces[:, 2], governing_values)
+
+
 ################################
 # PHASED ANALYSIS RESULT TESTS #
 ################################
@@ -205,3 +397,598 @@ def test_phased_analysis_result_1():
 
     # Test the forces at the middle support in the frames
     assert np.allclose(structure.get_line_force_vector([4.99, 0.0])[3:], np.array([0.0, 5.525, 3.1233]), rtol=1.e-4)
+
+
+def test_phased_analysis_result_2():
+    """Tests that the independent phases of a phased analysis that are solved at the same time give the same results
+    as the phases that are solved one after another.
+    """
+    # Define a structure with two independent phases that are combined in a third phase
+    def create_structure():
+        phase_analysis = ps.solver.PhasedAnalysis()
+        phase_0 = phase_analysis.create_phase('phase_0')
+        phase_1 = phase_analysis.create_phase('phase_1')
+        phase_2 = phase_analysis.create_phase('phase_2')
+        phase_analysis.add_previous_phase(phase_2, phase_0, phase_1)
+        structure = ps.core.Structure2D(0.05)
+        structure.set_phase(phase_0, phase_2)
+        frame_id_0 = structure.add_frame_element([0.0, 0.0], [5.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        structure.set_phase(phase_1, phase_2)
+        frame_id_1 = structure.add_frame_element([5.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        structure.set_phase(phase_0)
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([5.0, 0.0], displacement_y=False)
+        structure.add_global_q_load(frame_id_0, -1.0)
+        structure.set_phase(phase_1)
+        structure.add_support([5.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        structure.add_global_q_load(frame_id_1, -2.0)
+        structure.set_phase(phase_2)
+        structure.add_support([0.0, 0.0], displacement_y=False)
+        structure.add_support([5.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        structure.add_point_load([2.5, 0.0], [0.0, -1.0, 0.0])
+        return structure, phase_analysis
+
+    structure, phase_analysis = create_structure()
+    structure.solve_linear_phase_system(phase_analysis, max_workers=2)
+    structure_0, phase_analysis_0 = create_structure()
+    structure_0.solve_linear_phase_system(phase_analysis_0, max_workers=1)
+    # The structure keeps the phase filter of the last phase and it can be pickled again
+    assert structure.phase_id_filter == 2 and structure.phase_lock is None
+    for coordinate in ([2.5, 0.0], [7.5, 0.0], [4.99, 0.0]):
+        assert np.allclose(structure.get_point_displacement_vector(coordinate),
+                           structure_0.get_point_displacement_vector(coordinate))
+        assert np.allclose(structure.get_line_force_vector(coordinate), structure_0.get_line_force_vector(coordinate))
+
+
+def test_phased_analysis_result_3():
+    """Tests that the stiffness matrices of the phases that are assembled from the changes to a previous phase give the
+    same results as the stiffness matrices that are assembled from scratch.
+    """
+    # Define a structure that is built span by span, the last phase only adds a spring
+    def create_structure():
+        phase_analysis = ps.solver.PhasedAnalysis()
+        phases = [phase_analysis.create_phase('phase_{0}'.format(i)) for i in range(4)]
+        for i in range(1, 4):
+            phase_analysis.add_previous_phase(phases[i], phases[i - 1])
+        structure = ps.core.Structure2D(0.5)
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        for i in range(3):
+            structure.set_phase(*phases[i:])
+            frame_id = structure.add_frame_element([5.0 * i, 0.0], [5.0 * (i + 1), 0.0], 1.0, 1.0, 1.0, 1.0)
+            structure.add_support([5.0 * (i + 1), 0.0], displacement_y=False)
+            structure.set_phase(phases[i])
+            structure.add_global_q_load(frame_id, -1.0 - i)
+        structure.set_phase(phases[3])
+        structure.add_spring([2.5, 0.0], spring_y=3.0)
+        structure.add_point_load([2.5, 0.0], [0.0, -1.0, 0.0])
+        return structure, phase_analysis
+
+    structure, phase_analysis = create_structure()
+    structure.solve_linear_phase_system(phase_analysis, max_workers=1)
+    structure_0, phase_analysis_0 = create_structure()
+    structure_0.solve_linear_phase_system(phase_analysis_0, max_workers=1, delta_assembly=False)
+    # The last phase has the same dofs as its previous phase, so it updates the factorization of the previous phase
+    linear_calculation_component = structure.post_processor.linear_analysis_results.linear_calculation_component
+    assert linear_calculation_component.low_rank_update is not None
+    for coordinate in ([2.5, 0.0], [7.5, 0.0], [12.5, 0.0]):
+        assert np.allclose(structure.get_point_displacement_vector(coordinate),
+                           structure_0.get_point_displacement_vector(coordinate))
+        assert np.allclose(structure.get_line_force_vector(coordinate), structure_0.get_line_force_vector(coordinate))
+
+
+def test_phased_analysis_result_4():
+    """Tests that the phased results of a node and an element are the sum of the results of the phases.
+    """
+    # Create a frame with a support that is added in the second phase
+    phase_analysis = ps.solver.PhasedAnalysis()
+    phase_0 = phase_analysis.create_phase('phase_0')
+    phase_1 = phase_analysis.create_phase('phase_1')
+    phase_analysis.add_previous_phase(phase_1, phase_0)
+    structure = ps.core.Structure2D()
+    structure.set_phase(phase_0, phase_1)
+    frame_id = structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+    structure.add_support([10.0, 0.0], displacement_y=False)
+    structure.set_phase(phase_0)
+    structure.add_point_load([5.0, 0.0], [0.0, -1.0, 0.0])
+    structure.set_phase(phase_1)
+    structure.add_support([5.0, 0.0], displacement_y=False)
+    structure.add_global_q_load(frame_id, -1.0)
+    structure.solve_linear_phase_system(phase_analysis)
+    # Get the results of the phases
+    results_1 = structure.post_processor.linear_analysis_results
+    results_0 = results_1.linear_phase_analysis_results[0][0]
+    load_combination_id = structure.load_combinations_component.load_combination_names['generic_load_combination']
+    point = structure.search_for_point([0.0, 0.0])[1]
+    element = results_1.get_line_element(structure.search_for_line_element([2.5, 0.0])[0])
+    for result_function in ('get_node_displacement_vector', 'get_node_global_force', 'get_support_node_global_force'):
+        assert np.allclose(getattr(results_1, result_function)(point, load_combination_id),
+                           getattr(results_1, result_function)(point, load_combination_id, False) +
+                           getattr(results_0, result_function)(point, load_combination_id, False))
+    for result_function in ('get_element_displacement_vector', 'get_element_global_force_vector'):
+        assert np.allclose(getattr(results_1, result_function)(element, load_combination_id),
+                           getattr(results_1, result_function)(element, load_combination_id, False) +
+                           getattr(results_0, result_function)(element, load_combination_id, False))
+    # The support force of the first phase is half of the point load
+    assert np.allclose(results_0.get_support_node_global_force(point, load_combination_id, False)[1], 0.5)
+    assert np.allclose(structure.get_point_global_force_vector([0.0, 0.0]),
+                       structure.get_point_support_global_force_vector([0.0, 0.0]))
+
+
+####################
+# BULK MODEL TESTS #
+####################
+
+def test_bulk_model_result_0():
+    """Tests that a continuous beam created with the bulk functions gives the same results as one created with the
+    single element functions.
+    """
+    # Create the two structure instances
+    structure_0 = ps.core.Structure2D()
+    structure_1 = ps.core.Structure2D()
+    # Add the frame elements
+    x = np.arange(4) * 5.0
+    for i in range(3):
+        structure_0.add_frame_element([x[i], 0.0], [x[i + 1], 0.0], 1.0, 1.0, 1.0, 1.0)
+    frame_ids = structure_1.add_frame_elements(np.column_stack((x[:-1], np.zeros(3))),
+                                               np.column_stack((x[1:], np.zeros(3))), 1.0, 1.0, 1.0, 1.0)
+    # Add the supports
+    structure_0.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+    for i in range(1, 4):
+        structure_0.add_support([x[i], 0.0], displacement_y=False)
+    structure_1.add_supports(np.column_stack((x, np.zeros(4))),
+                             [[False, False, True], [True, False, True], [True, False, True], [True, False, True]])
+    # Add the point loads
+    structure_0.add_point_load([2.5, 0.0], [0.0, -1.0, 0.0])
+    structure_0.add_point_load([12.5, 0.0], [0.0, -2.0, 0.0])
+    structure_1.add_point_loads([[2.5, 0.0], [12.5, 0.0]], [[0.0, -1.0, 0.0], [0.0, -2.0, 0.0]])
+    # Solve the linear systems
+    structure_0.solve_linear_system()
+    structure_1.solve_linear_system()
+    # Test the number of nodes and groups
+    assert len(frame_ids) == 3
+    assert len(structure_1.group_component.groups) == 3
+    # Test the results of both structures
+    for coordinate in ([2.5, 0.0], [7.5, 0.0], [12.5, 0.0]):
+        assert np.allclose(structure_0.get_point_displacement_vector(coordinate),
+                           structure_1.get_point_displacement_vector(coordinate))
+    assert np.allclose(structure_0.get_line_force_vector([2.49, 0.0]), structure_1.get_line_force_vector([2.49, 0.0]))
+
+
+def test_bulk_model_result_1():
+    """Tests that the bulk result queries of many coordinates and load combinations give the same results as the single
+    result queries.
+    """
+    # Create a continuous beam with a point load in every span
+    structure = create_continuous_beam(horizontal_loads=True)
+    structure.add_load_combinations('lc', {'0': 1.35}, [{'1': 1.5}, {'2': 1.5}])
+    structure.solve_linear_system()
+    load_combinations = list(structure.load_combinations_component.load_combination_names)
+    point_coordinates = np.array([[0.0, 0.0], [2.5, 0.0], [5.0, 0.0], [12.5, 0.0], [15.0, 0.0], [20.0, 0.0]])
+    line_coordinates = np.array([[1.0, 0.0], [4.99, 0.0], [6.2, 0.0], [13.0, 0.0], [20.0, 0.0]])
+    # Test the point results
+    for bulk_function, single_function in (('get_points_displacement_vectors', 'get_point_displacement_vector'),
+                                           ('get_points_global_force_vectors', 'get_point_global_force_vector'),
+                                           ('get_points_support_global_force_vectors',
+                                            'get_point_support_global_force_vector')):
+        result_vectors = getattr(structure, bulk_function)(point_coordinates, load_combinations)
+        assert result_vectors.shape == (6, 4, 3)
+        # The coordinate without a node has nan results
+        assert np.all(np.isnan(result_vectors[-1]))
+        for i, coordinate in enumerate(point_coordinates[:-1]):
+            for j, load_combination in enumerate(load_combinations):
+                assert np.allclose(result_vectors[i, j],
+                                   getattr(structure, single_function)(list(coordinate), load_combination))
+    # Test the line results
+    force_vectors = structure.get_lines_force_vectors(line_coordinates, load_combinations, local=True)
+    internal_force_vectors = structure.get_lines_internal_force_vectors(line_coordinates, load_combinations)
+    assert force_vectors.shape == (5, 4, 6)
+    assert internal_force_vectors.shape == (5, 4, 3)
+    assert np.all(np.isnan(force_vectors[-1])) and np.all(np.isnan(internal_force_vectors[-1]))
+    for i, coordinate in enumerate(line_coordinates[:-1]):
+        for j, load_combination in enumerate(load_combinations):
+            assert np.allclose(force_vectors[i, j],
+                               structure.get_line_force_vector(list(coordinate), load_combination, local=True))
+            assert np.allclose(internal_force_vectors[i, j],
+                               structure.get_line_internal_force_vector(list(coordinate), load_combination))
+    # The result arrays only have the rows of the nodes of the analysis and the cache of the result arrays is bounded
+    results = structure.post_processor.linear_analysis_results
+    assert len(results.result_array('node_displacement', 0).values) == len(results.node_dof_ids[0])
+    displacement_vectors = structure.get_points_displacement_vectors(point_coordinates[:-1], load_combinations)
+    results.maximum_cached_result_arrays = 1
+    results.result_arrays.clear()
+    results.phase_result_arrays.clear()
+    assert np.allclose(structure.get_points_displacement_vectors(point_coordinates[:-1], load_combinations),
+                       displacement_vectors)
+    assert len(results.result_arrays) <= 1 and len(results.phase_result_arrays) <= 1
+
+
+def test_bulk_model_result_2():
+    """Tests that the bulk methods merge the nodes that are near each other like the single methods, also if they are
+    rounded to different grid cells.
+    """
+    # Add the second frame element with the single and with the bulk method, its start node is near the end node of the
+    # first frame element
+    structures = []
+    for bulk in (False, True):
+        structure = ps.core.Structure2D()
+        structure.add_frame_element([0.0, 0.0], [1.0004, 0.0], 1.0, 1.0, 1.0, 1.0)
+        if bulk:
+            structure.add_frame_elements([[1.0006, 0.0]], [[2.0, 0.0]], 1.0, 1.0, 1.0, 1.0)
+        else:
+            structure.add_frame_element([1.0006, 0.0], [2.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        structures.append(structure)
+    # Both structures have three nodes
+    for structure in structures:
+        assert len(list(structure.get_component(ps.solver.components.Point2D))) == 3
+
+
+#####################
+# SUBDIVISION TESTS #
+#####################
+
+def test_subdivision_result_0():
+    """Tests that a structure with unsplit line elements gives the same results at the stations as a structure with
+    split line elements and the analytical results between the nodes.
+    """
+    # Create the two structure instances
+    structure_0 = ps.core.Structure2D()
+    structure_1 = ps.core.Structure2D(subdivision=None)
+    for structure in (structure_0, structure_1):
+        # Add a frame element
+        frame_id = structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        # Add supports
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        # Add a q-load and a point load
+        structure.add_global_q_load(frame_id, -1.0)
+        structure.add_point_load([2.5, 0.0], [0.0, -2.0, 0.0])
+        # Solve the linear system
+        structure.solve_linear_system()
+    # Test the amount of frame elements
+    assert len(list(structure_0.get_component(ps.solver.components.FrameElement2D))) == 100
+    assert len(list(structure_1.get_component(ps.solver.components.FrameElement2D))) == 2
+    # Test the displacements and the internal forces at the node of the point load and in the middle of the frame
+    assert np.allclose(structure_0.get_point_displacement_vector([2.5, 0.0]),
+                       structure_1.get_point_displacement_vector([2.5, 0.0]))
+    for coordinate in ([2.5, 0.0], [5.0, 0.0], [7.3, 0.0]):
+        assert np.allclose(structure_0.get_line_internal_force_vector(coordinate),
+                           structure_1.get_line_internal_force_vector(coordinate))
+    # Test the displacements and the internal forces between the nodes with the analytical results
+    assert np.allclose(structure_1.get_point_displacement_vector([5.0, 0.0]), np.array([0.0, -158.8541667, -1.5625]))
+    assert np.allclose(structure_1.get_line_internal_force_vector([5.0, 0.0]), np.array([0.0, -0.5, 15.0]))
+    # Test the values of the drawn diagrams
+    results = structure_1.post_processor.linear_analysis_results
+    group_id = next(iter(results.line_element_sort.groups))
+    dof_values = list(results.global_dof_generator(group_id, 0))
+    assert len(dof_values) == 2 * structure_1.stations_per_element
+    for position_vector, dof_value in dof_values:
+        x = position_vector[0]
+        assert np.isclose(dof_value[2], 6.5 * x - 0.5 * x ** 2 - 2.0 * max(0.0, x - 2.5))
+
+
+def test_subdivision_result_1():
+    """Tests that the adaptive subdivision only splits the frame elements at the load discontinuities, the result
+    coordinates and where the q-load is not linear, and that it gives the same results as the uniform subdivision.
+    """
+    # Create the structure instances
+    structure_0 = ps.core.Structure2D()
+    structure_1 = ps.core.Structure2D(subdivision='adaptive')
+    structure_2 = ps.core.Structure2D(subdivision='adaptive', maximum_element_length=2.0)
+    for structure in (structure_0, structure_1, structure_2):
+        # Add the frame elements
+        frame_id_0 = structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        frame_id_1 = structure.add_frame_element([10.0, 0.0], [20.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        # Add supports
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        structure.add_support([20.0, 0.0], displacement_y=False)
+        # Add a q-load on a part of the first frame element and a quadratic q-load on the second frame element
+        structure.add_global_q_load_line(frame_id_0, -1.0, 2.0, 6.0)
+        structure.add_global_q_load_func(frame_id_1, lambda x: -0.01 * (x[0] - 10.0) ** 2)
+        # Add a result coordinate
+        structure.add_result_coordinate([13.3, 0.0])
+        # Solve the linear system
+        structure.solve_linear_system()
+    # Test the nodes of the first frame element
+    for structure, node_list in ((structure_1, [0.0, 2.0, 6.0, 10.0]), (structure_2, [0.0, 2.0, 4.0, 6.0, 8.0, 10.0])):
+        x = sorted(point.point_list[0][0] for _, point in structure.get_component(ps.solver.components.Point2D))
+        assert np.allclose([x_i for x_i in x if x_i <= 10.0], node_list)
+        assert np.any(np.isclose(x, 13.3))
+    # Test that the adaptive subdivision has far less frame elements
+    assert len(list(structure_1.get_component(ps.solver.components.FrameElement2D))) < \
+        len(list(structure_0.get_component(ps.solver.components.FrameElement2D))) / 4
+    # Test the internal forces of the adaptive subdivision with the uniform subdivision
+    for coordinate in ([2.0, 0.0], [4.0, 0.0], [13.3, 0.0], [15.0, 0.0]):
+        assert np.allclose(structure_0.get_line_internal_force_vector(coordinate),
+                           structure_1.get_line_internal_force_vector(coordinate), atol=5.e-3)
+        assert np.allclose(structure_1.get_line_internal_force_vector(coordinate),
+                           structure_2.get_line_internal_force_vector(coordinate), atol=5.e-3)
+
+
+######################
+# CONDENSATION TESTS #
+######################
+
+def test_condensation_result_0():
+    """Tests that condensing the interior nodes of the chains of line elements gives the same results as the full
+    system, for a beam with a column that branches off in the middle of the beam.
+    """
+    # Create the two structure instances
+    structure_0 = ps.core.Structure2D()
+    structure_1 = ps.core.Structure2D(condense_chains=True)
+    for structure in (structure_0, structure_1):
+        # Add the frame elements
+        structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        structure.add_frame_element([5.0, 0.0], [5.0, -3.0], 1.0, 1.0, 1.0, 1.0)
+        # Add supports
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        structure.add_support([5.0, -3.0], displacement_x=False, displacement_y=False, rotation_z=False)
+        # Add a point load
+        structure.add_point_load([2.5, 0.0], [0.0, -1.0, 0.0])
+        # Solve the linear system
+        structure.solve_linear_system()
+    # Test that only the supports and the branching node are retained
+    results = structure_1.post_processor.linear_analysis_results
+    condensation = structure_1.get_component_from_entity(results.result_entity_id,
+                                                         ps.solver.components.ChainCondensationComponent)
+    assert len(condensation.retained_dof_list) == 1 + 2 + 3
+    assert len(condensation.chains) == 3
+    # Test the results of both structures
+    for coordinate in ([2.5, 0.0], [5.0, 0.0], [7.5, 0.0], [5.0, -1.5]):
+        assert np.allclose(structure_0.get_point_displacement_vector(coordinate),
+                           structure_1.get_point_displacement_vector(coordinate))
+    assert np.allclose(structure_0.get_line_force_vector([2.49, 0.0]), structure_1.get_line_force_vector([2.49, 0.0]))
+
+
+def test_condensation_result_1():
+    """Tests that a node of a chain of line elements that also has a super element is retained, such that condensing
+    the chains gives the same results as the full system.
+    """
+    # Create the substructure of a column
+    column = ps.core.Substructure2D([[0.0, 0.0], [3.0, 0.0]])
+    column.add_frame_element([0.0, 0.0], [3.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    # Create the two structure instances of a beam with the column hanging from the middle
+    structure_0 = ps.core.Structure2D()
+    structure_1 = ps.core.Structure2D(condense_chains=True)
+    for structure in (structure_0, structure_1):
+        structure.add_frame_element([0.0, 0.0], [10.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+        structure.add_substructure(column, [5.0, 0.0], -np.pi / 2)
+        structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        structure.add_support([10.0, 0.0], displacement_y=False)
+        structure.add_point_load([2.0, 0.0], [1.0, -1.0, 0.0])
+        structure.solve_linear_system()
+    # Test the results of both structures
+    for coordinate in ([2.0, 0.0], [5.0, 0.0], [7.5, 0.0], [5.0, -3.0]):
+        assert np.allclose(structure_0.get_point_displacement_vector(coordinate),
+                           structure_1.get_point_displacement_vector(coordinate))
+
+
+######################
+# SUBSTRUCTURE TESTS #
+######################
+
+def test_substructure_result_0():
+    """Tests that a frame built from rotated and translated instances of condensed substructures gives the same
+    results as the same frame built from frame elements.
+    """
+    # Create the frame from frame elements
+    structure_0 = ps.core.Structure2D()
+    for i in range(3):
+        structure_0.add_frame_element([6.0 * i, 0.0], [6.0 * i, 3.0], 1.0, 1.0, 1.0, 1.0)
+    for i in range(2):
+        frame_id = structure_0.add_frame_element([6.0 * i, 3.0], [6.0 * i + 6.0, 3.0], 1.0, 1.0, 1.0, 1.0)
+        structure_0.add_global_q_load(frame_id, -1.0, 'q')
+    # Create the substructures of a beam with a q-load and of a column
+    beam = ps.core.Substructure2D([[0.0, 0.0], [6.0, 0.0]])
+    frame_id = beam.add_frame_element([0.0, 0.0], [6.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    beam.add_global_q_load(frame_id, -1.0, 'q')
+    column = ps.core.Substructure2D([[0.0, 0.0], [3.0, 0.0]])
+    column.add_frame_element([0.0, 0.0], [3.0, 0.0], 1.0, 1.0, 1.0, 1.0)
+    # Create the frame from instances of the substructures
+    structure_1 = ps.core.Structure2D()
+    for i in range(3):
+        structure_1.add_substructure(column, [6.0 * i, 0.0], np.pi / 2)
+    for i in range(2):
+        structure_1.add_substructure(beam, [6.0 * i, 3.0])
+    for structure in (structure_0, structure_1):
+        # Add the supports and a point load
+        structure.add_supports([[0.0, 0.0], [6.0, 0.0], [12.0, 0.0]], [False, False, False])
+        structure.add_point_load([0.0, 3.0], [1.0, 0.0, 0.0], 'w')
+        structure.add_load_combination('lc', {'q': 1.35, 'w': 1.5})
+        # Solve the linear system
+        structure.solve_linear_system()
+    # Test that only the dofs of the boundary nodes are solved
+    assert len(structure_1.post_processor.linear_analysis_results.linear_calculation_component.
+               reduced_global_stiffness_matrix) == 3 * 3
+    # Test the displacements of the boundary nodes and of the recovered nodes of every instance
+    load_combination_id = structure_0.load_combinations_component.load_combination_names['lc']
+    for substructure in (beam, column):
+        _, positions, displacements = structure_1.get_substructure_results(substructure, 'lc')
+        for position, displacement in zip(positions.reshape(-1, 2), displacements.reshape(-1, 3)):
+            _, point = structure_0.search_for_point(position)
+            assert np.allclose(displacement, structure_0.post_processor.linear_analysis_results.
+                               get_node_displacement_vector(point, load_combination_id))
+
+
+##############################
+# INCREMENTAL ANALYSIS TESTS #
+##############################
+
+def test_incremental_result_0():
+    """Tests that solving a structure again after adding a point load, a spring and a point load at a new node gives
+    the same results as solving the changed structure from scratch, and that the point load reuses the factorization.
+    """
+    # The coordinates of the nodes at which the displacements are compared
+    coordinates = [[2.5, 0.0], [5.0, 0.0], [7.5, 0.0]]
+    point_loads = [([2.5, 0.0], [0.0, -1.0, 0.0])]
+    structure = create_simply_supported_beam(point_loads)
+    structure.solve_linear_system()
+    results = structure.post_processor.linear_analysis_results
+    factorization = results.linear_calculation_component.factorization
+    # Add a point load at an existing node, the analysis and its factorization are reused
+    point_loads.append(([7.5, 0.0], [0.0, -2.0, 0.0]))
+    structure.add_point_load(*point_loads[-1])
+    assert structure.change_level == 'load'
+    structure.solve_linear_system()
+    assert structure.post_processor.linear_analysis_results.result_entity_id == results.result_entity_id
+    assert structure.post_processor.linear_analysis_results.linear_calculation_component.factorization is \
+        factorization
+    structure_0 = create_simply_supported_beam(point_loads)
+    structure_0.solve_linear_system()
+    assert_equal_displacements(structure, structure_0, coordinates)
+    # Add a spring at an existing node, the analysis is reused
+    structure.add_spring([5.0, 0.0], spring_y=1.0)
+    assert structure.change_level == 'stiffness'
+    structure.solve_linear_system()
+    assert structure.post_processor.linear_analysis_results.result_entity_id == results.result_entity_id
+    structure_0 = create_simply_supported_beam(point_loads, [[5.0, 0.0]])
+    structure_0.solve_linear_system()
+    assert_equal_displacements(structure, structure_0, coordinates)
+    # Add a point load at a new node, the structure is analysed again
+    point_loads.append(([3.33, 0.0], [0.0, -2.0, 0.0]))
+    structure.add_point_load(*point_loads[-1])
+    assert structure.change_level == 'topology'
+    structure.solve_linear_system()
+    assert structure.post_processor.linear_analysis_results.result_entity_id != results.result_entity_id
+    structure_0 = create_simply_supported_beam(point_loads, [[5.0, 0.0]])
+    structure_0.solve_linear_system()
+    assert_equal_displacements(structure, structure_0, coordinates)
+
+
+def test_incremental_result_1():
+    """Tests that updating a spring, which is a low rank update of the factorization, and updating the section of a
+    frame element gives the same results as solving the changed structure from scratch.
+    """
+    # The coordinates of the nodes at which the displacements are compared
+    coordinates = [[5.0, 0.0], [10.0, 0.0], [10.0, 4.0]]
+    structure = create_portal_frame(1.0, 1.0)
+    structure.solve_linear_system()
+    linear_calculation_component = structure.post_processor.linear_analysis_results.linear_calculation_component
+    factorization = linear_calculation_component.factorization
+    # Update the spring, the factorization is reused with a rank one update
+    structure.update_spring([5.0, 0.0], spring_y=3.0)
+    structure.solve_linear_system()
+    assert linear_calculation_component.factorization is factorization
+    assert len(linear_calculation_component.low_rank_update[0]) == 1
+    structure_0 = create_portal_frame(3.0, 1.0)
+    structure_0.solve_linear_system()
+    assert_equal_displacements(structure, structure_0, coordinates)
+    # Update the section of the column
+    structure.update_section([10.0, 2.0], moment_of_inertia=2.0)
+    structure.solve_linear_system()
+    structure_0 = create_portal_frame(3.0, 2.0)
+    structure_0.solve_linear_system()
+    assert_equal_displacements(structure, structure_0, coordinates)
+    assert np.allclose(structure.get_line_force_vector([10.0, 2.0]), structure_0.get_line_force_vector([10.0, 2.0]))
+
+
+#####################
+# SENSITIVITY TESTS #
+#####################
+
+def test_sensitivity_result_0():
+    """Tests the adjoint sensitivities of a displacement, a reaction and an end moment of a portal frame to the ea and
+    the ei of its frame elements against central finite differences.
+    """
+    # Define the responses and their values
+    responses = [ps.solver.results.DisplacementResponse([3.0, 4.0], 1),
+                 ps.solver.results.ReactionResponse([0.0, 0.0], 2),
+                 ps.solver.results.ElementEndForceResponse([0.0, 2.0], 1)]
+
+    def response_values(structure):
+        return np.array([structure.get_point_displacement_vector([3.0, 4.0])[1],
+                         structure.get_point_support_global_force_vector([0.0, 0.0])[2],
+                         structure.get_line_force_vector([0.0, 2.0], local=True)[5]])
+
+    structure = create_sway_frame([1.0, 1.0, 1.0], [1.0, 2.0, 1.0])
+    sensitivities = [structure.get_sensitivities(response, per_group=True) for response in responses]
+    # Test the sensitivities of every group against central finite differences of the ea and the ei
+    h = 1e-4
+    for group_id in range(3):
+        for k in range(2):
+            properties = [[1.0, 1.0, 1.0], [1.0, 2.0, 1.0]]
+            properties[k][group_id] += h
+            values_plus = response_values(create_sway_frame(*properties))
+            properties[k][group_id] -= 2.0 * h
+            values_minus = response_values(create_sway_frame(*properties))
+            finite_differences = (values_plus - values_minus) / (2.0 * h)
+            assert np.allclose([sensitivity[group_id][k] for sensitivity in sensitivities], finite_differences,
+                               rtol=1e-5, atol=1e-8)
+
+
+###############
+# BATCH TESTS #
+###############
+
+def test_batch_result_0():
+    """Tests that the batch solver returns the same displacements as the serial solution of model descriptions and of
+    a pickled structure.
+    """
+    # Define a simply supported beam with a q-load and a point load
+    def describe(span, q):
+        description = ps.core.ModelDescription(subdivision=None)
+        frame_element_id = description.add_frame_element([0.0, 0.0], [span, 0.0], 1.0, 1.0, 1.0, 1.0)
+        description.add_support([0.0, 0.0], displacement_x=False, displacement_y=False)
+        description.add_support([span, 0.0], displacement_y=False)
+        description.add_global_q_load(frame_element_id, q)
+        description.add_point_load([span / 2.0, 0.0], [0.0, -1.0, 0.0])
+        return description
+
+    # Add a structure without q-loads, which can be pickled
+    structure = ps.core.Structure2D(subdivision=None)
+    structure.add_frame_element([0.0, 0.0], [0.0, 3.0], 1.0, 1.0, 1.0, 1.0)
+    structure.add_support([0.0, 0.0], displacement_x=False, displacement_y=False, rotation_z=False)
+    structure.add_point_load([0.0, 3.0], [1.0, 0.0, 0.0])
+    models = [describe(4.0 + i, -1.0 - 0.5 * i) for i in range(4)] + [structure]
+    results = dict(ps.core.solve_batch(models, max_workers=2, chunk_size=2))
+    assert sorted(results) == list(range(5))
+    # The models can be given as a generator, they are submitted as the chunks complete
+    assert sorted(index for index, _ in ps.core.solve_batch((model for model in models), max_workers=1)) == \
+        list(range(5))
+    # Test the results against the serial solution
+    for i, model in enumerate(models):
+        structure_0 = model.build() if isinstance(model, ps.core.ModelDescription) else model
+        structure_0.solve_linear_system()
+        result = ps.core.default_extractor(structure_0)
+        assert np.allclose(results[i]['coordinates'], result['coordinates'])
+        assert np.allclose(results[i]['displacements']['generic_load_combination'],
+                           result['displacements']['generic_load_combination'])
+    # A structure with a q-load function that is a lambda can't be pickled
+    structure.add_global_q_load_func(structure.search_for_line_element([0.0, 1.5])[0], lambda x: -1.0)
+    with pytest.raises(TypeError):
+        list(ps.core.solve_batch([structure]))
+    # The arguments of the calls of a model description are pickled as well
+    description = describe(4.0, -1.0)
+    description.add_global_q_load_func(ps.core.ModelReference(0), lambda x: -1.0)
+    with pytest.raises(TypeError):
+        list(ps.core.solve_batch([description]))
+
+
+################
+# Q-LOAD TESTS #
+################
+
+def test_q_load_result_0():
+    """Tests that a beam of a single element with a partial q-load function gives the same displacements at its ends
+    as a uniformly subdivided beam.
+    """
+    # Define a simply supported beam with a partial quadratic q-load, once as a single element and once subdivided
+    def q_load_func(x):
+        return -0.01 * x[0] ** 2 if x[0] > 4.0 else 0.0
+
+    structure = create_simply_supported_beam(q_load_func=q_load_func, discontinuity_list=[4.0], subdivision=None)
+    structure.solve_linear_system()
+    structure_0 = create_simply_supported_beam(q_load_func=q_load_func, discontinuity_list=[4.0])
+    structure_0.solve_linear_system()
+    for coordinate in ([0.0, 0.0], [10.0, 0.0]):
+        assert np.allclose(structure.get_point_displacement_vector(coordinate),
+                           structure_0.get_point_displacement_vector(coordinate))
+    # The discontinuities of a load distribution can't be given
+    with pytest.raises(ValueError):
+        structure.add_global_q_load_func(structure.search_for_line_element([5.0, 0.0])[0],
+                                         ps.solver.components.load_distribution.ConstantDistribution(-1.0),
+                                         discontinuity_list=[4.0])
@@ -22,5 +22,6 @@ setup(
             'matplotlib',
             'bokeh',
             'svgpathtools',
+            'scipy',
         ]
 )